@@ -76,8 +76,9 @@ class MLConfig:
     LOOKFORWARD_BARS: int = int(os.getenv("LOOKFORWARD_BARS", "3"))  # Multi-horizon target
     
     # NEW: Class balancing
-    USE_CLASS_BALANCING: bool = os.getenv("USE_CLASS_BALANCING", "True").lower() == "true"
+    USE_CLASS_BALANCING: bool = os.getenv("USE_CLASS_BALANCING", "False").lower() == "true"  # SMOTE; class weights otherwise
     USE_TSCV: bool = os.getenv("USE_TSCV", "True").lower() == "true"  # Time-series CV
+    USE_POLARS_FEATURES: bool = os.getenv("USE_POLARS_FEATURES", "False").lower() == "true"  # Polars feature pipeline
     
     # Model ensemble weights
     XGBOOST_WEIGHT: float = 0.4
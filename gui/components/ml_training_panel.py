@@ -32,7 +32,7 @@ def render_ml_training_panel():
     **New in v2.0:** Train models with advanced features:
     - 🎯 Smart target definition (10+ pip meaningful moves)
     - 📊 70+ comprehensive features
-    - ⚖️ Automatic class balancing (SMOTE)
+    - ⚖️ Automatic class balancing (class weights, optional SMOTE)
     - 🔄 Time-series cross-validation
     - 🎛️ Hyperparameter optimization (optional)
     - 📉 Probability calibration
@@ -176,8 +176,8 @@ def render_ml_training_panel():
                     st.markdown("**Model Configuration**")
                     use_class_balancing = st.checkbox(
                         "SMOTE Class Balancing",
-                        value=True,
-                        help="Balance bullish/bearish samples"
+                        value=False,
+                        help="Oversample instead of weighting bullish/bearish samples (slower)"
                     )
                     
                     calibrate_probabilities = st.checkbox(
@@ -208,7 +208,7 @@ def render_ml_training_panel():
             lookforward_bars = 3
             enable_feature_selection = True
             n_features = 50
-            use_class_balancing = True
+            use_class_balancing = False
             calibrate_probabilities = True
             tune_hyperparameters = False
             n_trials = 0
@@ -2,9 +2,10 @@
 Technical Indicators Calculator
 Comprehensive technical analysis indicators using TA-Lib and pandas-ta
 """
+import functools
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable
 try:
     import talib
 except Exception as e:  # pragma: no cover
@@ -19,6 +20,21 @@ from src.utils.logger import get_logger
 
 logger = get_logger()
 
+_TALIB_OK = talib is not None
+
+
+def _requires_talib(name: str) -> Callable:
+    """Raise ImportError on call when TA-Lib is unavailable"""
+    def decorator(func: Callable) -> Callable:
+        if _TALIB_OK:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            raise ImportError(f"TA-Lib is required for {name}. Please install TA-Lib.")
+        return wrapper
+    return decorator
+
 
 class TechnicalIndicators:
     """
@@ -40,6 +56,7 @@ class TechnicalIndicators:
     
     # ==================== Trend Indicators ====================
     
+    @_requires_talib("EMA")
     def calculate_ema(
         self,
         df: pd.DataFrame,
@@ -47,10 +64,9 @@ class TechnicalIndicators:
         column: str = 'Close'
     ) -> pd.Series:
         """Calculate Exponential Moving Average"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for EMA. Please install TA-Lib.")
         return talib.EMA(df[column], timeperiod=period)
     
+    @_requires_talib("SMA")
     def calculate_sma(
         self,
         df: pd.DataFrame,
@@ -58,10 +74,9 @@ class TechnicalIndicators:
         column: str = 'Close'
     ) -> pd.Series:
         """Calculate Simple Moving Average"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for SMA. Please install TA-Lib.")
         return talib.SMA(df[column], timeperiod=period)
     
+    @_requires_talib("MACD")
     def calculate_macd(
         self,
         df: pd.DataFrame,
@@ -79,8 +94,6 @@ class TechnicalIndicators:
         slow = slow or self.config.MACD_SLOW
         signal = signal or self.config.MACD_SIGNAL
         
-        if talib is None:
-            raise ImportError("TA-Lib is required for MACD. Please install TA-Lib.")
         macd, signal_line, histogram = talib.MACD(
             df['Close'],
             fastperiod=fast,
@@ -94,6 +107,7 @@ class TechnicalIndicators:
             'histogram': histogram
         }
     
+    @_requires_talib("ADX")
     def calculate_adx(
         self,
         df: pd.DataFrame,
@@ -107,8 +121,6 @@ class TechnicalIndicators:
         """
         period = period or self.config.ADX_PERIOD
         
-        if talib is None:
-            raise ImportError("TA-Lib is required for ADX. Please install TA-Lib.")
         adx = talib.ADX(df['High'], df['Low'], df['Close'], timeperiod=period)
         plus_di = talib.PLUS_DI(df['High'], df['Low'], df['Close'], timeperiod=period)
         minus_di = talib.MINUS_DI(df['High'], df['Low'], df['Close'], timeperiod=period)
@@ -160,6 +172,7 @@ class TechnicalIndicators:
     
     # ==================== Momentum Indicators ====================
     
+    @_requires_talib("RSI")
     def calculate_rsi(
         self,
         df: pd.DataFrame,
@@ -167,10 +180,9 @@ class TechnicalIndicators:
     ) -> pd.Series:
         """Calculate RSI (Relative Strength Index)"""
         period = period or self.config.RSI_PERIOD
-        if talib is None:
-            raise ImportError("TA-Lib is required for RSI. Please install TA-Lib.")
         return talib.RSI(df['Close'], timeperiod=period)
     
+    @_requires_talib("Stochastic")
     def calculate_stochastic(
         self,
         df: pd.DataFrame,
@@ -188,8 +200,6 @@ class TechnicalIndicators:
         d_period = d_period or self.config.STOCH_D
         smooth = smooth or self.config.STOCH_SMOOTH
         
-        if talib is None:
-            raise ImportError("TA-Lib is required for Stochastic. Please install TA-Lib.")
         slowk, slowd = talib.STOCH(
             df['High'],
             df['Low'],
@@ -204,28 +214,27 @@ class TechnicalIndicators:
             'd': slowd
         }
     
+    @_requires_talib("CCI")
     def calculate_cci(
         self,
         df: pd.DataFrame,
         period: int = 20
     ) -> pd.Series:
         """Calculate CCI (Commodity Channel Index)"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for CCI. Please install TA-Lib.")
         return talib.CCI(df['High'], df['Low'], df['Close'], timeperiod=period)
     
+    @_requires_talib("Williams %R")
     def calculate_williams_r(
         self,
         df: pd.DataFrame,
         period: int = 14
     ) -> pd.Series:
         """Calculate Williams %R"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for Williams %R. Please install TA-Lib.")
         return talib.WILLR(df['High'], df['Low'], df['Close'], timeperiod=period)
     
     # ==================== Volatility Indicators ====================
     
+    @_requires_talib("Bollinger Bands")
     def calculate_bollinger_bands(
         self,
         df: pd.DataFrame,
@@ -241,8 +250,6 @@ class TechnicalIndicators:
         period = period or self.config.BB_PERIOD
         std_dev = std_dev or self.config.BB_STD
         
-        if talib is None:
-            raise ImportError("TA-Lib is required for Bollinger Bands. Please install TA-Lib.")
         upper, middle, lower = talib.BBANDS(
             df['Close'],
             timeperiod=period,
@@ -256,6 +263,7 @@ class TechnicalIndicators:
             'lower': lower
         }
     
+    @_requires_talib("ATR")
     def calculate_atr(
         self,
         df: pd.DataFrame,
@@ -263,8 +271,6 @@ class TechnicalIndicators:
     ) -> pd.Series:
         """Calculate ATR (Average True Range)"""
         period = period or self.config.ATR_PERIOD
-        if talib is None:
-            raise ImportError("TA-Lib is required for ATR. Please install TA-Lib.")
         return talib.ATR(df['High'], df['Low'], df['Close'], timeperiod=period)
     
     def calculate_keltner_channels(
@@ -293,10 +299,9 @@ class TechnicalIndicators:
     
     # ==================== Volume Indicators ====================
     
+    @_requires_talib("OBV")
     def calculate_obv(self, df: pd.DataFrame) -> pd.Series:
         """Calculate OBV (On Balance Volume)"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for OBV. Please install TA-Lib.")
         return talib.OBV(df['Close'], df['Volume'])
     
     def calculate_vwap(self, df: pd.DataFrame) -> pd.Series:
@@ -304,14 +309,13 @@ class TechnicalIndicators:
         typical_price = (df['High'] + df['Low'] + df['Close']) / 3
         return (typical_price * df['Volume']).cumsum() / df['Volume'].cumsum()
     
+    @_requires_talib("MFI")
     def calculate_mfi(
         self,
         df: pd.DataFrame,
         period: int = 14
     ) -> pd.Series:
         """Calculate MFI (Money Flow Index)"""
-        if talib is None:
-            raise ImportError("TA-Lib is required for MFI. Please install TA-Lib.")
         return talib.MFI(df['High'], df['Low'], df['Close'], df['Volume'], timeperiod=period)
     
     def calculate_volume_profile(
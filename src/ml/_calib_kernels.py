@@ -0,0 +1,62 @@
+"""
+Calibration Kernels
+Numba-compiled single-pass ECE/MCE computation over uniform probability bins
+"""
+import numpy as np
+
+from ._njit import njit
+
+
+@njit(cache=True, fastmath=True)
+def ece_mce_kernel(y_true, y_proba, n_bins):
+    """
+    Compute ECE, MCE and the calibration curve in one pass over the data
+    
+    Args:
+        y_true: Contiguous float64 array of 0/1 labels
+        y_proba: Contiguous float64 array of positive-class probabilities
+        n_bins: Number of uniform bins on [0, 1]
+        
+    Returns:
+        Tuple of (ece, mce, fraction_of_positives, mean_predicted_value) with
+        curve entries for non-empty bins only
+    """
+    n = y_proba.shape[0]
+    counts = np.zeros(n_bins, dtype=np.int64)
+    sum_y = np.zeros(n_bins, dtype=np.float64)
+    sum_p = np.zeros(n_bins, dtype=np.float64)
+    
+    for i in range(n):
+        b = int(y_proba[i] * n_bins)
+        if b > n_bins - 1:
+            b = n_bins - 1
+        counts[b] += 1
+        sum_y[b] += y_true[i]
+        sum_p[b] += y_proba[i]
+    
+    n_nonempty = 0
+    for b in range(n_bins):
+        if counts[b] > 0:
+            n_nonempty += 1
+    
+    frac_pos = np.empty(n_nonempty, dtype=np.float64)
+    mean_pred = np.empty(n_nonempty, dtype=np.float64)
+    ece = 0.0
+    mce = 0.0
+    k = 0
+    for b in range(n_bins):
+        if counts[b] > 0:
+            accuracy = sum_y[b] / counts[b]
+            confidence = sum_p[b] / counts[b]
+            error = abs(accuracy - confidence)
+            frac_pos[k] = accuracy
+            mean_pred[k] = confidence
+            k += 1
+            ece += counts[b] * error
+            if error > mce:
+                mce = error
+    
+    if n > 0:
+        ece /= n
+    
+    return ece, mce, frac_pos, mean_pred
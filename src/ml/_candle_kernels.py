@@ -0,0 +1,57 @@
+"""
+Candlestick Kernels
+Numba-compiled single-pass detection of the candlestick pattern flags
+"""
+import numpy as np
+
+from ._njit import njit
+
+
+# fastmath is deliberately off: NaN bars must compare False exactly as in the
+# vectorized pandas path, and error_model='numpy' keeps x/0 -> inf/nan.
+@njit(cache=True, error_model='numpy')
+def candle_pattern_kernel(o, h, l, c):
+    """
+    Compute doji, hammer, shooting star, engulfing and bullish-candle flags
+    
+    Args:
+        o, h, l, c: Contiguous float64 Open/High/Low/Close arrays
+    
+    Returns:
+        Tuple of int8 arrays (doji, hammer, shooting_star, bullish_engulfing,
+        bearish_engulfing, bullish_candle)
+    """
+    n = c.shape[0]
+    doji = np.zeros(n, dtype=np.int8)
+    hammer = np.zeros(n, dtype=np.int8)
+    star = np.zeros(n, dtype=np.int8)
+    bull_eng = np.zeros(n, dtype=np.int8)
+    bear_eng = np.zeros(n, dtype=np.int8)
+    bull_candle = np.zeros(n, dtype=np.int8)
+    
+    for i in range(n):
+        oi = o[i]
+        ci = c[i]
+        body = abs(ci - oi)
+        upper_wick = h[i] - max(oi, ci)
+        lower_wick = min(oi, ci) - l[i]
+        body_ratio = body / (h[i] - l[i])
+    
+        if body_ratio < 0.1:
+            doji[i] = 1
+        if lower_wick > 2 * body and upper_wick < body and body_ratio < 0.3:
+            hammer[i] = 1
+        if upper_wick > 2 * body and lower_wick < body and body_ratio < 0.3:
+            star[i] = 1
+        if ci > oi:
+            bull_candle[i] = 1
+    
+        if i > 0:
+            op = o[i - 1]
+            cp = c[i - 1]
+            if ci > oi and cp < op and oi < cp and ci > op:
+                bull_eng[i] = 1
+            if ci < oi and cp > op and oi > cp and ci < op:
+                bear_eng[i] = 1
+    
+    return doji, hammer, star, bull_eng, bear_eng, bull_candle
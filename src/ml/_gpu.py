@@ -0,0 +1,22 @@
+"""
+GPU Detection
+Shared CUDA availability check for hyperparameter tuning and model training
+"""
+from functools import lru_cache
+
+try:
+    import cupy as cp
+    CUPY_AVAILABLE = True
+except ImportError:
+    CUPY_AVAILABLE = False
+
+
+@lru_cache(maxsize=1)
+def cuda_available() -> bool:
+    """True when CuPy is installed and at least one CUDA device is visible (checked once)"""
+    if not CUPY_AVAILABLE:
+        return False
+    try:
+        return cp.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        return False
@@ -0,0 +1,55 @@
+"""
+Label Kernels
+Numba-compiled multi-horizon target generation for prepare_training_data
+"""
+import numpy as np
+
+from ._njit import njit, prange
+
+
+# fastmath is deliberately off: a NaN anywhere in the look-ahead window must
+# leave the bar unlabeled exactly as in the vectorized NumPy path.
+@njit(parallel=True, cache=True)
+def label_kernel(high, low, close, lookforward_bars, min_move_pips):
+    """
+    Label each bar from the extremes of the next ``lookforward_bars`` bars
+    
+    Args:
+        high, low, close: Contiguous float64 High/Low/Close arrays
+        lookforward_bars: Number of bars to look forward
+        min_move_pips: Minimum meaningful move in pips
+    
+    Returns:
+        Tuple (target, labeled): int8 array with 1 for a clear uptrend and 0
+        otherwise, and a bool mask of the bars with a clear up- or downtrend
+        (bars whose window runs past the data are never labeled)
+    """
+    n = close.shape[0]
+    target = np.zeros(n, dtype=np.int8)
+    labeled = np.zeros(n, dtype=np.bool_)
+    
+    for i in prange(n - lookforward_bars):
+        future_high = high[i + 1]
+        future_low = low[i + 1]
+        has_nan = future_high != future_high or future_low != future_low
+        for k in range(2, lookforward_bars + 1):
+            h = high[i + k]
+            l = low[i + k]
+            if h != h or l != l:
+                has_nan = True
+            if h > future_high:
+                future_high = h
+            if l < future_low:
+                future_low = l
+        if has_nan:
+            continue
+    
+        upside_pips = (future_high - close[i]) * 10000
+        downside_pips = (close[i] - future_low) * 10000
+        if upside_pips > min_move_pips and upside_pips > downside_pips * 1.5:
+            target[i] = 1
+            labeled[i] = True
+        elif downside_pips > min_move_pips and downside_pips > upside_pips * 1.5:
+            labeled[i] = True
+    
+    return target, labeled
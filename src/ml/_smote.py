@@ -0,0 +1,60 @@
+"""
+SMOTE Oversampling
+Vectorized SMOTE with the minority-class neighbor search on a FAISS float32 index
+"""
+import numpy as np
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+
+def faiss_smote(X, y, k_neighbors: int = 5, random_state=None):
+    """
+    Oversample the minority class to parity with plain SMOTE interpolation
+    
+    The k nearest minority neighbors of every minority sample come from one
+    batched ``IndexFlatL2`` search; synthetic rows are then drawn at once as
+    ``parent + gap * (neighbor - parent)`` with ``gap`` uniform in [0, 1).
+    
+    Args:
+        X: 2-D feature array
+        y: Binary labels
+        k_neighbors: Number of nearest minority neighbors to interpolate towards
+        random_state: Seed for parent, neighbor and gap sampling
+    
+    Returns:
+        Tuple (X_resampled, y_resampled): the original float32 rows followed
+        by the synthetic ones
+    """
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    
+    classes, counts = np.unique(y, return_counts=True)
+    minority = classes[counts.argmin()]
+    n_synthetic = int(counts.max() - counts.min())
+    if n_synthetic == 0:
+        return X, y
+    
+    X_min = np.ascontiguousarray(X[y == minority])
+    k = min(k_neighbors, len(X_min) - 1)
+    if k < 1:
+        raise ValueError("SMOTE needs at least two minority samples")
+    
+    index = faiss.IndexFlatL2(X_min.shape[1])
+    index.add(X_min)
+    _, neighbors = index.search(X_min, k + 1)
+    neighbors = neighbors[:, 1:]  # First hit is the sample itself
+    
+    rng = np.random.default_rng(random_state)
+    parents = rng.integers(0, len(X_min), n_synthetic)
+    partners = neighbors[parents, rng.integers(0, k, n_synthetic)]
+    gap = rng.random((n_synthetic, 1), dtype=np.float32)
+    synthetic = X_min[parents] + gap * (X_min[partners] - X_min[parents])
+    
+    return (
+        np.vstack([X, synthetic]),
+        np.concatenate([y, np.full(n_synthetic, minority, dtype=y.dtype)])
+    )
@@ -0,0 +1,54 @@
+"""
+Tuning Kernels
+Numba-compiled scoring helpers for the hyperparameter search inner loop
+"""
+import numpy as np
+
+from ._njit import njit
+
+
+@njit(cache=True)
+def accuracy_kernel(y_true, y_pred):
+    """
+    Fraction of matching labels, without sklearn's per-call input validation
+    
+    Args:
+        y_true: Contiguous int8 array of labels
+        y_pred: Contiguous int8 array of predicted labels
+        
+    Returns:
+        Accuracy as a float
+    """
+    n = y_true.shape[0]
+    matches = 0
+    
+    for i in range(n):
+        matches += y_true[i] == y_pred[i]
+    
+    return matches / n
+
+
+@njit(cache=True)
+def log_loss_kernel(y_true, proba):
+    """
+    Binary log loss with probabilities clipped to [1e-15, 1 - 1e-15]
+    
+    Args:
+        y_true: Contiguous int8 array of 0/1 labels
+        proba: Contiguous array of positive-class probabilities
+        
+    Returns:
+        Mean log loss as a float
+    """
+    n = y_true.shape[0]
+    eps = 1e-15
+    total = 0.0
+    
+    for i in range(n):
+        p = min(max(np.float64(proba[i]), eps), 1.0 - eps)
+        if y_true[i] == 1:
+            total -= np.log(p)
+        else:
+            total -= np.log(1.0 - p)
+    
+    return total / n
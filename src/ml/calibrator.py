@@ -2,19 +2,60 @@
 Probability Calibration
 Calibrates model prediction probabilities for better confidence scores
 """
+import os
+import sys
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, Tuple
-from sklearn.calibration import CalibratedClassifierCV, calibration_curve
-from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import brier_score_loss, log_loss
-import matplotlib.pyplot as plt
 
 from src.utils.logger import get_logger
+from ._njit import NUMBA_AVAILABLE
+from ._calib_kernels import ece_mce_kernel
 
 logger = get_logger()
 
 
+def _import_pyplot():
+    """
+    Import matplotlib.pyplot on first use
+    
+    Headless Linux hosts (servers, CI) have no GUI toolkit to initialize, so the
+    Agg backend is selected there; Windows and macOS never set DISPLAY, so they
+    keep their default backend.
+    """
+    import matplotlib
+    
+    if sys.platform.startswith('linux') and not (
+        os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')
+    ):
+        matplotlib.use('Agg')
+    
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _assign_uniform_bins(y_proba: np.ndarray, n_bins: int) -> np.ndarray:
+    """
+    Map probabilities in [0, 1] to uniform bin indices
+    
+    Equivalent to np.digitize against np.linspace(0, 1, n_bins + 1), but uses
+    direct arithmetic instead of a binary search per element. Indices use the
+    narrowest unsigned dtype that holds n_bins, which np.bincount accepts
+    directly and reads with a fraction of the memory traffic of intp.
+    """
+    if n_bins <= np.iinfo(np.uint8).max:
+        dtype = np.uint8
+    elif n_bins <= np.iinfo(np.uint16).max:
+        dtype = np.uint16
+    else:
+        dtype = np.intp
+    
+    bin_indices = (y_proba * n_bins).astype(dtype)
+    np.minimum(bin_indices, n_bins - 1, out=bin_indices)
+    return bin_indices
+
+
 class ProbabilityCalibrator:
     """
     Calibrate prediction probabilities for reliability
@@ -42,6 +83,10 @@ class ProbabilityCalibrator:
         self.logger = logger
         self.calibrated_model = None
         self.calibration_metrics = {}
+        
+        # (original_model, calibrated_model, X, proba_original, proba_calibrated)
+        # from the last compare_calibration call
+        self._comparison_proba = None
     
     def calibrate(
         self,
@@ -67,6 +112,11 @@ class ProbabilityCalibrator:
             category="ml_training"
         )
         
+        # Deferred: sklearn.calibration/model_selection are only needed here
+        from joblib import parallel_backend
+        from sklearn.calibration import CalibratedClassifierCV
+        from sklearn.model_selection import TimeSeriesSplit
+        
         # Use TimeSeriesSplit for time-aware calibration
         if cv is not None:
             cv_splitter = TimeSeriesSplit(n_splits=cv)
@@ -75,14 +125,31 @@ class ProbabilityCalibrator:
         
         try:
             self.calibrated_model = CalibratedClassifierCV(
-                base_estimator=model,
+                estimator=model,
                 method=self.method,
                 cv=cv_splitter,
                 n_jobs=-1
             )
             
             if cv_splitter != 'prefit':
-                self.calibrated_model.fit(X, y)
+                # Hand workers a compact float32 array instead of pickling the
+                # DataFrame per fold; integer-coded columns are left untouched
+                X_fit = X
+                if isinstance(X, pd.DataFrame) and all(
+                    np.issubdtype(dtype, np.floating) for dtype in X.dtypes
+                ):
+                    X_fit = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+                
+                # One BLAS/OpenMP thread per worker to avoid oversubscription
+                with parallel_backend('loky', inner_max_num_threads=1):
+                    self.calibrated_model.fit(X_fit, y)
+                
+                # Restore feature names so DataFrame inputs at predict time validate
+                if X_fit is not X:
+                    feature_names = np.asarray(X.columns, dtype=object)
+                    self.calibrated_model.feature_names_in_ = feature_names
+                    for calibrated in self.calibrated_model.calibrated_classifiers_:
+                        calibrated.estimator.feature_names_in_ = feature_names
             
             self.logger.info("Model calibration complete", category="ml_training")
             
@@ -97,7 +164,8 @@ class ProbabilityCalibrator:
         model,
         X: pd.DataFrame,
         y: pd.Series,
-        n_bins: int = 10
+        n_bins: int = 10,
+        strategy: str = 'quantile'
     ) -> Dict[str, Any]:
         """
         Evaluate calibration quality
@@ -107,27 +175,51 @@ class ProbabilityCalibrator:
             X: Feature DataFrame
             y: Target Series
             n_bins: Number of bins for calibration curve
+            strategy: Binning strategy for the calibration curve
+                ('quantile' or 'uniform')
             
         Returns:
             Dict with calibration metrics
         """
         # Get predictions
-        y_proba = model.predict_proba(X)[:, 1]
+        y_proba = model.predict_proba(X)[:, 1].astype(np.float32, copy=False)
         
-        # Calculate calibration curve
-        fraction_of_positives, mean_predicted_value = calibration_curve(
-            y, y_proba, n_bins=n_bins, strategy='quantile'
-        )
+        return self._evaluate_from_proba(y, y_proba, n_bins, strategy)
+    
+    def _evaluate_from_proba(
+        self,
+        y_true: pd.Series,
+        y_proba: np.ndarray,
+        n_bins: int = 10,
+        strategy: str = 'quantile'
+    ) -> Dict[str, Any]:
+        """
+        Evaluate calibration quality from precomputed positive-class probabilities
         
-        # Calculate metrics
-        brier_score = brier_score_loss(y, y_proba)
-        log_loss_score = log_loss(y, y_proba)
+        Args:
+            y_true: Target Series
+            y_proba: Predicted probabilities for the positive class
+            n_bins: Number of bins for calibration curve
+            strategy: Binning strategy for the calibration curve
+            
+        Returns:
+            Dict with calibration metrics
+        """
+        # ECE/MCE are always reported on uniform bins; the uniform-bin
+        # calibration curve comes out of the same pass
+        ece, mce, fraction_of_positives, mean_predicted_value = self._calibration_errors(
+            y_true, y_proba, n_bins
+        )
         
-        # Expected Calibration Error (ECE)
-        ece = self._calculate_ece(y, y_proba, n_bins)
+        # Quantile curve only needs a re-binning, not a separate sklearn sort-and-bin
+        if strategy != 'uniform':
+            _, _, fraction_of_positives, mean_predicted_value = self._calibration_errors(
+                y_true, y_proba, n_bins, strategy
+            )
         
-        # Maximum Calibration Error (MCE)
-        mce = self._calculate_mce(y, y_proba, n_bins)
+        # Calculate metrics
+        brier_score = brier_score_loss(y_true, y_proba)
+        log_loss_score = log_loss(y_true, y_proba)
         
         metrics = {
             'brier_score': brier_score,
@@ -172,9 +264,16 @@ class ProbabilityCalibrator:
         """
         self.logger.info("Comparing calibration quality", category="ml_training")
         
+        # Run inference once per model; the probabilities are kept for plotting
+        y_proba_original = original_model.predict_proba(X)[:, 1].astype(np.float32, copy=False)
+        y_proba_calibrated = calibrated_model.predict_proba(X)[:, 1].astype(np.float32, copy=False)
+        self._comparison_proba = (
+            original_model, calibrated_model, X, y_proba_original, y_proba_calibrated
+        )
+        
         # Evaluate both
-        original_metrics = self.evaluate_calibration(original_model, X, y, n_bins)
-        calibrated_metrics = self.evaluate_calibration(calibrated_model, X, y, n_bins)
+        original_metrics = self._evaluate_from_proba(y, y_proba_original, n_bins)
+        calibrated_metrics = self._evaluate_from_proba(y, y_proba_calibrated, n_bins)
         
         # Calculate improvement
         improvements = {
@@ -190,6 +289,63 @@ class ProbabilityCalibrator:
             'improvements': improvements
         }
     
+    def _calibration_errors(
+        self,
+        y_true: np.ndarray,
+        y_proba: np.ndarray,
+        n_bins: int = 10,
+        strategy: str = 'uniform'
+    ) -> Tuple[float, float, np.ndarray, np.ndarray]:
+        """
+        Calculate ECE, MCE and the calibration curve from shared bins
+        
+        Args:
+            strategy: 'uniform' for equal-width bins or 'quantile' for
+                equal-count bins (same edges as sklearn's calibration_curve)
+        
+        Returns:
+            Tuple of (ece, mce, fraction_of_positives, mean_predicted_value);
+            the curve arrays only contain non-empty bins
+        """
+        y_true = np.ascontiguousarray(y_true, dtype=np.float64)
+        
+        # Bin arithmetic runs on float32 probabilities (bin resolution is ~1/n_bins);
+        # per-bin sums below still accumulate in float64
+        y_proba = np.asarray(y_proba)
+        proba_dtype = np.float32 if y_proba.dtype == np.float32 else np.float64
+        y_proba = np.ascontiguousarray(y_proba, dtype=proba_dtype)
+        
+        # Compiled single-pass kernel avoids per-call NumPy dispatch overhead
+        if strategy == 'uniform' and NUMBA_AVAILABLE:
+            ece, mce, frac_pos, mean_pred = ece_mce_kernel(y_true, y_proba, n_bins)
+            return float(ece), float(mce), frac_pos, mean_pred
+        
+        if strategy == 'uniform':
+            bin_indices = _assign_uniform_bins(y_proba, n_bins)
+        elif strategy == 'quantile':
+            edges = np.quantile(y_proba, np.linspace(0, 1, n_bins + 1))
+            bin_indices = np.searchsorted(edges[1:-1], y_proba)
+        else:
+            raise ValueError(f"Invalid strategy '{strategy}', expected 'uniform' or 'quantile'")
+        
+        # Per-bin counts and sums in a single scatter-add pass each
+        counts = np.bincount(bin_indices, minlength=n_bins)
+        sum_y = np.bincount(bin_indices, weights=y_true, minlength=n_bins)
+        sum_p = np.bincount(bin_indices, weights=y_proba, minlength=n_bins)
+        
+        # Gather non-empty bins once so the divisions never see a zero count
+        # (no NaNs to clean up, no warning suppression needed)
+        nz = np.flatnonzero(counts)
+        nz_counts = counts[nz]
+        frac_pos = sum_y[nz] / nz_counts
+        mean_pred = sum_p[nz] / nz_counts
+        per_bin_err = np.abs(frac_pos - mean_pred)
+        
+        ece = float(nz_counts @ per_bin_err / len(y_true)) if len(y_true) else 0.0
+        mce = float(per_bin_err.max()) if per_bin_err.size else 0.0
+        
+        return ece, mce, frac_pos, mean_pred
+    
     def _calculate_ece(
         self,
         y_true: np.ndarray,
@@ -202,21 +358,7 @@ class ProbabilityCalibrator:
         ECE measures average difference between predicted probabilities
         and actual frequencies across bins.
         """
-        bins = np.linspace(0, 1, n_bins + 1)
-        bin_indices = np.digitize(y_proba, bins) - 1
-        
-        ece = 0.0
-        total_samples = len(y_true)
-        
-        for i in range(n_bins):
-            mask = bin_indices == i
-            if mask.sum() > 0:
-                bin_accuracy = y_true[mask].mean()
-                bin_confidence = y_proba[mask].mean()
-                bin_weight = mask.sum() / total_samples
-                ece += bin_weight * abs(bin_accuracy - bin_confidence)
-        
-        return ece
+        return self._calibration_errors(y_true, y_proba, n_bins)[0]
     
     def _calculate_mce(
         self,
@@ -230,20 +372,7 @@ class ProbabilityCalibrator:
         MCE is the maximum difference between predicted probabilities
         and actual frequencies across all bins.
         """
-        bins = np.linspace(0, 1, n_bins + 1)
-        bin_indices = np.digitize(y_proba, bins) - 1
-        
-        max_error = 0.0
-        
-        for i in range(n_bins):
-            mask = bin_indices == i
-            if mask.sum() > 0:
-                bin_accuracy = y_true[mask].mean()
-                bin_confidence = y_proba[mask].mean()
-                error = abs(bin_accuracy - bin_confidence)
-                max_error = max(max_error, error)
-        
-        return max_error
+        return self._calibration_errors(y_true, y_proba, n_bins)[1]
     
     def plot_calibration_curve(
         self,
@@ -263,56 +392,67 @@ class ProbabilityCalibrator:
             y: Target Series
             save_path: Path to save plot
         """
-        # Get predictions
-        y_proba_original = original_model.predict_proba(X)[:, 1]
-        y_proba_calibrated = calibrated_model.predict_proba(X)[:, 1]
+        # Reuse probabilities from compare_calibration on the same inputs
+        cached = self._comparison_proba
+        if (
+            cached is not None
+            and cached[0] is original_model
+            and cached[1] is calibrated_model
+            and cached[2] is X
+        ):
+            y_proba_original, y_proba_calibrated = cached[3], cached[4]
+        else:
+            y_proba_original = original_model.predict_proba(X)[:, 1].astype(np.float32, copy=False)
+            y_proba_calibrated = calibrated_model.predict_proba(X)[:, 1].astype(np.float32, copy=False)
         
         # Calculate calibration curves
-        frac_pos_original, mean_pred_original = calibration_curve(
+        _, _, frac_pos_original, mean_pred_original = self._calibration_errors(
             y, y_proba_original, n_bins=10, strategy='quantile'
         )
-        frac_pos_calibrated, mean_pred_calibrated = calibration_curve(
+        _, _, frac_pos_calibrated, mean_pred_calibrated = self._calibration_errors(
             y, y_proba_calibrated, n_bins=10, strategy='quantile'
         )
         
         # Plot
-        plt.figure(figsize=(10, 6))
+        plt = _import_pyplot()
+        fig, ax = plt.subplots(figsize=(10, 6))
         
         # Perfect calibration line
-        plt.plot([0, 1], [0, 1], 'k--', label='Perfect Calibration', linewidth=2)
+        ax.plot([0, 1], [0, 1], 'k--', label='Perfect Calibration', linewidth=2, rasterized=True)
         
         # Original model
-        plt.plot(
+        ax.plot(
             mean_pred_original, frac_pos_original, 's-',
-            label='Original Model', linewidth=2, markersize=8
+            label='Original Model', linewidth=2, markersize=8, rasterized=True
         )
         
         # Calibrated model
-        plt.plot(
+        ax.plot(
             mean_pred_calibrated, frac_pos_calibrated, 'o-',
-            label='Calibrated Model', linewidth=2, markersize=8
+            label='Calibrated Model', linewidth=2, markersize=8, rasterized=True
         )
         
-        plt.xlabel('Mean Predicted Probability', fontsize=12)
-        plt.ylabel('Fraction of Positives', fontsize=12)
-        plt.title('Calibration Curve Comparison', fontsize=14, fontweight='bold')
-        plt.legend(fontsize=11)
-        plt.grid(True, alpha=0.3)
+        ax.set_xlabel('Mean Predicted Probability', fontsize=12)
+        ax.set_ylabel('Fraction of Positives', fontsize=12)
+        ax.set_title('Calibration Curve Comparison', fontsize=14, fontweight='bold')
+        ax.legend(fontsize=11)
+        ax.grid(True, alpha=0.3)
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+            fig.savefig(save_path, dpi=300, bbox_inches='tight')
             self.logger.info(f"Calibration plot saved to {save_path}", category="ml_training")
         else:
             plt.show()
         
-        plt.close()
+        plt.close(fig)
     
     def get_confidence_bins(
         self,
         model,
         X: pd.DataFrame,
         y: pd.Series,
-        bins: Optional[list] = None
+        bins: Optional[list] = None,
+        y_proba: Optional[np.ndarray] = None
     ) -> Dict[str, Dict[str, Any]]:
         """
         Analyze accuracy by confidence level
@@ -322,6 +462,8 @@ class ProbabilityCalibrator:
             X: Feature DataFrame
             y: Target Series
             bins: Custom bin edges (default: [0, 0.6, 0.8, 1.0])
+            y_proba: Precomputed positive-class probabilities for X
+                (skips inference when provided)
             
         Returns:
             Dict with accuracy stats per confidence bin
@@ -332,27 +474,42 @@ class ProbabilityCalibrator:
         else:
             bin_labels = [f'bin_{i}' for i in range(len(bins) - 1)]
         
-        y_proba = model.predict_proba(X)[:, 1]
-        y_pred = model.predict(X)
+        if y_proba is None:
+            y_proba = model.predict_proba(X)[:, 1].astype(np.float32, copy=False)
+        
+        # Binary predict() is argmax over the two class probabilities
+        # (ties go to class 0), so derive it instead of a second inference pass
+        y_pred = (np.asarray(y_proba) > 0.5).astype(np.int8)
+        
+        y_proba = np.asarray(y_proba)
+        correct = (np.asarray(y_pred) == np.asarray(y)).astype(np.int64)
+        
+        # Locate each probability's [low, high) bin, dropping out-of-range values
+        edges = np.asarray(bins, dtype=np.float64)
+        n_bins = len(edges) - 1
+        bin_indices = np.searchsorted(edges, y_proba, side='right') - 1
+        in_range = (bin_indices >= 0) & (bin_indices < n_bins)
+        bin_indices = bin_indices[in_range]
+        
+        counts = np.bincount(bin_indices, minlength=n_bins)
+        sum_correct = np.bincount(bin_indices, weights=correct[in_range], minlength=n_bins)
+        sum_conf = np.bincount(bin_indices, weights=y_proba[in_range], minlength=n_bins)
         
         results = {}
         
-        for i, (low, high) in enumerate(zip(bins[:-1], bins[1:])):
-            mask = (y_proba >= low) & (y_proba < high)
+        for i in np.flatnonzero(counts):
+            count = counts[i]
+            actual_accuracy = sum_correct[i] / count
+            predicted_confidence = sum_conf[i] / count
             
-            if mask.sum() > 0:
-                actual_accuracy = (y_pred[mask] == y[mask]).mean()
-                predicted_confidence = y_proba[mask].mean()
-                count = mask.sum()
-                
-                results[bin_labels[i]] = {
-                    'range': (low, high),
-                    'count': int(count),
-                    'percentage': float(count / len(y)),
-                    'predicted_confidence': float(predicted_confidence),
-                    'actual_accuracy': float(actual_accuracy),
-                    'calibration_error': abs(predicted_confidence - actual_accuracy)
-                }
+            results[bin_labels[i]] = {
+                'range': (bins[i], bins[i + 1]),
+                'count': int(count),
+                'percentage': float(count / len(y)),
+                'predicted_confidence': float(predicted_confidence),
+                'actual_accuracy': float(actual_accuracy),
+                'calibration_error': abs(predicted_confidence - actual_accuracy)
+            }
         
         return results
 
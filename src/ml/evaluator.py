@@ -4,11 +4,10 @@ Evaluates model performance and calculates metrics
 """
 import pandas as pd
 import numpy as np
-from sklearn.metrics import (
-    accuracy_score, precision_score, recall_score, f1_score,
-    confusion_matrix, classification_report
-)
+from sklearn.metrics import confusion_matrix
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
 from typing import Dict, Any, List
+from bisect import bisect_left
 from datetime import datetime, timedelta
 
 from src.utils.logger import get_logger
@@ -16,6 +15,51 @@ from src.utils.logger import get_logger
 logger = get_logger()
 
 
+def _apply_scaler_inplace(X, scaler) -> np.ndarray:
+    """
+    Scale X into a single float32 buffer using the fitted scaler's parameters
+    
+    Handles StandardScaler (mean_/scale_), MinMaxScaler (min_/scale_) and
+    RobustScaler (center_/scale_), honoring their centering/scaling flags, by
+    updating one float32 copy of X in place instead of allocating
+    scaler.transform's float64 output. Other scalers (including subclasses,
+    which may override transform) fall back to scaler.transform.
+    """
+    def _fallback() -> np.ndarray:
+        return np.ascontiguousarray(scaler.transform(X), dtype=np.float32)
+    
+    scaler_type = type(scaler)
+    if scaler_type is MinMaxScaler:
+        if scaler.clip:
+            return _fallback()
+        shift, scale, multiply = scaler.min_, scaler.scale_, True
+    elif scaler_type is RobustScaler:
+        shift = scaler.center_ if scaler.with_centering else None
+        scale = scaler.scale_ if scaler.with_scaling else None
+        multiply = False
+    elif scaler_type is StandardScaler:
+        shift = scaler.mean_ if scaler.with_mean else None
+        scale = scaler.scale_ if scaler.with_std else None
+        multiply = False
+    else:
+        return _fallback()
+    
+    X_out = np.array(X, dtype=np.float32, order='C', copy=True)
+    
+    if multiply:
+        # MinMaxScaler: X * scale_ + min_
+        X_out *= scale.astype(np.float32)
+        X_out += shift.astype(np.float32)
+    else:
+        # Standard/Robust: (X - center) / scale
+        if shift is not None:
+            X_out -= shift.astype(np.float32)
+        if scale is not None:
+            X_out /= scale.astype(np.float32)
+    
+    return X_out
+
+
 class ModelEvaluator:
     """
     Evaluate ML model performance
@@ -51,27 +95,40 @@ class ModelEvaluator:
             Dict with evaluation metrics
         """
         try:
-            # Scale if scaler provided
+            # Scale if scaler provided; materialize one contiguous float32 array
+            # shared by all inference calls
             if scaler:
-                X_test_scaled = scaler.transform(X_test)
+                X_test_scaled = _apply_scaler_inplace(X_test, scaler)
             else:
-                X_test_scaled = X_test
+                X_test_scaled = X_test.to_numpy(copy=False) if hasattr(X_test, 'to_numpy') else X_test
+            X_test_scaled = np.ascontiguousarray(X_test_scaled, dtype=np.float32)
             
-            # Predictions
-            y_pred = model.predict(X_test_scaled)
-            y_proba = model.predict_proba(X_test_scaled)[:, 1] if hasattr(model, 'predict_proba') else None
+            # Plain integer labels skip per-metric pandas input coercion
+            y_np = np.asarray(y_test, dtype=np.int8)
             
-            # Basic metrics
-            accuracy = accuracy_score(y_test, y_pred)
-            precision = precision_score(y_test, y_pred, average='binary', zero_division=0)
-            recall = recall_score(y_test, y_pred, average='binary', zero_division=0)
-            f1 = f1_score(y_test, y_pred, average='binary', zero_division=0)
+            # Predictions - a single inference pass; predict() is argmax of the probabilities
+            if hasattr(model, 'predict_proba'):
+                proba = model.predict_proba(X_test_scaled)
+                pred_idx = proba.argmax(axis=1)
+                classes = getattr(model, 'classes_', None)
+                y_pred = classes[pred_idx] if classes is not None else pred_idx
+                y_proba = proba[:, 1].astype(np.float32, copy=False)
+            else:
+                y_pred = model.predict(X_test_scaled)
+                y_proba = None
+            
+            # Per-sample correctness, computed once and shared by the confidence analysis
+            correct = (y_pred == y_np).astype(np.int8)
             
-            # Confusion matrix
-            cm = confusion_matrix(y_test, y_pred)
+            # Confusion matrix - every other metric is derived from its four cells
+            cm = confusion_matrix(y_np, y_pred, labels=[0, 1])
+            report = self._binary_report(cm)
             
-            # Classification report
-            report = classification_report(y_test, y_pred, output_dict=True, zero_division=0)
+            # Basic metrics
+            accuracy = report['accuracy']
+            precision = report['1']['precision']
+            recall = report['1']['recall']
+            f1 = report['1']['f1-score']
             
             result = {
                 'accuracy': accuracy,
@@ -85,7 +142,7 @@ class ModelEvaluator:
             
             # Performance by confidence
             if y_proba is not None:
-                confidence_analysis = self._analyze_by_confidence(y_test, y_pred, y_proba)
+                confidence_analysis = self._analyze_by_confidence(correct, y_proba)
                 result['confidence_analysis'] = confidence_analysis
             
             self.logger.info(
@@ -99,36 +156,109 @@ class ModelEvaluator:
             self.logger.error(f"Error evaluating model: {str(e)}", category="ml_training")
             return {'error': str(e)}
     
+    @staticmethod
+    def _binary_report(cm: np.ndarray) -> Dict[str, Any]:
+        """
+        Build a classification_report-style dict from a 2x2 confusion matrix
+        
+        Undefined ratios (zero denominators) are reported as 0.0, matching
+        sklearn's zero_division=0.
+        """
+        tn, fp, fn, tp = (int(v) for v in cm.ravel())
+        total = tn + fp + fn + tp
+        
+        def _ratio(num: int, den: int) -> float:
+            return num / den if den else 0.0
+        
+        def _class_stats(hits: int, predicted: int, support: int) -> Dict[str, float]:
+            precision = _ratio(hits, predicted)
+            recall = _ratio(hits, support)
+            f1 = _ratio(2 * precision * recall, precision + recall)
+            return {'precision': precision, 'recall': recall, 'f1-score': f1, 'support': support}
+        
+        class_0 = _class_stats(tn, tn + fn, tn + fp)
+        class_1 = _class_stats(tp, tp + fp, fn + tp)
+        
+        metric_names = ('precision', 'recall', 'f1-score')
+        macro = {m: (class_0[m] + class_1[m]) / 2 for m in metric_names}
+        weighted = {
+            m: _ratio(class_0[m] * class_0['support'] + class_1[m] * class_1['support'], total)
+            for m in metric_names
+        }
+        macro['support'] = total
+        weighted['support'] = total
+        
+        return {
+            '0': class_0,
+            '1': class_1,
+            'accuracy': _ratio(tn + tp, total),
+            'macro avg': macro,
+            'weighted avg': weighted
+        }
+    
     def _analyze_by_confidence(
         self,
-        y_true: pd.Series,
-        y_pred: pd.Series,
+        correct: np.ndarray,
         y_proba: np.ndarray
     ) -> Dict[str, Any]:
-        """Analyze performance by confidence level"""
+        """
+        Analyze performance by confidence level
+        
+        Args:
+            correct: Per-sample 0/1 array, 1 where the prediction matched the label
+            y_proba: Predicted probability of the positive class
+        """
         results = {}
         
-        confidence_bins = [
-            (0.0, 0.6, 'low'),
-            (0.6, 0.8, 'medium'),
-            (0.8, 1.0, 'high')
-        ]
+        labels = ('low', 'medium', 'high')
         
-        for min_conf, max_conf, label in confidence_bins:
-            mask = (y_proba >= min_conf) & (y_proba < max_conf)
-            
-            if mask.sum() > 0:
-                accuracy = accuracy_score(y_true[mask], y_pred[mask])
-                count = mask.sum()
-                
-                results[label] = {
-                    'accuracy': accuracy,
-                    'count': int(count),
-                    'percentage': float(count / len(y_true))
-                }
+        # Half-open bins [0, 0.6), [0.6, 0.8), [0.8, 1.0): one searchsorted,
+        # then scatter-add counts and hits. Index 0 (below 0) and the last
+        # index (1.0 and above, NaN) fall outside every bin, as before.
+        bin_indices = np.searchsorted(np.array([0.0, 0.6, 0.8, 1.0]), y_proba, side='right')
+        counts = np.bincount(bin_indices, minlength=len(labels) + 2)[1:len(labels) + 1]
+        correct_sums = np.bincount(
+            bin_indices, weights=correct, minlength=len(labels) + 2
+        )[1:len(labels) + 1]
+        
+        for i in np.flatnonzero(counts):
+            count = counts[i]
+            results[labels[i]] = {
+                'accuracy': float(correct_sums[i] / count),
+                'count': int(count),
+                'percentage': float(count / len(correct))
+            }
         
         return results
     
+    @staticmethod
+    def _as_df(predictions: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Convert prediction dicts to a DataFrame with the defaults
+        the per-record .get() lookups used to supply
+        """
+        df = pd.DataFrame.from_records(predictions)
+        
+        defaults = {
+            'is_verified': False,
+            'was_correct': False,
+            'confidence': 0.0,
+            'sentiment': None,
+            'timestamp': datetime.now(),
+        }
+        for column, default in defaults.items():
+            if column not in df:
+                df[column] = default
+            elif default is not None:
+                df[column] = df[column].where(df[column].notna(), default)
+        
+        df['is_verified'] = df['is_verified'].astype(bool)
+        df['was_correct'] = df['was_correct'].astype(bool)
+        df['confidence'] = df['confidence'].astype(float)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        
+        return df
+    
     def calculate_prediction_stats(
         self,
         predictions: List[Dict[str, Any]]
@@ -142,26 +272,27 @@ class ModelEvaluator:
         Returns:
             Dict with statistics
         """
+        empty = {'total': 0, 'correct': 0, 'incorrect': 0, 'accuracy': 0.0}
+        
         if not predictions:
-            return {'total': 0, 'correct': 0, 'incorrect': 0, 'accuracy': 0.0}
+            return empty
         
-        verified = [p for p in predictions if p.get('is_verified', False)]
+        df = self._as_df(predictions)
+        verified = df[df['is_verified']]
         
-        if not verified:
-            return {'total': 0, 'correct': 0, 'incorrect': 0, 'accuracy': 0.0}
+        if verified.empty:
+            return empty
         
         total = len(verified)
-        correct = sum(1 for p in verified if p.get('was_correct', False))
+        correct = int(verified['was_correct'].sum())
         incorrect = total - correct
         accuracy = correct / total if total > 0 else 0.0
         
         # Average confidence
-        avg_confidence = np.mean([p.get('confidence', 0.0) for p in verified])
+        avg_confidence = float(verified['confidence'].mean())
         
         # Sentiment breakdown
-        bullish = sum(1 for p in verified if p.get('sentiment') == 'BULLISH')
-        bearish = sum(1 for p in verified if p.get('sentiment') == 'BEARISH')
-        neutral = sum(1 for p in verified if p.get('sentiment') == 'NEUTRAL')
+        sentiment_counts = verified['sentiment'].value_counts()
         
         return {
             'total': total,
@@ -169,9 +300,9 @@ class ModelEvaluator:
             'incorrect': incorrect,
             'accuracy': accuracy,
             'avg_confidence': avg_confidence,
-            'bullish_count': bullish,
-            'bearish_count': bearish,
-            'neutral_count': neutral
+            'bullish_count': int(sentiment_counts.get('BULLISH', 0)),
+            'bearish_count': int(sentiment_counts.get('BEARISH', 0)),
+            'neutral_count': int(sentiment_counts.get('NEUTRAL', 0))
         }
     
     def calculate_accuracy_trend(
@@ -192,35 +323,28 @@ class ModelEvaluator:
         if not predictions:
             return []
         
-        # Sort by timestamp
-        sorted_preds = sorted(predictions, key=lambda x: x.get('timestamp', datetime.min))
+        df = self._as_df(predictions)
+        verified = df[df['is_verified']]
         
-        # Group by day
-        daily_stats = {}
+        if verified.empty:
+            return []
         
-        for pred in sorted_preds:
-            if not pred.get('is_verified'):
-                continue
-            
-            date = pred.get('timestamp', datetime.now()).date()
-            
-            if date not in daily_stats:
-                daily_stats[date] = {'correct': 0, 'total': 0}
-            
-            daily_stats[date]['total'] += 1
-            if pred.get('was_correct', False):
-                daily_stats[date]['correct'] += 1
+        # Group by day
+        daily_stats = verified.groupby(verified['timestamp'].dt.date)['was_correct'].agg(
+            correct='sum', total='size'
+        )
         
-        # Calculate rolling accuracy
+        # Calculate rolling accuracy from prefix sums over the sorted days
         trend = []
-        dates = sorted(daily_stats.keys())
+        dates = daily_stats.index.tolist()
+        cum_correct = np.cumsum(daily_stats['correct'].to_numpy())
+        cum_total = np.cumsum(daily_stats['total'].to_numpy())
         
-        for date in dates:
-            window_start = date - timedelta(days=window_days)
-            window_dates = [d for d in dates if window_start <= d <= date]
+        for j, date in enumerate(dates):
+            i = bisect_left(dates, date - timedelta(days=window_days))
             
-            window_correct = sum(daily_stats[d]['correct'] for d in window_dates)
-            window_total = sum(daily_stats[d]['total'] for d in window_dates)
+            window_correct = int(cum_correct[j] - (cum_correct[i - 1] if i > 0 else 0))
+            window_total = int(cum_total[j] - (cum_total[i - 1] if i > 0 else 0))
             
             if window_total > 0:
                 accuracy = window_correct / window_total
@@ -4,13 +4,24 @@ Creates ML features from market data and indicators
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Any, List, Optional
+from collections import OrderedDict
 from datetime import datetime
 import warnings
 
 from src.indicators.technical import TechnicalIndicators
 from src.indicators.smc import SMCAnalyzer
 from src.utils.logger import get_logger
+from config.settings import MLConfig
+from src.ml._njit import NUMBA_AVAILABLE
+from src.ml._candle_kernels import candle_pattern_kernel
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
 
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
@@ -29,22 +40,62 @@ class FeatureEngineer:
     - Time-based features
     """
     
-    def __init__(self):
-        """Initialize feature engineer"""
+    # Indicator outputs stay float64 (price-level EMAs/SMA and cumulative OBV
+    # need the precision); other engineered columns are downcast
+    INDICATOR_COLUMNS = (
+        'rsi', 'macd', 'macd_signal', 'macd_hist',
+        'adx', 'plus_di', 'minus_di',
+        'bb_upper', 'bb_middle', 'bb_lower', 'bb_width',
+        'atr', 'atr_pct', 'ema_20', 'ema_50', 'sma_200',
+        'obv', 'mfi',
+    )
+    
+    # Leading bars that are always incomplete (SMA200 is the longest lookback)
+    WARMUP_BARS = 199
+    
+    # 0/1 flags and small calendar integers stored as int8
+    INT8_COLUMNS = ('hour', 'day_of_week', 'higher_high', 'lower_low')
+    
+    def __init__(self, indicator_cache_size: int = 8, use_polars: Optional[bool] = None):
+        """
+        Initialize feature engineer
+        
+        Args:
+            indicator_cache_size: Number of distinct OHLCV windows whose indicator
+                columns are memoized (0 disables the cache)
+            use_polars: Build features with the Polars lazy pipeline when
+                Polars is installed (None reads MLConfig.USE_POLARS_FEATURES)
+        """
         self.tech_indicators = TechnicalIndicators()
         self.smc_analyzer = SMCAnalyzer()
         self.logger = logger
+        self.indicator_cache_size = indicator_cache_size
+        self._indicator_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self.use_polars = MLConfig.USE_POLARS_FEATURES if use_polars is None else use_polars
+    
+    def clear_cache(self):
+        """Drop all memoized indicator columns"""
+        self._indicator_cache.clear()
     
     def create_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Create all ML features from OHLCV data
         
+        Uses the Polars pipeline when ``use_polars`` is set and Polars is
+        installed, the pandas pipeline otherwise; both produce the same frame.
+        
         Args:
             df: DataFrame with OHLCV data
             
         Returns:
             DataFrame with features
         """
+        if self.use_polars and POLARS_AVAILABLE:
+            return self.create_features_polars(df)
+        return self._create_features_pandas(df)
+    
+    def _create_features_pandas(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Create all ML features with the eager pandas ``_add_*`` chain"""
         try:
             self.logger.info("Creating ML features", category="ml_training")
             
@@ -72,7 +123,10 @@ class FeatureEngineer:
             features_df = self._add_lagged_features(features_df)
             
             # Drop NaN values
-            features_df = features_df.dropna()
+            features_df = self._drop_incomplete_rows(features_df)
+            
+            # Narrow engineered columns (input OHLCV columns are left untouched)
+            features_df = self._downcast_features(features_df, df.columns)
             
             self.logger.info(f"Created {len(features_df.columns)} features", category="ml_training")
             
@@ -82,145 +136,512 @@ class FeatureEngineer:
             self.logger.error(f"Error creating features: {str(e)}", category="ml_training")
             return df
     
+    def create_features_chunked(
+        self,
+        df: pd.DataFrame,
+        chunk_size: int = 50_000,
+        warmup: int = 500
+    ) -> pd.DataFrame:
+        """
+        Create features over overlapping chunks to bound peak memory
+        
+        Each chunk is extended backwards by ``warmup`` bars so rolling windows
+        (SMA200) are fully populated and recursive indicators (EMA, ADX, RSI)
+        have converged; the warmup rows are trimmed by timestamp after
+        ``create_features``. OBV is cumulative, so each chunk's OBV is shifted
+        to continue the previous chunk's series on their overlap.
+        
+        Args:
+            df: DataFrame with OHLCV data (sorted index)
+            chunk_size: Number of bars emitted per chunk
+            warmup: Lookback bars prepended to every chunk after the first
+            
+        Returns:
+            DataFrame with features
+        """
+        if len(df) <= chunk_size + warmup:
+            return self.create_features(df)
+        
+        parts = []
+        previous = None
+        
+        for start in range(0, len(df), chunk_size):
+            window = df.iloc[max(0, start - warmup):start + chunk_size]
+            features = self.create_features(window)
+            if features is window:
+                # create_features failed; report it the same way (input back)
+                return df
+            
+            # Stitch cumulative OBV onto the previous chunk
+            if previous is not None and 'obv' in features.columns and 'obv' in previous.columns:
+                overlap = features.index.intersection(previous.index)
+                if len(overlap):
+                    anchor = overlap[-1]
+                    features['obv'] = features['obv'] + (previous.at[anchor, 'obv'] - features.at[anchor, 'obv'])
+            
+            features = features[features.index >= df.index[start]]
+            parts.append(features)
+            previous = features
+        
+        return pd.concat(parts)
+    
+    def create_features_polars(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Create the same features as the pandas pipeline with one Polars lazy query
+        
+        TA-Lib indicators, candlestick flags, swing counts and calendar fields
+        are computed up front (they are not expressible as Polars column
+        expressions); every other column-wise feature is built as a single
+        LazyFrame expression graph and collected once. Falls back to the
+        pandas pipeline when Polars is not installed or the query fails.
+        
+        Args:
+            df: DataFrame with OHLCV data (DatetimeIndex)
+            
+        Returns:
+            DataFrame with features
+        """
+        if not POLARS_AVAILABLE:
+            self.logger.warning("Polars not available, using pandas feature pipeline", category="ml_training")
+            return self._create_features_pandas(df)
+        
+        try:
+            self.logger.info("Creating ML features (polars)", category="ml_training")
+            
+            base = self._add_indicator_features(df.copy())
+            o, h, l, c = self._ohlc_arrays(base)
+            doji, hammer, star, bull_engulf, bear_engulf, bullish = (
+                candle_pattern_kernel(o, h, l, c) if NUMBA_AVAILABLE
+                else self._candle_pattern_flags(o, h, l, c)
+            )
+            base = self._append_columns(base, {
+                'hour': base.index.hour,
+                'day_of_week': base.index.dayofweek,
+                'recent_highs': self._rolling_extreme_count(base['High'], 20, np.max),
+                'recent_lows': self._rolling_extreme_count(base['Low'], 20, np.min),
+                'is_doji': doji,
+                'is_hammer': hammer,
+                'is_shooting_star': star,
+                'bullish_engulfing': bull_engulf,
+                'bearish_engulfing': bear_engulf,
+                'is_bullish_candle': bullish,
+            })
+            
+            col = pl.col
+            close = col('Close').cast(pl.Float64)
+            high = col('High').cast(pl.Float64)
+            low = col('Low').cast(pl.Float64)
+            opn = col('Open').cast(pl.Float64)
+            volume = col('Volume').cast(pl.Float64)
+            
+            def flag(expr):
+                # Comparisons against missing values count as False, as in pandas
+                return expr.fill_null(False).cast(pl.Int64)
+            
+            def fill_missing(expr, value):
+                return expr.fill_nan(value).fill_null(value)
+            
+            # Price, volume, session and structure features (depend on inputs only)
+            stage1 = [
+                close.pct_change(1).alias('price_change'),
+                close.pct_change(5).alias('price_change_5'),
+                close.pct_change(10).alias('price_change_10'),
+                ((high - low) / close).alias('hl_range'),
+                ((close - opn).abs() / close).alias('body_size'),
+                ((high - pl.max_horizontal(opn, close)) / close).alias('upper_wick'),
+                ((pl.min_horizontal(opn, close) - low) / close).alias('lower_wick'),
+                ((close - low) / (high - low)).alias('close_position'),
+                volume.pct_change(1).alias('volume_change'),
+                (volume / volume.rolling_mean(20)).alias('volume_ma_ratio'),
+                flag((col('hour') >= 8) & (col('hour') < 17)).alias('is_london_session'),
+                flag((col('hour') >= 13) & (col('hour') < 22)).alias('is_ny_session'),
+                ((close - close.shift(20)) / close.shift(20)).alias('trend_strength'),
+                flag((high > high.shift(1)) & (high.shift(1) > high.shift(2))).alias('higher_high'),
+                flag((low < low.shift(1)) & (low.shift(1) < low.shift(2))).alias('lower_low'),
+                col('is_bullish_candle').cast(pl.Float64).rolling_sum(3).alias('consecutive_bullish'),
+                (1 - col('is_bullish_candle').cast(pl.Float64)).rolling_sum(3).alias('consecutive_bearish'),
+            ]
+            stage1 += [
+                (close / close.shift(lag) - 1).alias(f'return_lag_{lag}') for lag in [1, 2, 3, 5]
+            ]
+            
+            # Features built on top of stage-1 columns and indicators
+            stage2 = [
+                (col('higher_high').rolling_sum(10) - col('lower_low').rolling_sum(10)).alias('structure_score'),
+                (col('rsi') * col('volume_ma_ratio')).alias('rsi_volume_interaction'),
+                (flag(col('ema_20') > col('ema_50')) * col('macd').sign()).alias('trend_momentum_align'),
+                (col('bb_width') * col('close_position')).alias('vol_position_interaction'),
+                (col('adx') * (col('rsi') / 100)).alias('adx_rsi_interaction'),
+                fill_missing(col('atr_pct') / col('atr_pct').rolling_mean(50), 1.0).alias('volatility_regime'),
+                flag(col('adx') > 25).alias('is_trending'),
+                fill_missing(volume / volume.rolling_mean(50), 1.0).alias('volume_regime'),
+                fill_missing((close - close.shift(10)).abs() / close.diff().abs().rolling_sum(10),
+                             0.5).alias('price_efficiency'),
+                col('rsi').shift(1).alias('rsi_lag_1'),
+                (col('rsi') - col('rsi').shift(1)).alias('rsi_change'),
+                volume.shift(1).alias('volume_lag_1'),
+                col('return_lag_1').diff().alias('price_acceleration'),
+            ]
+            
+            # Same column order as the pandas pipeline
+            ordered = list(df.columns) + list(self.INDICATOR_COLUMNS) + [
+                'price_change', 'price_change_5', 'price_change_10',
+                'hl_range', 'body_size', 'upper_wick', 'lower_wick', 'close_position',
+                'volume_change', 'volume_ma_ratio',
+                'hour', 'day_of_week', 'is_london_session', 'is_ny_session',
+                'recent_highs', 'recent_lows', 'trend_strength',
+                'higher_high', 'lower_low', 'structure_score',
+                'is_doji', 'is_hammer', 'is_shooting_star',
+                'bullish_engulfing', 'bearish_engulfing',
+                'is_bullish_candle', 'consecutive_bullish', 'consecutive_bearish',
+                'rsi_volume_interaction', 'trend_momentum_align',
+                'vol_position_interaction', 'adx_rsi_interaction',
+                'volatility_regime', 'is_trending', 'volume_regime', 'price_efficiency',
+                'return_lag_1', 'return_lag_2', 'return_lag_3', 'return_lag_5',
+                'rsi_lag_1', 'rsi_change', 'volume_lag_1', 'price_acceleration',
+            ]
+            ordered = list(dict.fromkeys(ordered))
+            
+            result = (
+                pl.from_pandas(base)
+                .lazy()
+                .with_columns(stage1)
+                .with_columns(stage2)
+                .select(ordered)
+                .collect()
+            )
+            
+            # Column-wise to_numpy avoids a pyarrow dependency; nulls become NaN
+            features_df = pd.DataFrame(
+                {name: result.get_column(name).to_numpy() for name in result.columns},
+                index=base.index
+            )
+            
+            # Drop NaN values
+            features_df = self._drop_incomplete_rows(features_df)
+            
+            # Narrow engineered columns (input OHLCV columns are left untouched)
+            features_df = self._downcast_features(features_df, df.columns)
+            
+            self.logger.info(f"Created {len(features_df.columns)} features", category="ml_training")
+            
+            return features_df
+            
+        except Exception as e:
+            self.logger.warning(f"Polars feature pipeline failed ({e}), using pandas", category="ml_training")
+            return self._create_features_pandas(df)
+    
     def _add_indicator_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Add technical indicator features"""
+        """Add technical indicator features (memoized per OHLCV window)"""
+        if self.indicator_cache_size <= 0:
+            return self._append_columns(df, self._compute_indicator_features(df))
+        
+        key = self._indicator_cache_key(df)
+        cached = self._indicator_cache.get(key)
+        
+        if cached is None:
+            new_cols = self._compute_indicator_features(df)
+            self._indicator_cache[key] = pd.DataFrame(new_cols, index=df.index)
+            while len(self._indicator_cache) > self.indicator_cache_size:
+                self._indicator_cache.popitem(last=False)
+        else:
+            self._indicator_cache.move_to_end(key)
+            new_cols = {col: cached[col].to_numpy(copy=True) for col in cached.columns}
+        
+        return self._append_columns(df, new_cols)
+    
+    @staticmethod
+    def _indicator_cache_key(df: pd.DataFrame) -> tuple:
+        """
+        Fingerprint of the inputs the indicators depend on
+        
+        Indicators are positional over the OHLCV values, so the key hashes the
+        full OHLCV buffer; length, index bounds and the column set guard
+        against collisions and schema changes.
+        """
+        ohlcv = [col for col in ('Open', 'High', 'Low', 'Close', 'Volume') if col in df.columns]
+        values = np.ascontiguousarray(df[ohlcv].to_numpy(dtype=np.float64))
+        bounds = (df.index[0], df.index[-1]) if len(df) else (None, None)
+        
+        return (len(df), bounds, tuple(df.columns), hash(values.tobytes()))
+    
+    def _compute_indicator_features(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """Compute technical indicator columns"""
+        new_cols = {}
+        
         # RSI
-        df['rsi'] = self.tech_indicators.calculate_rsi(df)
+        new_cols['rsi'] = self.tech_indicators.calculate_rsi(df)
         
         # MACD
         macd = self.tech_indicators.calculate_macd(df)
-        df['macd'] = macd['macd']
-        df['macd_signal'] = macd['signal']
-        df['macd_hist'] = macd['histogram']
+        new_cols['macd'] = macd['macd']
+        new_cols['macd_signal'] = macd['signal']
+        new_cols['macd_hist'] = macd['histogram']
         
         # ADX
         adx = self.tech_indicators.calculate_adx(df)
-        df['adx'] = adx['adx']
-        df['plus_di'] = adx['plus_di']
-        df['minus_di'] = adx['minus_di']
+        new_cols['adx'] = adx['adx']
+        new_cols['plus_di'] = adx['plus_di']
+        new_cols['minus_di'] = adx['minus_di']
         
         # Bollinger Bands
         bb = self.tech_indicators.calculate_bollinger_bands(df)
-        df['bb_upper'] = bb['upper']
-        df['bb_middle'] = bb['middle']
-        df['bb_lower'] = bb['lower']
-        df['bb_width'] = (bb['upper'] - bb['lower']) / bb['middle']
+        new_cols['bb_upper'] = bb['upper']
+        new_cols['bb_middle'] = bb['middle']
+        new_cols['bb_lower'] = bb['lower']
+        new_cols['bb_width'] = (bb['upper'] - bb['lower']) / bb['middle']
         
         # ATR
-        df['atr'] = self.tech_indicators.calculate_atr(df)
-        df['atr_pct'] = df['atr'] / df['Close']
+        atr = self.tech_indicators.calculate_atr(df)
+        new_cols['atr'] = atr
+        new_cols['atr_pct'] = atr / df['Close']
         
         # Moving averages
-        df['ema_20'] = self.tech_indicators.calculate_ema(df, 20)
-        df['ema_50'] = self.tech_indicators.calculate_ema(df, 50)
-        df['sma_200'] = self.tech_indicators.calculate_sma(df, 200)
+        new_cols['ema_20'] = self.tech_indicators.calculate_ema(df, 20)
+        new_cols['ema_50'] = self.tech_indicators.calculate_ema(df, 50)
+        new_cols['sma_200'] = self.tech_indicators.calculate_sma(df, 200)
         
         # Volume indicators
-        df['obv'] = self.tech_indicators.calculate_obv(df)
-        df['mfi'] = self.tech_indicators.calculate_mfi(df)
+        new_cols['obv'] = self.tech_indicators.calculate_obv(df)
+        new_cols['mfi'] = self.tech_indicators.calculate_mfi(df)
         
-        return df
+        return new_cols
     
     def _add_price_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add price-based features"""
+        o, h, l, c = self._ohlc_arrays(df)
+        new_cols = {}
+        
         # Price changes
-        df['price_change'] = df['Close'].pct_change()
-        df['price_change_5'] = df['Close'].pct_change(periods=5)
-        df['price_change_10'] = df['Close'].pct_change(periods=10)
+        new_cols['price_change'] = df['Close'].pct_change()
+        new_cols['price_change_5'] = df['Close'].pct_change(periods=5)
+        new_cols['price_change_10'] = df['Close'].pct_change(periods=10)
         
         # High-Low range
-        df['hl_range'] = (df['High'] - df['Low']) / df['Close']
+        new_cols['hl_range'] = (h - l) / c
         
         # Body vs wick
-        df['body_size'] = abs(df['Close'] - df['Open']) / df['Close']
-        df['upper_wick'] = (df['High'] - df[['Open', 'Close']].max(axis=1)) / df['Close']
-        df['lower_wick'] = (df[['Open', 'Close']].min(axis=1) - df['Low']) / df['Close']
+        new_cols['body_size'] = np.abs(c - o) / c
+        new_cols['upper_wick'] = (h - np.fmax(o, c)) / c
+        new_cols['lower_wick'] = (np.fmin(o, c) - l) / c
         
         # Price position
-        df['close_position'] = (df['Close'] - df['Low']) / (df['High'] - df['Low'])
+        new_cols['close_position'] = (c - l) / (h - l)
         
-        return df
+        return self._append_columns(df, new_cols)
     
     def _add_volume_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add volume-based features"""
+        new_cols = {}
+        
         # Volume changes
-        df['volume_change'] = df['Volume'].pct_change()
-        df['volume_ma_ratio'] = df['Volume'] / df['Volume'].rolling(20).mean()
+        new_cols['volume_change'] = df['Volume'].pct_change()
+        new_cols['volume_ma_ratio'] = df['Volume'] / df['Volume'].rolling(20).mean()
         
-        return df
+        return self._append_columns(df, new_cols)
     
     def _add_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add time-based features"""
-        df['hour'] = df.index.hour
-        df['day_of_week'] = df.index.dayofweek
-        df['is_london_session'] = ((df['hour'] >= 8) & (df['hour'] < 17)).astype(int)
-        df['is_ny_session'] = ((df['hour'] >= 13) & (df['hour'] < 22)).astype(int)
+        hour = df.index.hour.to_numpy()
+        new_cols = {}
         
-        return df
+        new_cols['hour'] = hour
+        new_cols['day_of_week'] = df.index.dayofweek.to_numpy()
+        new_cols['is_london_session'] = ((hour >= 8) & (hour < 17)).astype(int)
+        new_cols['is_ny_session'] = ((hour >= 13) & (hour < 22)).astype(int)
+        
+        return self._append_columns(df, new_cols)
     
     def _add_smc_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add SMC-based features (simplified for performance)"""
         try:
+            _, h, l, c = self._ohlc_arrays(df)
+            n = len(c)
+            new_cols = {}
+            
             # Swing points count (simplified)
-            df['recent_highs'] = df['High'].rolling(20).apply(lambda x: (x == x.max()).sum())
-            df['recent_lows'] = df['Low'].rolling(20).apply(lambda x: (x == x.min()).sum())
+            new_cols['recent_highs'] = self._rolling_extreme_count(df['High'], 20, np.max)
+            new_cols['recent_lows'] = self._rolling_extreme_count(df['Low'], 20, np.min)
             
             # Trend strength
-            df['trend_strength'] = (df['Close'] - df['Close'].shift(20)) / df['Close'].shift(20)
-            
-            # Higher highs / lower lows detection
-            df['higher_high'] = ((df['High'] > df['High'].shift(1)) & 
-                                (df['High'].shift(1) > df['High'].shift(2))).astype(int)
-            df['lower_low'] = ((df['Low'] < df['Low'].shift(1)) & 
-                              (df['Low'].shift(1) < df['Low'].shift(2))).astype(int)
-            
-            # Market structure score (simple version)
-            df['structure_score'] = df['higher_high'].rolling(10).sum() - df['lower_low'].rolling(10).sum()
+            trend_strength = np.full(n, np.nan)
+            trend_strength[20:] = (c[20:] - c[:-20]) / c[:-20]
+            new_cols['trend_strength'] = trend_strength
+            
+            # Higher highs / lower lows detection (first two bars have no history)
+            higher_high = np.zeros(n, dtype=np.int8)
+            lower_low = np.zeros(n, dtype=np.int8)
+            if n > 2:
+                higher_high[2:] = (h[2:] > h[1:-1]) & (h[1:-1] > h[:-2])
+                lower_low[2:] = (l[2:] < l[1:-1]) & (l[1:-1] < l[:-2])
+            new_cols['higher_high'] = higher_high
+            new_cols['lower_low'] = lower_low
+            
+            # Market structure score (simple version): 10-bar rolling sum of
+            # higher_high - lower_low as a difference of int32 prefix sums
+            structure_score = np.full(n, np.nan)
+            if n >= 10:
+                csum = np.cumsum(higher_high - lower_low, dtype=np.int32)
+                structure_score[9:] = csum[9:]
+                structure_score[10:] -= csum[:-10]
+            new_cols['structure_score'] = structure_score
+            
+            df = self._append_columns(df, new_cols)
             
         except Exception as e:
             self.logger.warning(f"Error adding SMC features: {str(e)}", category="ml_training")
         
         return df
     
+    def _drop_incomplete_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Drop rows with missing values
+        
+        The warmup bars are sliced off directly; the remaining rows are only
+        gathered when a NaN actually occurs (e.g. a zero-range candle giving
+        0/0 in close_position), so the usual clean case avoids dropna's copy.
+        """
+        df = df.iloc[self.WARMUP_BARS:]
+        
+        incomplete = df.isna().any(axis=1).to_numpy()
+        if incomplete.any():
+            df = df[~incomplete]
+        
+        return df
+    
+    def _downcast_features(self, df: pd.DataFrame, input_columns) -> pd.DataFrame:
+        """
+        Cast engineered features to narrow dtypes
+        
+        Flag columns (``is_*``, ``*_engulfing``, ``higher_high``, ``lower_low``)
+        and calendar integers become int8; the remaining non-indicator float
+        features become float32.
+        
+        Args:
+            df: Feature DataFrame (after NaN rows are dropped)
+            input_columns: Columns of the raw input frame, which keep their dtype
+            
+        Returns:
+            DataFrame with downcast columns
+        """
+        skip = set(input_columns) | set(self.INDICATOR_COLUMNS)
+        dtype_map = {}
+        
+        for col in df.columns:
+            if col in skip:
+                continue
+            if col.startswith('is_') or col.endswith('_engulfing') or col in self.INT8_COLUMNS:
+                dtype_map[col] = np.int8
+            elif pd.api.types.is_float_dtype(df[col].dtype):
+                dtype_map[col] = np.float32
+        
+        if not dtype_map:
+            return df
+        
+        return df.astype(dtype_map)
+    
+    @staticmethod
+    def _ohlc_arrays(df: pd.DataFrame):
+        """Return Open, High, Low, Close as float64 NumPy arrays"""
+        return tuple(df[col].to_numpy(dtype=np.float64) for col in ('Open', 'High', 'Low', 'Close'))
+    
+    @staticmethod
+    def _append_columns(df: pd.DataFrame, new_cols: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Add a batch of feature columns with a single concat
+        
+        Columns that already exist are overwritten in place (as ``df[col] = ...``
+        would); the rest are appended in insertion order as one block, avoiding
+        the block fragmentation of many individual inserts.
+        """
+        new_cols = dict(new_cols)
+        for col in [c for c in new_cols if c in df.columns]:
+            df[col] = new_cols.pop(col)
+        
+        if not new_cols:
+            return df
+        
+        return pd.concat([df, pd.DataFrame(new_cols, index=df.index)], axis=1)
+    
+    @staticmethod
+    def _candle_pattern_flags(o: np.ndarray, h: np.ndarray, l: np.ndarray, c: np.ndarray):
+        """Vectorized fallback for candle_pattern_kernel when Numba is unavailable"""
+        # Body and wick sizes
+        body = np.abs(c - o)
+        upper_wick = h - np.fmax(o, c)
+        lower_wick = np.fmin(o, c) - l
+        body_ratio = body / (h - l)
+        
+        # Doji (small body, long wicks)
+        doji = body_ratio < 0.1
+        
+        # Hammer / Hanging Man (small upper wick, long lower wick, small body)
+        hammer = (lower_wick > 2 * body) & (upper_wick < body) & (body_ratio < 0.3)
+        
+        # Shooting Star / Inverted Hammer
+        star = (upper_wick > 2 * body) & (lower_wick < body) & (body_ratio < 0.3)
+        
+        # Engulfing patterns (first bar has no predecessor)
+        bullish = c > o
+        bearish = c < o
+        o_prev, c_prev = o[:-1], c[:-1]
+        o_cur, c_cur = o[1:], c[1:]
+        bull_engulf = np.zeros(len(c), dtype=bool)
+        bull_engulf[1:] = bullish[1:] & (c_prev < o_prev) & (o_cur < c_prev) & (c_cur > o_prev)
+        bear_engulf = np.zeros(len(c), dtype=bool)
+        bear_engulf[1:] = bearish[1:] & (c_prev > o_prev) & (o_cur > c_prev) & (c_cur < o_prev)
+        
+        return tuple(flag.astype(np.int8) for flag in
+                     (doji, hammer, star, bull_engulf, bear_engulf, bullish))
+    
+    @staticmethod
+    def _rolling_extreme_count(series: pd.Series, window: int, reducer) -> pd.Series:
+        """
+        Count values equal to the window extreme over a rolling window
+        
+        Vectorized equivalent of ``series.rolling(window).apply(lambda x: (x == x.max()).sum())``
+        (or ``.min()``), evaluated over a strided window view instead of a
+        Python callback per window.
+        """
+        values = series.to_numpy(dtype=np.float64)
+        result = np.full(len(values), np.nan)
+        
+        if len(values) >= window:
+            windows = sliding_window_view(values, window)
+            extreme = reducer(windows, axis=1, keepdims=True)
+            counts = (windows == extreme).sum(axis=1).astype(np.float64)
+            # Windows containing NaN yield NaN, as rolling().apply does
+            counts[np.isnan(extreme[:, 0])] = np.nan
+            result[window - 1:] = counts
+        
+        return pd.Series(result, index=series.index)
+    
     def _add_candlestick_patterns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add candlestick pattern features"""
         try:
-            # Body and wick sizes
-            body = abs(df['Close'] - df['Open'])
-            upper_wick = df['High'] - df[['Open', 'Close']].max(axis=1)
-            lower_wick = df[['Open', 'Close']].min(axis=1) - df['Low']
-            candle_range = df['High'] - df['Low']
-            
-            # Doji (small body, long wicks)
-            df['is_doji'] = ((body / candle_range) < 0.1).astype(int)
-            
-            # Hammer / Hanging Man (small upper wick, long lower wick, small body)
-            df['is_hammer'] = ((lower_wick > 2 * body) & 
-                              (upper_wick < body) & 
-                              (body / candle_range < 0.3)).astype(int)
-            
-            # Shooting Star / Inverted Hammer
-            df['is_shooting_star'] = ((upper_wick > 2 * body) & 
-                                     (lower_wick < body) & 
-                                     (body / candle_range < 0.3)).astype(int)
-            
-            # Engulfing patterns
-            bullish_engulf = ((df['Close'] > df['Open']) & 
-                             (df['Close'].shift(1) < df['Open'].shift(1)) &
-                             (df['Open'] < df['Close'].shift(1)) &
-                             (df['Close'] > df['Open'].shift(1)))
-            df['bullish_engulfing'] = bullish_engulf.astype(int)
-            
-            bearish_engulf = ((df['Close'] < df['Open']) & 
-                             (df['Close'].shift(1) > df['Open'].shift(1)) &
-                             (df['Open'] > df['Close'].shift(1)) &
-                             (df['Close'] < df['Open'].shift(1)))
-            df['bearish_engulfing'] = bearish_engulf.astype(int)
+            o, h, l, c = self._ohlc_arrays(df)
+            new_cols = {}
+            
+            if NUMBA_AVAILABLE:
+                (doji, hammer, star, bull_engulf,
+                 bear_engulf, bullish) = candle_pattern_kernel(o, h, l, c)
+            else:
+                (doji, hammer, star, bull_engulf,
+                 bear_engulf, bullish) = self._candle_pattern_flags(o, h, l, c)
+            
+            new_cols['is_doji'] = doji
+            new_cols['is_hammer'] = hammer
+            new_cols['is_shooting_star'] = star
+            new_cols['bullish_engulfing'] = bull_engulf
+            new_cols['bearish_engulfing'] = bear_engulf
             
             # Candle momentum (consecutive same-color candles)
-            df['is_bullish_candle'] = (df['Close'] > df['Open']).astype(int)
-            df['consecutive_bullish'] = df['is_bullish_candle'].rolling(3).sum()
-            df['consecutive_bearish'] = (1 - df['is_bullish_candle']).rolling(3).sum()
+            is_bullish_candle = pd.Series(bullish, index=df.index)
+            new_cols['is_bullish_candle'] = is_bullish_candle
+            new_cols['consecutive_bullish'] = is_bullish_candle.rolling(3).sum()
+            new_cols['consecutive_bearish'] = (1 - is_bullish_candle).rolling(3).sum()
+            
+            df = self._append_columns(df, new_cols)
             
         except Exception as e:
             self.logger.warning(f"Error adding candlestick patterns: {e}", category="ml_training")
@@ -230,22 +651,26 @@ class FeatureEngineer:
     def _add_feature_interactions(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add feature interaction terms"""
         try:
+            new_cols = {}
+            
             # RSI * Volume ratio
             if 'rsi' in df.columns and 'volume_ma_ratio' in df.columns:
-                df['rsi_volume_interaction'] = df['rsi'] * df['volume_ma_ratio']
+                new_cols['rsi_volume_interaction'] = df['rsi'] * df['volume_ma_ratio']
             
             # Trend * Momentum alignment
             if 'ema_20' in df.columns and 'ema_50' in df.columns and 'macd' in df.columns:
-                df['trend_momentum_align'] = ((df['ema_20'] > df['ema_50']).astype(int) * 
-                                             np.sign(df['macd']))
+                new_cols['trend_momentum_align'] = ((df['ema_20'] > df['ema_50']).astype(int) * 
+                                                    np.sign(df['macd']))
             
             # Volatility * Price position
             if 'bb_width' in df.columns and 'close_position' in df.columns:
-                df['vol_position_interaction'] = df['bb_width'] * df['close_position']
+                new_cols['vol_position_interaction'] = df['bb_width'] * df['close_position']
             
             # ADX * RSI (trend strength * momentum)
             if 'adx' in df.columns and 'rsi' in df.columns:
-                df['adx_rsi_interaction'] = df['adx'] * (df['rsi'] / 100)
+                new_cols['adx_rsi_interaction'] = df['adx'] * (df['rsi'] / 100)
+            
+            df = self._append_columns(df, new_cols)
             
         except Exception as e:
             self.logger.warning(f"Error adding feature interactions: {e}", category="ml_training")
@@ -255,24 +680,37 @@ class FeatureEngineer:
     def _add_market_regime_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add market regime detection features"""
         try:
+            new_cols = {}
+            
             # Volatility regime
             if 'atr_pct' in df.columns:
                 atr_ma = df['atr_pct'].rolling(50).mean()
-                df['volatility_regime'] = (df['atr_pct'] / atr_ma).fillna(1.0)
+                new_cols['volatility_regime'] = (df['atr_pct'] / atr_ma).fillna(1.0)
             
             # Trend regime (ADX-based)
             if 'adx' in df.columns:
-                df['is_trending'] = (df['adx'] > 25).astype(int)
+                new_cols['is_trending'] = (df['adx'] > 25).astype(int)
             
             # Volume regime
             if 'Volume' in df.columns:
                 vol_ma = df['Volume'].rolling(50).mean()
-                df['volume_regime'] = (df['Volume'] / vol_ma).fillna(1.0)
-            
-            # Price efficiency (trending vs choppy)
-            price_change = abs(df['Close'] - df['Close'].shift(10))
-            path_length = df['Close'].diff().abs().rolling(10).sum()
-            df['price_efficiency'] = (price_change / path_length).fillna(0.5)
+                new_cols['volume_regime'] = (df['Volume'] / vol_ma).fillna(1.0)
+            
+            # Price efficiency (trending vs choppy): net 10-bar move over the
+            # summed absolute 1-bar moves; 0.5 where undefined
+            close = df['Close'].to_numpy(dtype=np.float64)
+            n = len(close)
+            price_change = np.full(n, np.nan)
+            path_length = np.full(n, np.nan)
+            if n > 10:
+                price_change[10:] = np.abs(close[10:] - close[:-10])
+                # Window sums (not prefix sums) keep flat stretches at exactly 0
+                path_length[10:] = sliding_window_view(np.abs(np.diff(close)), 10).sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                efficiency = price_change / path_length
+            new_cols['price_efficiency'] = np.where(np.isnan(efficiency), 0.5, efficiency)
+            
+            df = self._append_columns(df, new_cols)
             
         except Exception as e:
             self.logger.warning(f"Error adding market regime features: {e}", category="ml_training")
@@ -282,21 +720,31 @@ class FeatureEngineer:
     def _add_lagged_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add lagged features for temporal patterns"""
         try:
+            close = df['Close'].to_numpy(dtype=np.float64)
+            new_cols = {}
+            
             # Lagged returns
+            returns = {}
             for lag in [1, 2, 3, 5]:
-                df[f'return_lag_{lag}'] = df['Close'].pct_change(lag)
+                ret = np.full(len(close), np.nan)
+                ret[lag:] = close[lag:] / close[:-lag] - 1
+                returns[lag] = ret
+                new_cols[f'return_lag_{lag}'] = ret
             
             # Lagged RSI
             if 'rsi' in df.columns:
-                df['rsi_lag_1'] = df['rsi'].shift(1)
-                df['rsi_change'] = df['rsi'] - df['rsi'].shift(1)
+                rsi_lag = df['rsi'].shift(1)
+                new_cols['rsi_lag_1'] = rsi_lag
+                new_cols['rsi_change'] = df['rsi'] - rsi_lag
             
             # Lagged volume
             if 'Volume' in df.columns:
-                df['volume_lag_1'] = df['Volume'].shift(1)
+                new_cols['volume_lag_1'] = df['Volume'].shift(1)
             
             # Price acceleration (rate of change of returns)
-            df['price_acceleration'] = df['Close'].pct_change().diff()
+            new_cols['price_acceleration'] = np.diff(returns[1], prepend=np.nan)
+            
+            df = self._append_columns(df, new_cols)
             
         except Exception as e:
             self.logger.warning(f"Error adding lagged features: {e}", category="ml_training")
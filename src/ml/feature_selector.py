@@ -2,12 +2,14 @@
 Feature Selection
 Selects most important features for model training
 """
+import os
 import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional, Tuple
 from sklearn.feature_selection import (
     SelectKBest, f_classif, mutual_info_classif,
-    RFE, SelectFromModel
+    SelectFromModel
 )
 from sklearn.ensemble import RandomForestClassifier
 import xgboost as xgb
@@ -41,6 +43,13 @@ class FeatureSelector:
         self.selected_features = []
         self.feature_scores = {}
         self.removed_features = []
+        self._shap_explainer_cache = {}
+        self._shap_importance_cache = {}
+    
+    def clear_shap_cache(self):
+        """Drop cached SHAP explainers and importances"""
+        self._shap_explainer_cache.clear()
+        self._shap_importance_cache.clear()
     
     def select_by_importance(
         self,
@@ -61,20 +70,36 @@ class FeatureSelector:
         Returns:
             List of selected feature names
         """
+        arr, columns = self._as_array(X)
+        return self._select_by_importance_array(arr, columns, y, n_features, method)
+    
+    def _select_by_importance_array(
+        self,
+        arr: np.ndarray,
+        columns: List[str],
+        y: pd.Series,
+        n_features: int,
+        method: str
+    ) -> List[str]:
+        """select_by_importance on a float32 feature matrix"""
         self.logger.info(
             f"Selecting {n_features} features using {method}",
             category="ml_training"
         )
         
-        if method in ['xgboost', 'both']:
-            xgb_importance = self._get_xgboost_importance(X, y)
-        else:
-            xgb_importance = {}
+        y_np = np.asarray(y)
         
-        if method in ['random_forest', 'both']:
-            rf_importance = self._get_rf_importance(X, y)
+        if method == 'both':
+            # Both fitters release the GIL; split the cores between them
+            n_jobs = max(1, (os.cpu_count() or 1) // 2)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                xgb_future = executor.submit(self._get_xgboost_importance, arr, y_np, columns, n_jobs)
+                rf_future = executor.submit(self._get_rf_importance, arr, y_np, columns, n_jobs)
+                xgb_importance = xgb_future.result()
+                rf_importance = rf_future.result()
         else:
-            rf_importance = {}
+            xgb_importance = self._get_xgboost_importance(arr, y_np, columns) if method == 'xgboost' else {}
+            rf_importance = self._get_rf_importance(arr, y_np, columns) if method == 'random_forest' else {}
         
         # Combine importances
         if method == 'both':
@@ -114,16 +139,23 @@ class FeatureSelector:
         X: pd.DataFrame,
         y: pd.Series,
         n_features: int = 50,
-        step: float = 0.1
+        step: float = 0.1,
+        max_iter: int = 2
     ) -> List[str]:
         """
-        Select features using Recursive Feature Elimination
+        Select features using bounded recursive feature elimination
+        
+        Each round fits one Random Forest and drops the least important
+        ``step`` of the features; the last round trims straight down to
+        ``n_features``, so at most ``max_iter`` forests are fitted (instead of
+        one per step as in sklearn's RFE).
         
         Args:
             X: Feature DataFrame
             y: Target Series
             n_features: Number of features to select
-            step: Fraction of features to remove at each iteration
+            step: Fraction (or count, if >= 1) of features to remove per round
+            max_iter: Maximum number of Random Forest fits
             
         Returns:
             List of selected feature names
@@ -133,27 +165,44 @@ class FeatureSelector:
             category="ml_training"
         )
         
-        # Use Random Forest as base estimator
-        estimator = RandomForestClassifier(
-            n_estimators=100,
-            random_state=42,
-            n_jobs=-1
-        )
-        
-        # Perform RFE
-        selector = RFE(
-            estimator=estimator,
-            n_features_to_select=n_features,
-            step=step
-        )
+        arr, columns = self._as_array(X)
+        remaining = list(range(len(columns)))
+        step_size = max(1, int(step * len(remaining))) if step < 1 else int(step)
+        y_np = np.asarray(y)
+        eliminated_rounds = []
         
-        selector.fit(X, y)
+        for i in range(max(1, max_iter)):
+            if len(remaining) <= n_features:
+                break
+            
+            # Use Random Forest as base estimator
+            estimator = RandomForestClassifier(
+                n_estimators=100,
+                random_state=42,
+                n_jobs=-1
+            )
+            estimator.fit(arr[:, remaining], y_np)
+            
+            # Least important first (stable so ties keep column order)
+            order = np.argsort(estimator.feature_importances_, kind='stable')
+            
+            if i == max_iter - 1 or len(remaining) - step_size <= n_features:
+                n_drop = len(remaining) - n_features
+            else:
+                n_drop = step_size
+            
+            dropped = set(order[:n_drop].tolist())
+            eliminated_rounds.append([f for j, f in enumerate(remaining) if j in dropped])
+            remaining = [f for j, f in enumerate(remaining) if j not in dropped]
         
         # Get selected features
-        self.selected_features = X.columns[selector.support_].tolist()
+        self.selected_features = [columns[j] for j in remaining]
         
-        # Get feature rankings
-        self.feature_scores = dict(zip(X.columns, selector.ranking_))
+        # Get feature rankings (1 = selected, higher = eliminated earlier)
+        ranking = np.ones(len(columns), dtype=int)
+        for rank, dropped_features in enumerate(reversed(eliminated_rounds), start=2):
+            ranking[dropped_features] = rank
+        self.feature_scores = dict(zip(columns, ranking.tolist()))
         
         self.logger.info(
             f"RFE selected {len(self.selected_features)} features",
@@ -165,7 +214,8 @@ class FeatureSelector:
     def select_by_correlation(
         self,
         X: pd.DataFrame,
-        threshold: float = 0.95
+        threshold: float = 0.95,
+        columns: Optional[List[str]] = None
     ) -> List[str]:
         """
         Remove highly correlated features
@@ -173,30 +223,39 @@ class FeatureSelector:
         Args:
             X: Feature DataFrame
             threshold: Correlation threshold (default 0.95)
+            columns: Subset of X's columns to consider (default: all), so
+                callers need not materialize ``X[columns]`` first
             
         Returns:
             List of features to keep
         """
+        arr, columns = self._as_array(X, columns)
+        return self._select_by_correlation_array(arr, columns, threshold)
+    
+    def _select_by_correlation_array(
+        self,
+        arr: np.ndarray,
+        columns: List[str],
+        threshold: float
+    ) -> List[str]:
+        """select_by_correlation on a float32 feature matrix"""
         self.logger.info(
             f"Removing features with correlation > {threshold}",
             category="ml_training"
         )
         
         # Calculate correlation matrix
-        corr_matrix = X.corr().abs()
+        corr_matrix = self._abs_correlation(arr)
         
-        # Find features to remove
-        upper_triangle = corr_matrix.where(
-            np.triu(np.ones(corr_matrix.shape), k=1).astype(bool)
-        )
+        # Find features to remove (correlated with any earlier column): zero
+        # the diagonal and lower triangle in place, then one column-wise any()
+        corr_matrix[np.tril_indices_from(corr_matrix)] = 0
+        drop_mask = np.any(corr_matrix > threshold, axis=0)
         
-        to_drop = [
-            column for column in upper_triangle.columns
-            if any(upper_triangle[column] > threshold)
-        ]
+        to_drop = [columns[i] for i in np.flatnonzero(drop_mask)]
         
         self.removed_features = to_drop
-        self.selected_features = [col for col in X.columns if col not in to_drop]
+        self.selected_features = [columns[i] for i in np.flatnonzero(~drop_mask)]
         
         self.logger.info(
             f"Removed {len(to_drop)} correlated features, kept {len(self.selected_features)}",
@@ -205,6 +264,31 @@ class FeatureSelector:
         
         return self.selected_features
     
+    @staticmethod
+    def _abs_correlation(arr: np.ndarray) -> np.ndarray:
+        """
+        Absolute Pearson correlation matrix via a single BLAS GEMM
+        
+        Columns are standardized once (in float64, to avoid cancellation on
+        large-valued features) and the F x F product runs in float32. Constant
+        columns get zero correlation, matching the NaN that ``X.corr()`` yields
+        and never exceeds a threshold. Matrices with missing values fall back
+        to pandas' pairwise-complete ``corr``.
+        """
+        if np.isnan(arr).any():
+            return np.nan_to_num(pd.DataFrame(arr).corr().abs().to_numpy())
+        
+        A = arr.astype(np.float64)
+        A -= A.mean(axis=0)
+        std = A.std(axis=0)
+        std[std == 0] = np.inf
+        A /= std
+        
+        A = np.ascontiguousarray(A, dtype=np.float32)
+        corr = (A.T @ A) / max(A.shape[0], 1)
+        
+        return np.abs(corr, out=corr)
+    
     def select_by_variance(
         self,
         X: pd.DataFrame,
@@ -220,17 +304,28 @@ class FeatureSelector:
         Returns:
             List of features to keep
         """
+        arr, columns = self._as_array(X)
+        return self._select_by_variance_array(arr, columns, threshold)
+    
+    def _select_by_variance_array(
+        self,
+        arr: np.ndarray,
+        columns: List[str],
+        threshold: float
+    ) -> List[str]:
+        """select_by_variance on a float32 feature matrix"""
         self.logger.info(
             f"Removing features with variance < {threshold}",
             category="ml_training"
         )
         
-        # Calculate variance
-        variances = X.var()
+        # Calculate variance (sample variance, NaN-skipping like DataFrame.var)
+        var = np.nanvar if np.isnan(arr).any() else np.var
+        variances = var(arr, axis=0, ddof=1, dtype=np.float64) if len(arr) > 1 else np.full(len(columns), np.nan)
         
-        # Select features above threshold
-        self.selected_features = variances[variances > threshold].index.tolist()
-        self.removed_features = variances[variances <= threshold].index.tolist()
+        # Select features above threshold (NaN variance lands in neither list)
+        self.selected_features = [col for col, v in zip(columns, variances) if v > threshold]
+        self.removed_features = [col for col, v in zip(columns, variances) if v <= threshold]
         
         self.logger.info(
             f"Removed {len(self.removed_features)} low-variance features",
@@ -267,15 +362,15 @@ class FeatureSelector:
         """
         self.logger.info("Starting comprehensive feature selection", category="ml_training")
         
-        original_features = X.columns.tolist()
+        arr, original_features = self._as_array(X)
+        position = {col: j for j, col in enumerate(original_features)}
         report = {
             'original_features': len(original_features),
             'steps': []
         }
         
         # Step 1: Remove low variance
-        step1_features = self.select_by_variance(X, variance_threshold)
-        X_step1 = X[step1_features]
+        step1_features = self._select_by_variance_array(arr, original_features, variance_threshold)
         report['steps'].append({
             'step': 'variance_threshold',
             'removed': len(original_features) - len(step1_features),
@@ -283,8 +378,10 @@ class FeatureSelector:
         })
         
         # Step 2: Remove correlation
-        step2_features = self.select_by_correlation(X_step1, correlation_threshold)
-        X_step2 = X_step1[step2_features]
+        step1_idx = [position[col] for col in step1_features]
+        step2_features = self._select_by_correlation_array(
+            arr[:, step1_idx], step1_features, correlation_threshold
+        )
         report['steps'].append({
             'step': 'correlation_threshold',
             'removed': len(step1_features) - len(step2_features),
@@ -293,7 +390,10 @@ class FeatureSelector:
         
         # Step 3: Select by importance
         if len(step2_features) > n_features:
-            final_features = self.select_by_importance(X_step2, y, n_features, method='both')
+            step2_idx = [position[col] for col in step2_features]
+            final_features = self._select_by_importance_array(
+                arr[:, step2_idx], step2_features, y, n_features, method='both'
+            )
         else:
             final_features = step2_features
         
@@ -338,14 +438,28 @@ class FeatureSelector:
             self.logger.warning("SHAP not available", category="ml_training")
             return {}
         
-        self.logger.info("Calculating SHAP values", category="ml_training")
-        
         try:
+            # Same model and identical data give identical (seeded) results
+            data_hash = hash(pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes())
+            importance_key = (id(model), n_samples, tuple(X.columns), data_hash)
+            cached = self._shap_importance_cache.get(importance_key)
+            if cached is not None and cached[0] is model:
+                return dict(cached[1])
+            
+            self.logger.info("Calculating SHAP values", category="ml_training")
+            
             # Sample data for efficiency
             X_sample = X.sample(min(n_samples, len(X)), random_state=42)
             
-            # Create explainer
-            explainer = shap.TreeExplainer(model)
+            # Create explainer (reused per model; the model reference guards
+            # against a recycled id() after the original is garbage collected)
+            cached_explainer = self._shap_explainer_cache.get(id(model))
+            if cached_explainer is not None and cached_explainer[0] is model:
+                explainer = cached_explainer[1]
+            else:
+                explainer = shap.TreeExplainer(model)
+                self._shap_explainer_cache[id(model)] = (model, explainer)
+            
             shap_values = explainer.shap_values(X_sample)
             
             # Get mean absolute SHAP values
@@ -355,47 +469,82 @@ class FeatureSelector:
             mean_shap = np.abs(shap_values).mean(axis=0)
             
             importance_dict = dict(zip(X.columns, mean_shap))
+            self._shap_importance_cache[importance_key] = (model, importance_dict)
             
-            return importance_dict
+            return dict(importance_dict)
             
         except Exception as e:
             self.logger.warning(f"SHAP calculation failed: {e}", category="ml_training")
             return {}
     
+    @staticmethod
+    def _as_array(X: pd.DataFrame, columns: Optional[List[str]] = None) -> Tuple[np.ndarray, List[str]]:
+        """
+        Convert features to a row-major float32 matrix once
+        
+        Args:
+            X: Feature DataFrame
+            columns: Subset of X's columns to gather (default: all)
+            
+        Returns:
+            Tuple of (C-contiguous float32 array, column names)
+        """
+        if columns is None:
+            return np.ascontiguousarray(X.to_numpy(dtype=np.float32)), X.columns.tolist()
+        
+        columns = list(columns)
+        arr = np.empty((len(X), len(columns)), dtype=np.float32)
+        for j, col in enumerate(columns):
+            arr[:, j] = X[col].to_numpy(dtype=np.float32)
+        
+        return arr, columns
+    
     def _get_xgboost_importance(
         self,
-        X: pd.DataFrame,
-        y: pd.Series
+        arr: np.ndarray,
+        y: np.ndarray,
+        columns: List[str],
+        n_jobs: int = -1
     ) -> Dict[str, float]:
         """Get feature importance from XGBoost"""
         model = xgb.XGBClassifier(
             n_estimators=100,
             random_state=42,
-            n_jobs=-1,
+            n_jobs=n_jobs,
             eval_metric='logloss'
         )
         
-        model.fit(X, y, verbose=False)
+        model.fit(arr, y, verbose=False)
+        
+        # Gain scores straight from the in-memory booster, normalized as
+        # feature_importances_ does (features without splits score 0)
+        scores = model.get_booster().get_score(importance_type='gain')
+        importance = np.array([scores.get(f'f{i}', 0.0) for i in range(len(columns))], dtype=np.float32)
+        total = importance.sum()
+        if total > 0:
+            importance /= total
         
-        importance_dict = dict(zip(X.columns, model.feature_importances_))
+        importance_dict = dict(zip(columns, importance))
         
         return importance_dict
     
     def _get_rf_importance(
         self,
-        X: pd.DataFrame,
-        y: pd.Series
+        arr: np.ndarray,
+        y: np.ndarray,
+        columns: List[str],
+        n_jobs: int = -1
     ) -> Dict[str, float]:
         """Get feature importance from Random Forest"""
         model = RandomForestClassifier(
             n_estimators=100,
             random_state=42,
-            n_jobs=-1
+            n_jobs=n_jobs
         )
         
-        model.fit(X, y)
+        model.fit(arr, y)
         
-        importance_dict = dict(zip(X.columns, model.feature_importances_))
+        importance_dict = dict(zip(columns, model.feature_importances_))
         
         return importance_dict
     
@@ -2,21 +2,25 @@
 Hyperparameter Optimization
 Uses Optuna for automated hyperparameter tuning
 """
+import json
+import multiprocessing
+import os
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, Optional, Callable
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 try:
     import optuna
     from optuna.samplers import TPESampler
+    from optuna.study import MaxTrialsCallback
     OPTUNA_AVAILABLE = True
 except ImportError:
     OPTUNA_AVAILABLE = False
 
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.metrics import accuracy_score
+from sklearn.metrics import accuracy_score, log_loss
 import xgboost as xgb
 from sklearn.ensemble import RandomForestClassifier
 
@@ -32,12 +36,149 @@ try:
 except ImportError:
     CATBOOST_AVAILABLE = False
 
-from config.settings import MLConfig
+from ._gpu import cuda_available
+from ._njit import NUMBA_AVAILABLE
+from ._tuning_kernels import accuracy_kernel, log_loss_kernel
+from config.settings import MLConfig, MODELS_DIR
 from src.utils.logger import get_logger
 
 logger = get_logger()
 
 
+def _rdb_storage(url: str):
+    """Build an Optuna RDB storage (long lock timeout for concurrent SQLite writers)"""
+    engine_kwargs = {'connect_args': {'timeout': 300}} if url.startswith('sqlite') else {}
+    return optuna.storages.RDBStorage(url, engine_kwargs=engine_kwargs)
+
+
+def _optimize_worker(
+    study_name: str,
+    storage_url: str,
+    model_name: str,
+    X_np: np.ndarray,
+    y_np: np.ndarray,
+    folds: list,
+    max_trials: int,
+    worker_trials: int,
+    timeout: Optional[int],
+    pruner,
+    random_state: int,
+    min_acceptable_score: Optional[float],
+    use_gpu: bool,
+    worker_id: int
+) -> int:
+    """
+    Run a share of a study's trials in a separate process
+    
+    The objective is rebuilt inside the worker (closures do not pickle) and
+    uses single-threaded models so workers do not oversubscribe the cores.
+    
+    Returns:
+        Number of trials this worker ran
+    """
+    tuner = HyperparameterTuner(
+        random_state=random_state,
+        min_acceptable_score=min_acceptable_score,
+        use_gpu=use_gpu
+    )
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=_rdb_storage(storage_url),
+        sampler=TPESampler(seed=random_state + worker_id),
+        pruner=pruner
+    )
+    objective = tuner._make_objective(model_name, X_np, y_np, folds, n_jobs=1, n_trials=max_trials)
+    
+    n_before = len(study.trials)
+    study.optimize(
+        objective,
+        n_trials=worker_trials,
+        timeout=timeout,
+        callbacks=[MaxTrialsCallback(max_trials, states=None)]
+    )
+    
+    return len(study.trials) - n_before
+
+
+def _tune_model_worker(
+    tuner_kwargs: Dict[str, Any],
+    model_name: str,
+    X_np: np.ndarray,
+    y_np: np.ndarray,
+    n_trials: int,
+    cv_folds: int,
+    timeout: Optional[int]
+) -> Dict[str, Any]:
+    """
+    Tune one model in its own process (used by ``tune_all``)
+    
+    ``tuner_kwargs['n_jobs']`` caps the threads of every fit through the
+    models' own thread parameters (the libraries are already imported by the
+    time this runs, so environment variables would have no effect).
+    """
+    tuner = HyperparameterTuner(**tuner_kwargs)
+    
+    return getattr(tuner, HyperparameterTuner.MODEL_TUNERS[model_name])(X_np, y_np, n_trials, cv_folds, timeout)
+
+
+class RollingEmbargoedSplit:
+    """
+    Rolling-window time-series CV with an embargo gap
+    
+    Every fold trains on a fixed-width window of ``train_size`` bars and
+    validates on the following ``val_size`` bars, with ``embargo`` bars left
+    out in between so samples whose labels look past the training window do
+    not leak into validation. Validation blocks tile the end of the series
+    like TimeSeriesSplit; windows roll forward instead of expanding.
+    """
+    
+    def __init__(
+        self,
+        n_splits: int = 5,
+        train_size: Optional[int] = None,
+        val_size: Optional[int] = None,
+        embargo: int = 0
+    ):
+        """
+        Args:
+            n_splits: Number of folds
+            train_size: Training window width (default: the widest window that
+                fits before the first validation block)
+            val_size: Validation block width (default: n_samples // (n_splits + 1))
+            embargo: Bars dropped between each training window and its validation block
+        """
+        self.n_splits = n_splits
+        self.train_size = train_size
+        self.val_size = val_size
+        self.embargo = embargo
+    
+    def get_n_splits(self, X=None, y=None, groups=None) -> int:
+        return self.n_splits
+    
+    def split(self, X, y=None, groups=None):
+        """
+        Yield (train, validation) index slices in chronological order
+        
+        Raises:
+            ValueError: If the series is too short for the requested windows
+        """
+        n_samples = len(X)
+        val_size = self.val_size or n_samples // (self.n_splits + 1)
+        first_val_start = n_samples - self.n_splits * val_size
+        train_size = self.train_size or first_val_start - self.embargo
+        
+        if val_size < 1 or train_size < 1 or first_val_start - self.embargo < train_size:
+            raise ValueError(
+                f"Cannot make {self.n_splits} folds (train={train_size}, val={val_size}, "
+                f"embargo={self.embargo}) from {n_samples} samples"
+            )
+        
+        for k in range(self.n_splits):
+            val_start = first_val_start + k * val_size
+            train_end = val_start - self.embargo
+            yield slice(train_end - train_size, train_end), slice(val_start, val_start + val_size)
+
+
 class HyperparameterTuner:
     """
     Automated hyperparameter tuning using Optuna
@@ -50,17 +191,85 @@ class HyperparameterTuner:
     - Pruning of unpromising trials
     """
     
-    def __init__(self, random_state: int = 42):
-        """Initialize hyperparameter tuner"""
+    # Tuning method per model name
+    MODEL_TUNERS = {
+        'xgboost': 'tune_xgboost',
+        'lightgbm': 'tune_lightgbm',
+        'random_forest': 'tune_random_forest'
+    }
+    
+    def __init__(
+        self,
+        random_state: int = 42,
+        n_workers: int = 1,
+        storage: Optional[str] = None,
+        min_acceptable_score: Optional[float] = None,
+        use_gpu: Optional[bool] = None,
+        cv_embargo: Optional[int] = None,
+        study_name: Optional[str] = None,
+        n_jobs: int = -1,
+        fast_mode: bool = False,
+        fast_threshold: int = 1_000_000,
+        warm_start_key: Optional[str] = None
+    ):
+        """
+        Initialize hyperparameter tuner
+        
+        Args:
+            random_state: Random seed
+            n_workers: Worker processes per study; above 1 trials run in
+                parallel processes sharing an RDB-backed study
+            storage: Optuna RDB URL (may contain ``{model}``); defaults to a
+                SQLite file per model in MODELS_DIR when ``n_workers > 1``
+            min_acceptable_score: First-fold accuracy floor below which trials
+                in the first third of a study are pruned (None, the default,
+                disables it; direction accuracy near 0.5 is normal on FX bars)
+            use_gpu: Fit XGBoost/LightGBM trials on a CUDA device; None
+                auto-detects and False forces the CPU path
+            cv_embargo: Bars between each CV training window and its
+                validation block (default: MLConfig.LOOKFORWARD_BARS, the
+                label horizon)
+            study_name: Prefix of the per-model study names in ``storage``;
+                pass an earlier tuner's prefix to resume its studies
+            n_jobs: Threads per model fit for in-process trials (-1: all cores)
+            fast_mode: Above ``fast_threshold`` rows, score each trial on a
+                single blocked holdout (last 20%) instead of ``cv_folds``
+                folds: about cv_folds times fewer fits per trial, at the cost
+                of a noisier objective, so spend the savings on more trials
+            fast_threshold: Row count above which fast_mode applies
+            warm_start_key: Persist each study's best parameters in MODELS_DIR
+                under this key (e.g. ``"EURUSD_H1"``) and warm-start new
+                studies with the same key from them; None disables both
+        """
         self.random_state = random_state
+        self.n_workers = max(1, n_workers)
+        self.storage = storage
+        self.min_acceptable_score = min_acceptable_score
         self.logger = logger
         self.best_params = {}
+        self.use_gpu = cuda_available() if use_gpu is None else (use_gpu and cuda_available())
+        self.cv_embargo = MLConfig.LOOKFORWARD_BARS if cv_embargo is None else cv_embargo
+        self.study_name = study_name or f"tuning_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        self.n_jobs = n_jobs
+        self.fast_mode = fast_mode
+        self.fast_threshold = fast_threshold
+        self.warm_start_key = warm_start_key
+        self._studies = {}
+        self._fold_matrix_cache = None
+        
+        if NUMBA_AVAILABLE:
+            # Compile (or load from cache) before the first trial is timed
+            accuracy_kernel(np.zeros(1, dtype=np.int8), np.zeros(1, dtype=np.int8))
+            log_loss_kernel(np.zeros(1, dtype=np.int8), np.full(1, 0.5, dtype=np.float32))
+            log_loss_kernel(np.zeros(1, dtype=np.int8), np.full(1, 0.5))
         
         if not OPTUNA_AVAILABLE:
             self.logger.warning(
                 "Optuna not available. Hyperparameter tuning disabled.",
                 category="ml_training"
             )
+        elif self.use_gpu:
+            self.logger.info("CUDA device detected, tuning XGBoost/LightGBM on GPU", category="ml_training")
     
     def tune_xgboost(
         self,
@@ -88,55 +297,7 @@ class HyperparameterTuner:
         
         self.logger.info("Starting XGBoost hyperparameter tuning", category="ml_training")
         
-        def objective(trial):
-            """Optuna objective function for XGBoost"""
-            params = {
-                'n_estimators': trial.suggest_int('n_estimators', 100, 500),
-                'max_depth': trial.suggest_int('max_depth', 3, 10),
-                'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
-                'min_child_weight': trial.suggest_int('min_child_weight', 1, 10),
-                'subsample': trial.suggest_float('subsample', 0.6, 1.0),
-                'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
-                'gamma': trial.suggest_float('gamma', 0, 5),
-                'reg_alpha': trial.suggest_float('reg_alpha', 0, 1),
-                'reg_lambda': trial.suggest_float('reg_lambda', 0, 1),
-                'random_state': self.random_state,
-                'n_jobs': -1,
-                'eval_metric': 'logloss'
-            }
-            
-            # Time-series cross-validation
-            tscv = TimeSeriesSplit(n_splits=cv_folds)
-            scores = []
-            
-            for train_idx, val_idx in tscv.split(X):
-                X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]
-                y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]
-                
-                model = xgb.XGBClassifier(**params)
-                model.fit(X_train, y_train, verbose=False)
-                
-                y_pred = model.predict(X_val)
-                score = accuracy_score(y_val, y_pred)
-                scores.append(score)
-            
-            return np.mean(scores)
-        
-        # Create study
-        study = optuna.create_study(
-            direction='maximize',
-            sampler=TPESampler(seed=self.random_state),
-            pruner=optuna.pruners.MedianPruner(n_warmup_steps=10)
-        )
-        
-        # Optimize
-        study.optimize(
-            objective,
-            n_trials=n_trials,
-            timeout=timeout,
-            show_progress_bar=True,
-            n_jobs=1  # Parallel trials can cause issues with XGBoost
-        )
+        study = self._optimize('xgboost', X, y, n_trials, cv_folds, timeout, pruner=self._fold_pruner())
         
         best_params = study.best_params
         best_params['random_state'] = self.random_state
@@ -171,46 +332,7 @@ class HyperparameterTuner:
         
         self.logger.info("Starting LightGBM hyperparameter tuning", category="ml_training")
         
-        def objective(trial):
-            """Optuna objective function for LightGBM"""
-            params = {
-                'n_estimators': trial.suggest_int('n_estimators', 100, 500),
-                'max_depth': trial.suggest_int('max_depth', 3, 10),
-                'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
-                'num_leaves': trial.suggest_int('num_leaves', 20, 100),
-                'min_child_samples': trial.suggest_int('min_child_samples', 5, 50),
-                'subsample': trial.suggest_float('subsample', 0.6, 1.0),
-                'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
-                'reg_alpha': trial.suggest_float('reg_alpha', 0, 1),
-                'reg_lambda': trial.suggest_float('reg_lambda', 0, 1),
-                'random_state': self.random_state,
-                'n_jobs': -1,
-                'verbose': -1
-            }
-            
-            tscv = TimeSeriesSplit(n_splits=cv_folds)
-            scores = []
-            
-            for train_idx, val_idx in tscv.split(X):
-                X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]
-                y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]
-                
-                model = lgb.LGBMClassifier(**params)
-                model.fit(X_train, y_train)
-                
-                y_pred = model.predict(X_val)
-                score = accuracy_score(y_val, y_pred)
-                scores.append(score)
-            
-            return np.mean(scores)
-        
-        study = optuna.create_study(
-            direction='maximize',
-            sampler=TPESampler(seed=self.random_state),
-            pruner=optuna.pruners.MedianPruner(n_warmup_steps=10)
-        )
-        
-        study.optimize(objective, n_trials=n_trials, timeout=timeout, show_progress_bar=True)
+        study = self._optimize('lightgbm', X, y, n_trials, cv_folds, timeout, pruner=self._fold_pruner())
         
         best_params = study.best_params
         best_params['random_state'] = self.random_state
@@ -245,58 +367,469 @@ class HyperparameterTuner:
         
         self.logger.info("Starting Random Forest hyperparameter tuning", category="ml_training")
         
-        def objective(trial):
-            """Optuna objective function for Random Forest"""
+        study = self._optimize('random_forest', X, y, n_trials, cv_folds, timeout, pruner=self._fold_pruner())
+        
+        best_params = study.best_params
+        best_params['random_state'] = self.random_state
+        best_params['n_jobs'] = -1
+        
+        self.best_params['random_forest'] = best_params
+        
+        self.logger.info(
+            f"Random Forest tuning complete. Best score: {study.best_value:.4f}",
+            category="ml_training"
+        )
+        
+        return {
+            'params': best_params,
+            'best_score': study.best_value,
+            'n_trials': len(study.trials),
+            'study': study
+        }
+    
+    def _suggest_params(self, model_name: str, trial, n_jobs: int = -1) -> Dict[str, Any]:
+        """
+        Sample one configuration of ``model_name``'s search space
+        
+        Raises:
+            ValueError: If ``model_name`` is not a tunable model
+        """
+        if model_name == 'xgboost':
+            return {
+                'n_estimators': trial.suggest_int('n_estimators', 100, 500),
+                'max_depth': trial.suggest_int('max_depth', 3, 10),
+                'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
+                'min_child_weight': trial.suggest_int('min_child_weight', 1, 10),
+                'subsample': trial.suggest_float('subsample', 0.6, 1.0),
+                'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
+                'gamma': trial.suggest_float('gamma', 0, 5),
+                'reg_alpha': trial.suggest_float('reg_alpha', 0, 1),
+                'reg_lambda': trial.suggest_float('reg_lambda', 0, 1),
+                'random_state': self.random_state,
+                'n_jobs': n_jobs,
+                'eval_metric': 'logloss'
+            }
+        elif model_name == 'lightgbm':
             params = {
+                'n_estimators': trial.suggest_int('n_estimators', 100, 500),
+                'max_depth': trial.suggest_int('max_depth', 3, 10),
+                'learning_rate': trial.suggest_float('learning_rate', 0.01, 0.3, log=True),
+                'num_leaves': trial.suggest_int('num_leaves', 20, 100),
+                'min_child_samples': trial.suggest_int('min_child_samples', 5, 50),
+                'subsample': trial.suggest_float('subsample', 0.6, 1.0),
+                'colsample_bytree': trial.suggest_float('colsample_bytree', 0.6, 1.0),
+                'reg_alpha': trial.suggest_float('reg_alpha', 0, 1),
+                'reg_lambda': trial.suggest_float('reg_lambda', 0, 1),
+                'random_state': self.random_state,
+                'n_jobs': n_jobs,
+                'verbose': -1
+            }
+            if self.use_gpu:
+                params.update({'device_type': 'gpu', 'gpu_use_dp': False})
+            return params
+        elif model_name == 'random_forest':
+            return {
                 'n_estimators': trial.suggest_int('n_estimators', 100, 500),
                 'max_depth': trial.suggest_int('max_depth', 5, 15),
                 'min_samples_split': trial.suggest_int('min_samples_split', 2, 20),
                 'min_samples_leaf': trial.suggest_int('min_samples_leaf', 1, 10),
                 'max_features': trial.suggest_categorical('max_features', ['sqrt', 'log2', 0.5, 0.8]),
                 'random_state': self.random_state,
-                'n_jobs': -1
+                'n_jobs': n_jobs
             }
+        else:
+            raise ValueError(f"Unknown model: {model_name}")
+    
+    def _make_objective(
+        self,
+        model_name: str,
+        X_np: np.ndarray,
+        y_np: np.ndarray,
+        folds: list,
+        n_jobs: int = -1,
+        n_trials: Optional[int] = None
+    ) -> Callable:
+        """
+        Build the Optuna objective (time-series CV accuracy) for one study
+        
+        Everything that is fixed for the study is resolved here once: the
+        model class, the per-fold train/validation views (or XGBoost's
+        QuantileDMatrix pairs), the label arrays and the scoring function.
+        Each trial then only samples parameters, fits and scores.
+        
+        Args:
+            model_name: 'xgboost', 'lightgbm' or 'random_forest'
+            X_np: Contiguous float32 feature matrix
+            y_np: int8 labels
+            folds: (train, validation) slices from _prepare_cv_data
+            n_jobs: Threads per model fit (1 when fitting on GPU)
+            n_trials: Study size, bounding the window for the score floor
             
-            tscv = TimeSeriesSplit(n_splits=cv_folds)
-            scores = []
+        Returns:
+            Objective taking a trial and returning mean validation accuracy
+        """
+        if model_name not in ('xgboost', 'lightgbm', 'random_forest'):
+            raise ValueError(f"Unknown model: {model_name}")
+        
+        if self.use_gpu and model_name in ('xgboost', 'lightgbm'):
+            n_jobs = 1  # The device does the work; host threads only feed it
+        
+        # Fold views and labels, sliced once per study
+        y_vals = [y_np[val_slice] for _, val_slice in folds]
+        if model_name == 'xgboost':
+            fold_data = self._xgb_fold_matrices(X_np, y_np, folds)
+        else:
+            fold_data = [(X_np[train_slice], y_np[train_slice], X_np[val_slice]) for train_slice, val_slice in folds]
+        
+        if NUMBA_AVAILABLE:
+            score_fold, loss_fold = accuracy_kernel, log_loss_kernel
+        else:
+            score_fold = accuracy_score
             
-            for train_idx, val_idx in tscv.split(X):
-                X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]
-                y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]
+            def loss_fold(y_true, proba):
+                return log_loss(y_true, proba, labels=[0, 1])
+        
+        if model_name == 'xgboost':
+            booster_base = {'objective': 'binary:logistic', 'tree_method': 'hist', 'seed': self.random_state}
+            if n_jobs > 0:
+                booster_base['nthread'] = n_jobs
+            if self.use_gpu:
+                booster_base['device'] = 'cuda'
+            
+            def make_fitter(params):
+                # Native API on the cached QuantileDMatrix pairs
+                num_boost_round = params['n_estimators']
+                booster_params = {
+                    **{k: v for k, v in params.items() if k not in ('n_estimators', 'random_state', 'n_jobs')},
+                    **booster_base
+                }
                 
-                model = RandomForestClassifier(**params)
-                model.fit(X_train, y_train)
+                def fit_predict(dtrain, dval):
+                    booster = xgb.train(booster_params, dtrain, num_boost_round=num_boost_round)
+                    importances = np.fromiter(booster.get_score(importance_type='weight').values(), dtype=float)
+                    return booster.predict(dval), importances
+                return fit_predict
+        else:
+            model_cls = lgb.LGBMClassifier if model_name == 'lightgbm' else RandomForestClassifier
+            
+            def make_fitter(params):
+                def fit_predict(X_train, y_train, X_val):
+                    model = model_cls(**params)
+                    model.fit(X_train, y_train)
+                    proba = model.predict_proba(X_val)
+                    if proba.shape[1] == 1:  # Single-class training window
+                        proba = np.full(len(X_val), float(model.classes_[0]))
+                    else:
+                        proba = np.ascontiguousarray(proba[:, 1])
+                    return proba, getattr(model, 'feature_importances_', None)
+                return fit_predict
+        
+        def objective(trial) -> float:
+            fit_predict = make_fitter(self._suggest_params(model_name, trial, n_jobs))
+            score_sum = 0.0
+            loss_sum = 0.0
+            
+            for fold_idx, data in enumerate(fold_data):
+                # One probability pass per fold; labels are thresholded from it
+                # (strict > 0.5 matches predict()'s argmax tie-break)
+                proba, importances = fit_predict(*data)
+                y_pred = (proba > 0.5).astype(np.int8)
+                score = score_fold(y_vals[fold_idx], y_pred)
+                score_sum += score
+                loss_sum += loss_fold(y_vals[fold_idx], proba)
+                
+                if fold_idx == 0 and self._is_hopeless(trial, importances, score, n_trials):
+                    raise optuna.TrialPruned()
                 
-                y_pred = model.predict(X_val)
-                score = accuracy_score(y_val, y_pred)
-                scores.append(score)
+                # The pruner compares the running mean negative log loss fold
+                # by fold (smoother than accuracy); accuracy stays the target
+                trial.report(-loss_sum / (fold_idx + 1), step=fold_idx)
+                if trial.should_prune():
+                    raise optuna.TrialPruned()
             
-            return np.mean(scores)
+            return score_sum / len(fold_data)
         
-        study = optuna.create_study(
-            direction='maximize',
-            sampler=TPESampler(seed=self.random_state)
-        )
+        return objective
+    
+    def _xgb_fold_matrices(self, X_np: np.ndarray, y_np: np.ndarray, folds: list) -> list:
+        """
+        QuantileDMatrix (train, validation) pairs per fold, cached per study
         
-        study.optimize(objective, n_trials=n_trials, timeout=timeout, show_progress_bar=True)
+        Histogram binning does not depend on the tuned parameters, so the
+        quantized matrices are built once and reused by every trial; validation
+        matrices share the training cuts via ``ref``. On GPU the arrays are
+        copied to the device once so fits never go back over PCIe.
+        """
+        cache = self._fold_matrix_cache
+        if cache is not None and cache[0] is X_np and cache[1] is folds:
+            return cache[2]
         
-        best_params = study.best_params
-        best_params['random_state'] = self.random_state
-        best_params['n_jobs'] = -1
+        if self.use_gpu:
+            import cupy as cp
+            X_src, y_src = cp.asarray(X_np), cp.asarray(y_np)
+        else:
+            X_src, y_src = X_np, y_np
         
-        self.best_params['random_forest'] = best_params
+        matrices = []
+        for train_slice, val_slice in folds:
+            dtrain = xgb.QuantileDMatrix(X_src[train_slice], y_src[train_slice])
+            dval = xgb.QuantileDMatrix(X_src[val_slice], y_src[val_slice], ref=dtrain)
+            matrices.append((dtrain, dval))
+        
+        self._fold_matrix_cache = (X_np, folds, matrices)
+        
+        return matrices
+    
+    def _is_hopeless(self, trial, importances, first_fold_score: float, n_trials: Optional[int]) -> bool:
+        """
+        Domain checks after the first fold, ahead of the median pruner
+        
+        A model that made no splits (all-zero or empty feature importances,
+        e.g. from heavy regularization) is always dropped. During the first
+        third of the study, before the median pruner has history, trials
+        scoring below ``min_acceptable_score`` are dropped as well.
+        """
+        if importances is not None and not np.any(np.asarray(importances) > 0):
+            return True
+        
+        if self.min_acceptable_score is None or not n_trials:
+            return False
+        
+        return trial.number < n_trials // 3 and first_fold_score < self.min_acceptable_score
+    
+    @staticmethod
+    def _fold_pruner():
+        """
+        Median pruner over the per-fold running mean of negative log loss
+        
+        The first 10 trials always run every fold, and a trial is only judged
+        from its second fold onward against at least 5 trials at that step.
+        """
+        return optuna.pruners.MedianPruner(n_startup_trials=10, n_warmup_steps=1, n_min_trials=5)
+    
+    def _prepare_cv_data(self, X: pd.DataFrame, y: pd.Series, cv_folds: int):
+        """
+        Convert the data and time-series folds once per study
+        
+        RollingEmbargoedSplit folds are contiguous slices, so every trial
+        slices views instead of re-running the splitter and ``DataFrame.iloc``.
+        
+        Returns:
+            Tuple of (float32 C-contiguous X, int8 y, list of (train, val) slices)
+            
+        Raises:
+            ValueError: If any fold would have an empty training or validation
+                set (the scoring kernels divide by the fold size)
+        """
+        X_np = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+        y_np = np.asarray(y).astype(np.int8)
+        
+        n_samples = len(X_np)
+        if self.fast_mode and n_samples > self.fast_threshold:
+            # Single blocked holdout: train on the first 80%, validate on the rest
+            split = int(n_samples * 0.8)
+            folds = [(slice(0, max(0, split - self.cv_embargo)), slice(split, n_samples))]
+        else:
+            folds = list(RollingEmbargoedSplit(n_splits=cv_folds, embargo=self.cv_embargo).split(X_np))
+        
+        for train_slice, val_slice in folds:
+            n_train = len(range(*train_slice.indices(n_samples)))
+            n_val = len(range(*val_slice.indices(n_samples)))
+            if n_train < 1 or n_val < 1:
+                raise ValueError(
+                    f"Empty CV fold (train={n_train}, val={n_val}) from {n_samples} samples "
+                    f"with embargo={self.cv_embargo}"
+                )
+        
+        return X_np, y_np, folds
+    
+    def _storage_url(self, model_name: str) -> str:
+        """RDB URL holding ``model_name``'s study"""
+        return (self.storage or f"sqlite:///{MODELS_DIR / 'optuna_{model}.db'}").format(model=model_name)
+    
+    def _get_or_create_study(self, model_name: str, pruner=None):
+        """
+        Study for ``model_name``, created on first use and reused afterwards
+        
+        Repeated tune calls on the same tuner extend this study (TPE keeps its
+        history) instead of starting over. Studies are kept in memory for
+        single-process tuning without ``storage``; otherwise they are created
+        or loaded by name from RDB storage.
+        """
+        study = self._studies.get(model_name)
+        if study is not None:
+            return study
+        
+        if self.n_workers <= 1 and self.storage is None:
+            study = optuna.create_study(
+                direction='maximize',
+                sampler=TPESampler(seed=self.random_state),
+                pruner=pruner
+            )
+        else:
+            study = optuna.create_study(
+                study_name=f"{self.study_name}_{model_name}",
+                storage=_rdb_storage(self._storage_url(model_name)),
+                load_if_exists=True,
+                direction='maximize',
+                sampler=TPESampler(seed=self.random_state),
+                pruner=pruner
+            )
+        
+        self._studies[model_name] = study
+        return study
+    
+    def _optimize(
+        self,
+        model_name: str,
+        X: pd.DataFrame,
+        y: pd.Series,
+        n_trials: int,
+        cv_folds: int,
+        timeout: Optional[int],
+        pruner=None
+    ):
+        """
+        Add ``n_trials`` trials to ``model_name``'s study
+        
+        With a single worker this is the in-process optimize loop. With
+        several workers the study lives in RDB storage and each worker process
+        runs its share of the trials against it, so trials execute in parallel
+        without contending for the GIL. Either way MaxTrialsCallback stops the
+        study at its current size plus ``n_trials``.
+        
+        Returns:
+            The extended Optuna study
+        """
+        X_np, y_np, folds = self._prepare_cv_data(X, y, cv_folds)
+        
+        study = self._get_or_create_study(model_name, pruner)
+        max_trials = len(study.trials) + n_trials
+        warm_started = not study.trials and self._enqueue_prior_best(model_name, study)
+        
+        if self.n_workers <= 1:
+            study.optimize(
+                self._make_objective(model_name, X_np, y_np, folds, n_jobs=self.n_jobs, n_trials=max_trials),
+                n_trials=n_trials,
+                timeout=timeout,
+                callbacks=[MaxTrialsCallback(max_trials, states=None)],
+                show_progress_bar=True,
+                n_jobs=1  # Parallel trials can cause issues with XGBoost
+            )
+        else:
+            if warm_started:
+                # Evaluate the enqueued trial here; concurrent workers can
+                # both claim a waiting trial from SQLite storage
+                study.optimize(
+                    self._make_objective(model_name, X_np, y_np, folds, n_jobs=self.n_jobs, n_trials=max_trials),
+                    n_trials=1
+                )
+                n_trials -= 1
+
+            study = self._optimize_parallel(
+                model_name, study, X_np, y_np, folds, n_trials, max_trials, timeout, pruner
+            )
+        
+        self._save_prior_best(model_name, study)
+        
+        return study
+    
+    def _optimize_parallel(
+        self,
+        model_name: str,
+        study,
+        X_np: np.ndarray,
+        y_np: np.ndarray,
+        folds: list,
+        n_trials: int,
+        max_trials: int,
+        timeout: Optional[int],
+        pruner
+    ):
+        """
+        Run ``n_trials`` trials of an RDB-backed study across worker processes
+        
+        Workers are spawned, not forked: this process may already hold a CUDA
+        context (cuda_available() starts the runtime), which forked children
+        cannot use, while spawned ones initialize their own for ``use_gpu``.
+        """
+        study_name = study.study_name
+        storage_url = self._storage_url(model_name)
         
         self.logger.info(
-            f"Random Forest tuning complete. Best score: {study.best_value:.4f}",
+            f"Running {n_trials} {model_name} trials across {self.n_workers} processes",
             category="ml_training"
         )
         
-        return {
-            'params': best_params,
-            'best_score': study.best_value,
-            'n_trials': len(study.trials),
-            'study': study
-        }
+        # Split the budget exactly; ceil-sized shares overshoot when
+        # MaxTrialsCallback sees concurrent trials still running
+        base, extra = divmod(n_trials, self.n_workers)
+        with ProcessPoolExecutor(
+            max_workers=self.n_workers, mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _optimize_worker, study_name, storage_url, model_name, X_np, y_np,
+                    folds, max_trials, base + (worker_id < extra), timeout, pruner,
+                    self.random_state, self.min_acceptable_score, self.use_gpu, worker_id
+                )
+                for worker_id in range(self.n_workers)
+            ]
+            for future in futures:
+                future.result()
+        
+        # Reload so the returned (and cached) study sees the workers' trials
+        study = optuna.load_study(
+            study_name=study_name,
+            storage=_rdb_storage(storage_url),
+            sampler=TPESampler(seed=self.random_state),
+            pruner=pruner
+        )
+        self._studies[model_name] = study
+        
+        return study
+    
+    def _prior_best_path(self, model_name: str):
+        """File holding the best parameters of ``model_name``'s last run under ``warm_start_key``"""
+        return MODELS_DIR / f"best_params_{self.warm_start_key}_{model_name}.json"
+    
+    def _enqueue_prior_best(self, model_name: str, study) -> bool:
+        """
+        Warm-start a new study with the previous run's best parameters
+        
+        The enqueued configuration is evaluated first, so TPE starts from a
+        known-good point instead of re-exploring from scratch.
+        
+        Returns:
+            True if a trial was enqueued
+        """
+        if self.warm_start_key is None:
+            return False
+        
+        path = self._prior_best_path(model_name)
+        if not path.exists():
+            return False
+        
+        try:
+            study.enqueue_trial(json.loads(path.read_text()), skip_if_exists=True)
+        except Exception as e:
+            self.logger.warning(f"Could not load prior {model_name} parameters: {e}", category="ml_training")
+            return False
+        
+        self.logger.info(f"Warm-starting {model_name} tuning from {path.name}", category="ml_training")
+        return True
+    
+    def _save_prior_best(self, model_name: str, study) -> None:
+        """Persist the study's best search-space parameters for the next run"""
+        if self.warm_start_key is None:
+            return
+        if not any(t.state == optuna.trial.TrialState.COMPLETE for t in study.trials):
+            return
+        
+        try:
+            self._prior_best_path(model_name).write_text(json.dumps(study.best_params, indent=2))
+        except Exception as e:
+            self.logger.warning(f"Could not save {model_name} parameters: {e}", category="ml_training")
     
     def tune_all(
         self,
@@ -304,7 +837,8 @@ class HyperparameterTuner:
         y: pd.Series,
         n_trials_per_model: int = 50,
         cv_folds: int = 5,
-        timeout_per_model: Optional[int] = None
+        timeout_per_model: Optional[int] = None,
+        parallel_models: bool = False
     ) -> Dict[str, Any]:
         """
         Tune all available models
@@ -315,25 +849,24 @@ class HyperparameterTuner:
             n_trials_per_model: Trials for each model
             cv_folds: CV folds
             timeout_per_model: Max time per model
+            parallel_models: Tune the models concurrently, one spawned
+                process each, splitting the cores between them (each model
+                then runs its trials in-process, whatever ``n_workers`` is)
             
         Returns:
             Dict with results for all models
         """
-        results = {}
         start_time = time.time()
         
-        # XGBoost
-        xgb_result = self.tune_xgboost(X, y, n_trials_per_model, cv_folds, timeout_per_model)
-        results['xgboost'] = xgb_result
+        model_names = ['xgboost', 'lightgbm', 'random_forest'] if LIGHTGBM_AVAILABLE else ['xgboost', 'random_forest']
         
-        # LightGBM
-        if LIGHTGBM_AVAILABLE:
-            lgb_result = self.tune_lightgbm(X, y, n_trials_per_model, cv_folds, timeout_per_model)
-            results['lightgbm'] = lgb_result
-        
-        # Random Forest
-        rf_result = self.tune_random_forest(X, y, n_trials_per_model, cv_folds, timeout_per_model)
-        results['random_forest'] = rf_result
+        if parallel_models and OPTUNA_AVAILABLE:
+            results = self._tune_models_parallel(model_names, X, y, n_trials_per_model, cv_folds, timeout_per_model)
+        else:
+            results = {
+                name: getattr(self, self.MODEL_TUNERS[name])(X, y, n_trials_per_model, cv_folds, timeout_per_model)
+                for name in model_names
+            }
         
         duration = time.time() - start_time
         
@@ -348,6 +881,67 @@ class HyperparameterTuner:
             'best_params': self.best_params
         }
     
+    def _tune_models_parallel(
+        self,
+        model_names: list,
+        X: pd.DataFrame,
+        y: pd.Series,
+        n_trials: int,
+        cv_folds: int,
+        timeout: Optional[int]
+    ) -> Dict[str, Any]:
+        """
+        Tune each model in its own process and merge the results back
+        
+        Every process gets an equal share of the cores as its per-fit thread
+        count, so the models do not oversubscribe the machine, and runs its
+        trials in-process rather than nesting another process pool. Processes
+        are spawned, not forked, so a CUDA context already started here is
+        never inherited. Studies come back with the results and are cached
+        here, so later tune calls on this tuner extend them as usual.
+        """
+        threads = max(1, (os.cpu_count() or 1) // len(model_names))
+        tuner_kwargs = {
+            'random_state': self.random_state,
+            'n_workers': 1,
+            'storage': self.storage,
+            'min_acceptable_score': self.min_acceptable_score,
+            'use_gpu': self.use_gpu,
+            'cv_embargo': self.cv_embargo,
+            'study_name': self.study_name,
+            'n_jobs': threads,
+            'fast_mode': self.fast_mode,
+            'fast_threshold': self.fast_threshold,
+            'warm_start_key': self.warm_start_key
+        }
+        
+        # Ship plain arrays (cheaper to pickle than DataFrames)
+        X_np = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+        y_np = np.asarray(y).astype(np.int8)
+        
+        self.logger.info(
+            f"Tuning {', '.join(model_names)} in parallel ({threads} threads each)",
+            category="ml_training"
+        )
+        
+        with ProcessPoolExecutor(
+            max_workers=len(model_names), mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            futures = {
+                name: executor.submit(
+                    _tune_model_worker, tuner_kwargs, name, X_np, y_np, n_trials, cv_folds, timeout
+                )
+                for name in model_names
+            }
+            results = {name: future.result() for name, future in futures.items()}
+        
+        for name, result in results.items():
+            self.best_params[name] = result['params']
+            if 'study' in result:
+                self._studies[name] = result['study']
+        
+        return results
+    
     def _get_default_xgboost_params(self) -> Dict[str, Any]:
         """Get default XGBoost parameters"""
         return {
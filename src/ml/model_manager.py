@@ -2,13 +2,21 @@
 Model Manager
 Manages ML model lifecycle, storage, and deployment
 """
+import copy
 import joblib
 import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
+from sklearn.preprocessing import FunctionTransformer, StandardScaler
 
-from .training import ModelTrainer
+from .training import ModelTrainer, SoftVoteEnsemble
 from .evaluator import ModelEvaluator
 from .hyperparameter_tuner import HyperparameterTuner
 from .calibrator import ProbabilityCalibrator
@@ -22,8 +30,65 @@ try:
 except:
     OPTUNA_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import lz4  # noqa: F401 - enables joblib's lz4 compressor
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
 logger = get_logger()
 
+# lz4 decompresses several times faster than zlib at a similar ratio
+MODEL_COMPRESSION = ('lz4', 3) if LZ4_AVAILABLE else ('zlib', 3)
+
+
+def _json_default(value):
+    """Fallback JSON encoder: numpy values become Python ones, anything else its str()"""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    return str(value)
+
+
+def _joblib_load(path: str):
+    """
+    joblib.load, memory-mapping arrays when the file is an uncompressed pickle
+    
+    Compressed files cannot be mapped (joblib would warn and read them fully),
+    so mmap is only requested for files that start with a pickle opcode.
+    """
+    with open(path, 'rb') as f:
+        uncompressed = f.read(1) == b'\x80'
+    return joblib.load(path, mmap_mode='r' if uncompressed else None)
+
+
+@lru_cache(maxsize=4)
+def _load_cached(model_path: str, scaler_path: str, mtime_ns: int):
+    """
+    Load a model/scaler pair, memory-mapping the arrays of uncompressed files
+    
+    Repeated loads of the same files return the same objects, and mapped
+    pages are shared through the OS page cache between processes. The
+    modification time is part of the key so re-saved versions are reloaded.
+    The loaded objects must not be mutated (e.g. refit) in place.
+    """
+    model = _joblib_load(model_path)
+    if isinstance(model, dict) and model.get('type') == 'xgb':
+        # Stub pointing at an XGBoost model saved in its native format
+        native = xgb.XGBClassifier()
+        native.load_model(str(Path(model_path).with_name(model['path'])))
+        model = native
+    elif isinstance(model, dict) and model.get('type') == 'ensemble':
+        # Stub pointing at an ensemble directory written by SoftVoteEnsemble.save
+        model = SoftVoteEnsemble.load(Path(model_path).with_name(model['path']))
+    
+    return model, _joblib_load(scaler_path)
+
 
 class ModelManager:
     """
@@ -54,6 +119,10 @@ class ModelManager:
         self.active_model = None
         self.active_scaler = None
         self.selected_features = None
+        self._versions_cache = None
+        # Per-thread single-row scaling buffer (GUI and bot threads both predict)
+        self._scale_local = threading.local()
+        self._scale_params = None
     
     def train_new_model(
         self,
@@ -90,13 +159,27 @@ class ModelManager:
                 lookforward_bars=self.config.LOOKFORWARD_BARS
             )
             
+            # Cast once into a single C-contiguous float32 block: every
+            # downstream selection, tuning, training and calibration step
+            # converts it to an ndarray without copying
+            X_np = np.ascontiguousarray(X.to_numpy(dtype=np.float32))
+            X = pd.DataFrame(X_np, index=X.index, columns=X.columns, copy=False)
+            y = y.astype(np.int8)
+            
             # Feature selection
             if select_features and len(X.columns) > n_features:
                 self.logger.info("Performing feature selection", category="ml_training")
                 selected_features, selection_report = self.feature_selector.select_comprehensive(
                     X, y, n_features=n_features
                 )
-                X = X[selected_features]
+                # One gather of the selected columns into a new block
+                feature_idx = X.columns.get_indexer(selected_features).astype(np.int32)
+                X = pd.DataFrame(
+                    np.ascontiguousarray(X_np[:, feature_idx]),
+                    index=X.index,
+                    columns=selected_features,
+                    copy=False
+                )
                 self.selected_features = selected_features
                 self.logger.info(
                     f"Features reduced: {selection_report['original_features']} → "
@@ -106,6 +189,7 @@ class ModelManager:
             else:
                 self.selected_features = X.columns.tolist()
                 selection_report = None
+            del X_np
             
             # Hyperparameter tuning (optional, takes longer)
             if tune_hyperparameters and self.tuner is not None:
@@ -124,12 +208,13 @@ class ModelManager:
             # Probability calibration
             if calibrate_probabilities:
                 self.logger.info("Calibrating probabilities", category="ml_training")
-                from sklearn.model_selection import train_test_split
                 
-                # Split for calibration
-                X_cal_train, X_cal_test, y_cal_train, y_cal_test = train_test_split(
-                    X, y, test_size=0.2, shuffle=False, random_state=42
-                )
+                # Chronological 80/20 split for calibration (same sizes as
+                # train_test_split(test_size=0.2, shuffle=False)); positional
+                # slices are views of X rather than gathered copies
+                n_cal_train = len(X) - int(np.ceil(0.2 * len(X)))
+                X_cal_train, X_cal_test = X.iloc[:n_cal_train], X.iloc[n_cal_train:]
+                y_cal_train, y_cal_test = y.iloc[:n_cal_train], y.iloc[n_cal_train:]
                 
                 # Calibrate
                 calibrated_model = self.calibrator.calibrate(
@@ -184,28 +269,57 @@ class ModelManager:
         version: str,
         metadata: Dict[str, Any]
     ) -> bool:
-        """Save model to disk"""
+        """
+        Save model to disk
+        
+        Bare XGBoost classifiers are written in XGBoost's UBJSON format and
+        trained ensembles as a directory of native booster files, each next to
+        a small joblib stub; everything else (e.g. calibrated models) is a
+        compressed joblib pickle. The scaler is stored with float32
+        statistics, the precision predict() applies them at.
+        """
         try:
             # Save model
             model_path = MODELS_DIR / f"model_{version}.joblib"
-            joblib.dump(model, model_path)
+            if isinstance(model, xgb.XGBClassifier):
+                native_path = model_path.with_suffix('.ubj')
+                model.save_model(native_path)
+                joblib.dump({'type': 'xgb', 'path': native_path.name}, model_path, compress=MODEL_COMPRESSION)
+            elif isinstance(model, SoftVoteEnsemble):
+                ensemble_dir = model_path.with_suffix('')
+                model.save(ensemble_dir)
+                joblib.dump({'type': 'ensemble', 'path': ensemble_dir.name}, model_path, compress=MODEL_COMPRESSION)
+            else:
+                joblib.dump(model, model_path, compress=MODEL_COMPRESSION)
             
             # Save scaler
             scaler_path = MODELS_DIR / f"scaler_{version}.joblib"
-            joblib.dump(scaler, scaler_path)
+            joblib.dump(self._compact_scaler(scaler), scaler_path, compress=MODEL_COMPRESSION)
             
             # Save metadata
             metadata_path = MODELS_DIR / f"metadata_{version}.json"
             
-            # Convert datetime to string
             meta_dict = {
-                k: str(v) if isinstance(v, datetime) else v
-                for k, v in metadata.items()
-                if k not in ['model', 'scaler']  # Exclude model objects
+                k: v for k, v in metadata.items()
+                if k not in ('model', 'scaler', 'calibrated_model')  # Exclude model objects
             }
             
-            with open(metadata_path, 'w') as f:
-                json.dump(meta_dict, f, indent=2)
+            # Numpy values are serialized natively; datetimes and other
+            # objects fall back to str()
+            if ORJSON_AVAILABLE:
+                metadata_path.write_bytes(orjson.dumps(
+                    meta_dict,
+                    default=str,
+                    option=(
+                        orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                        | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+                    )
+                ))
+            else:
+                with open(metadata_path, 'w') as f:
+                    json.dump(meta_dict, f, indent=2, default=_json_default)
+            
+            self._versions_cache = None
             
             self.logger.info(f"Model {version} saved to {model_path}", category="ml_training")
             return True
@@ -214,8 +328,22 @@ class ModelManager:
             self.logger.error(f"Error saving model: {str(e)}", category="ml_training")
             return False
     
+    @staticmethod
+    def _compact_scaler(scaler):
+        """Copy of a StandardScaler with float32 statistics (others returned as-is)"""
+        if not isinstance(scaler, StandardScaler):
+            return scaler
+        
+        compact = copy.copy(scaler)
+        for attr in ('mean_', 'scale_', 'var_'):
+            value = getattr(compact, attr, None)
+            if value is not None:
+                setattr(compact, attr, value.astype(np.float32))
+        
+        return compact
+    
     def load_model(self, version: str) -> bool:
-        """Load model from disk"""
+        """Load model from disk (cached; treat the loaded model as read-only)"""
         try:
             model_path = MODELS_DIR / f"model_{version}.joblib"
             scaler_path = MODELS_DIR / f"scaler_{version}.joblib"
@@ -224,8 +352,8 @@ class ModelManager:
                 self.logger.warning(f"Model {version} not found", category="ml_training")
                 return False
             
-            self.active_model = joblib.load(model_path)
-            self.active_scaler = joblib.load(scaler_path)
+            mtime_ns = max(model_path.stat().st_mtime_ns, scaler_path.stat().st_mtime_ns)
+            self.active_model, self.active_scaler = _load_cached(str(model_path), str(scaler_path), mtime_ns)
             
             self.logger.info(f"Model {version} loaded successfully", category="ml_training")
             return True
@@ -235,17 +363,64 @@ class ModelManager:
             return False
     
     def predict(self, X, return_proba: bool = False):
-        """Make prediction with active model"""
+        """
+        Make prediction with active model
+        
+        Args:
+            X: Feature DataFrame, 2-D array or a single 1-D row (cast to float32)
+            return_proba: Return class probabilities instead of labels
+        """
         if self.active_model is None:
             raise ValueError("No active model loaded")
         
-        X_scaled = self.active_scaler.transform(X)
+        if isinstance(X, pd.DataFrame):
+            X_arr = X.to_numpy(dtype=np.float32)
+        else:
+            X_arr = np.asarray(X, dtype=np.float32)
+        if X_arr.ndim == 1:
+            X_arr = X_arr.reshape(1, -1)
+        
+        X_scaled = self._scale(X_arr)
         
         if return_proba:
             return self.active_model.predict_proba(X_scaled)
         else:
             return self.active_model.predict(X_scaled)
     
+    def _scale(self, X_arr: np.ndarray) -> np.ndarray:
+        """
+        Apply the active scaler
+        
+        The trainer now saves an identity transformer (tree models train on
+        unscaled features), whose input is returned as is. Models saved
+        earlier with a StandardScaler get its arithmetic on float32 input
+        without the per-call validation; single rows reuse a buffer owned by
+        the calling thread, batches get a fresh array. Other scalers fall back
+        to their own transform.
+        """
+        scaler = self.active_scaler
+        if isinstance(scaler, FunctionTransformer) and scaler.func is None:
+            return X_arr
+        if not (isinstance(scaler, StandardScaler) and scaler.with_mean and scaler.with_std):
+            return scaler.transform(X_arr)
+        
+        # float32 copies of the statistics, as transform() casts them per call
+        if self._scale_params is None or self._scale_params[0] is not scaler:
+            self._scale_params = (scaler, scaler.mean_.astype(np.float32), scaler.scale_.astype(np.float32))
+        _, mean, scale = self._scale_params
+        
+        if X_arr.shape[0] == 1:
+            buf = getattr(self._scale_local, 'buf', None)
+            if buf is None or buf.shape != X_arr.shape:
+                buf = self._scale_local.buf = np.empty(X_arr.shape, dtype=np.float32)
+        else:
+            buf = np.empty(X_arr.shape, dtype=np.float32)
+        
+        np.subtract(X_arr, mean, out=buf)
+        np.divide(buf, scale, out=buf)
+        
+        return buf
+    
     def _generate_version(self) -> str:
         """Generate version string"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -277,10 +452,23 @@ class ModelManager:
             self.logger.error(f"Error saving to database: {str(e)}", category="ml_training")
     
     def list_models(self) -> list:
-        """List all saved models"""
-        model_files = list(MODELS_DIR.glob("model_*.joblib"))
-        versions = [f.stem.replace("model_", "") for f in model_files]
-        return sorted(versions, reverse=True)
+        """
+        List all saved models (newest version first)
+        
+        The listing is cached against the models directory's modification
+        time, which changes whenever a file is added or removed, so repeated
+        calls skip the directory scan.
+        """
+        dir_mtime = MODELS_DIR.stat().st_mtime_ns
+        if self._versions_cache is None or self._versions_cache[0] != dir_mtime:
+            with os.scandir(MODELS_DIR) as entries:
+                versions = [
+                    entry.name[6:-7] for entry in entries
+                    if entry.name.startswith('model_') and entry.name.endswith('.joblib')
+                ]
+            self._versions_cache = (dir_mtime, sorted(versions, reverse=True))
+        
+        return list(self._versions_cache[1])
 
 
 if __name__ == "__main__":
@@ -2,16 +2,25 @@
 Model Trainer
 Trains ML models for sentiment prediction
 """
+import os
+import hashlib
+import inspect
+import json
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+from numpy.lib.stride_tricks import sliding_window_view
+import joblib
+from joblib import Parallel, delayed
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.model_selection import train_test_split, cross_val_score, TimeSeriesSplit
-from sklearn.preprocessing import StandardScaler
-from sklearn.utils.class_weight import compute_class_weight
+from sklearn.neighbors import NearestNeighbors
+from sklearn.preprocessing import FunctionTransformer
+from threadpoolctl import threadpool_limits
 import xgboost as xgb
 
 try:
-    from imblearn.over_sampling import SMOTE
+    from imblearn.over_sampling import BorderlineSMOTE
     SMOTE_AVAILABLE = True
 except ImportError:
     SMOTE_AVAILABLE = False
@@ -27,16 +36,171 @@ try:
     CATBOOST_AVAILABLE = True
 except ImportError:
     CATBOOST_AVAILABLE = False
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from pathlib import Path
 import time
 from datetime import datetime
 
+from ._gpu import cuda_available
+from ._label_kernels import label_kernel
+from ._njit import NUMBA_AVAILABLE
+from ._smote import FAISS_AVAILABLE, faiss_smote
 from .feature_engineering import FeatureEngineer
 from config.settings import MLConfig
 from src.utils.logger import get_logger
 
 logger = get_logger()
 
+# HistGradientBoosting accepts an explicit validation set from scikit-learn 1.7
+HGB_ACCEPTS_VAL = 'X_val' in inspect.signature(HistGradientBoostingClassifier.fit).parameters
+
+
+class SoftVoteEnsemble(ClassifierMixin, BaseEstimator):
+    """
+    Weighted soft vote over base classifiers
+    
+    Predicts exactly like ``VotingClassifier(voting='soft')`` but can wrap
+    estimators that are already fitted, so building the ensemble does not
+    train every base model a second time. ``fit`` still refits clones, which
+    keeps the ensemble usable by sklearn's cloning utilities (CV, calibration).
+    """
+    
+    def __init__(self, estimators: list, weights: Optional[list] = None):
+        self.estimators = estimators
+        self.weights = weights
+    
+    @classmethod
+    def from_fitted(cls, estimators: list, weights: Optional[list] = None) -> 'SoftVoteEnsemble':
+        """Wrap already-fitted ``(name, estimator)`` pairs without refitting"""
+        ensemble = cls(estimators, weights)
+        ensemble.estimators_ = [est for _, est in estimators]
+        ensemble.classes_ = ensemble.estimators_[0].classes_
+        return ensemble
+    
+    def fit(self, X, y):
+        """
+        Fit a clone of every base estimator
+        
+        Refits (CV folds, calibration) have no held-out set, so constructor
+        early stopping is switched off on the clones; they train for the full
+        number of rounds.
+        """
+        self.estimators_ = [self._refit_clone(est).fit(X, y) for _, est in self.estimators]
+        self.classes_ = np.unique(y)
+        return self
+    
+    @staticmethod
+    def _refit_clone(estimator):
+        """Unfitted clone of ``estimator`` without eval-set early stopping"""
+        estimator = clone(estimator)
+        params = estimator.get_params()
+        if params.get('early_stopping_rounds') is not None:
+            estimator.set_params(early_stopping_rounds=None)
+        if params.get('early_stopping') is True and params.get('validation_fraction') is None:
+            # HistGradientBoosting stopping on an X_val that refits do not pass
+            estimator.set_params(early_stopping=False)
+        return estimator
+    
+    def predict_proba(self, X) -> np.ndarray:
+        """Weighted average of the base models' class probabilities"""
+        return np.average(
+            [est.predict_proba(X) for est in self.estimators_],
+            axis=0,
+            weights=self.weights
+        )
+    
+    def predict(self, X) -> np.ndarray:
+        """Class with the highest averaged probability"""
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+    
+    def save(self, path) -> None:
+        """
+        Write the fitted ensemble to the directory ``path``
+        
+        Boosters are stored in their native formats (XGBoost UBJSON, LightGBM
+        text, CatBoost .cbm) instead of being pickled with their Python
+        wrappers; other estimators are compressed joblib pickles. ``meta.json``
+        records the members, their formats, the weights and the classes.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        
+        members = []
+        for (name, _), est in zip(self.estimators, self.estimators_):
+            if isinstance(est, xgb.XGBClassifier):
+                fmt, file = 'xgb', f"{name}.ubj"
+                est.save_model(path / file)
+            elif LIGHTGBM_AVAILABLE and isinstance(est, lgb.LGBMClassifier):
+                fmt, file = 'lgb', f"{name}.txt"
+                est.booster_.save_model(str(path / file))
+            elif CATBOOST_AVAILABLE and isinstance(est, cb.CatBoostClassifier):
+                fmt, file = 'cat', f"{name}.cbm"
+                est.save_model(str(path / file))
+            else:
+                fmt, file = 'joblib', f"{name}.joblib"
+                joblib.dump(est, path / file, compress=('zlib', 3))
+            members.append({'name': name, 'format': fmt, 'file': file})
+        
+        meta = {
+            'members': members,
+            'weights': None if self.weights is None else [float(w) for w in self.weights],
+            'classes': self.classes_.tolist()
+        }
+        (path / 'meta.json').write_text(json.dumps(meta, indent=2))
+    
+    @classmethod
+    def load(cls, path) -> 'SoftVoteEnsemble':
+        """
+        Load an ensemble written by ``save``
+        
+        LightGBM members come back as bare boosters without their training
+        configuration, so an ensemble containing one is predict-only: cloning
+        it (refitting, CV, calibration) raises TypeError. Retrain with
+        ModelTrainer instead.
+        """
+        path = Path(path)
+        meta = json.loads((path / 'meta.json').read_text())
+        classes = np.asarray(meta['classes'])
+        
+        estimators = []
+        for member in meta['members']:
+            file = path / member['file']
+            if member['format'] == 'xgb':
+                est = xgb.XGBClassifier()
+                est.load_model(file)
+            elif member['format'] == 'lgb':
+                est = _BoosterClassifier(lgb.Booster(model_file=str(file)), classes)
+            elif member['format'] == 'cat':
+                est = cb.CatBoostClassifier()
+                est.load_model(str(file))
+            else:
+                est = joblib.load(file)
+            estimators.append((member['name'], est))
+        
+        ensemble = cls.from_fitted(estimators, meta['weights'])
+        ensemble.classes_ = classes
+        return ensemble
+
+
+class _BoosterClassifier:
+    """predict_proba over a binary LightGBM Booster loaded from its text format"""
+    
+    def __init__(self, booster, classes: np.ndarray):
+        self.booster = booster
+        self.classes_ = classes
+    
+    def __sklearn_clone__(self):
+        raise TypeError(
+            "A loaded SoftVoteEnsemble with LightGBM members is predict-only and "
+            "cannot be cloned or refit; retrain it with ModelTrainer instead"
+        )
+    
+    def predict_proba(self, X) -> np.ndarray:
+        """Two-column class probabilities (the booster predicts the positive class)"""
+        positive = self.booster.predict(X)
+        return np.column_stack([1.0 - positive, positive])
+
 
 class ModelTrainer:
     """
@@ -44,16 +208,73 @@ class ModelTrainer:
     
     Uses ensemble approach:
     - XGBoost
-    - Random Forest
-    - Voting classifier
+    - Histogram gradient boosting
+    - LightGBM / CatBoost when installed
+    - Weighted soft vote
     """
     
-    def __init__(self):
-        """Initialize trainer"""
+    # Boosters stop after this many rounds without improvement on the last
+    # EARLY_STOPPING_FRACTION of the training window
+    EARLY_STOPPING_ROUNDS = 20
+    EARLY_STOPPING_FRACTION = 0.1
+    
+    # Price columns narrowed to float32 before feature engineering
+    PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close')
+    
+    def __init__(self, feature_cache_size: int = 8):
+        """
+        Initialize trainer
+        
+        Args:
+            feature_cache_size: Number of distinct price histories whose
+                engineered features are memoized (0 disables the cache)
+        """
         self.feature_engineer = FeatureEngineer()
         self.config = MLConfig
         self.logger = logger
-        self.scaler = StandardScaler()
+        # Identity transform: kept so saved models and predict() retain a
+        # scaler slot, but trees need no standardization
+        self.scaler = FunctionTransformer()
+        self.device = 'cuda' if cuda_available() else 'cpu'
+        self.feature_cache_size = feature_cache_size
+        self._feature_cache: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+    
+    def _create_features_cached(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        ``create_features`` memoized on the content of ``df``
+        
+        Retraining or tuning on the same price history pays the feature
+        engineering cost once. Callers get a copy, so the cached frame is
+        never mutated. Long histories go through ``create_features_chunked``
+        to bound peak memory (short ones are a single ``create_features``).
+        """
+        if self.feature_cache_size <= 0:
+            return self.feature_engineer.create_features_chunked(df)
+        
+        key = self._feature_cache_key(df)
+        cached = self._feature_cache.get(key)
+        
+        if cached is None:
+            features_df = self.feature_engineer.create_features_chunked(df)
+            # create_features hands back the input unchanged on failure
+            if features_df is df:
+                return features_df
+            self._feature_cache[key] = features_df
+            while len(self._feature_cache) > self.feature_cache_size:
+                self._feature_cache.popitem(last=False)
+        else:
+            self._feature_cache.move_to_end(key)
+            features_df = cached
+        
+        return features_df.copy()
+    
+    @staticmethod
+    def _feature_cache_key(df: pd.DataFrame) -> tuple:
+        """Fingerprint of ``df``: shape, columns and a digest of its rows and index"""
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16).digest()
+        
+        return (df.shape, tuple(df.columns), digest)
     
     def prepare_training_data(
         self,
@@ -74,41 +295,32 @@ class ModelTrainer:
         Returns:
             Tuple of (features_df, target_series)
         """
-        # Create features
-        features_df = self.feature_engineer.create_features(df)
+        # float32 prices halve the bytes every rolling/EWM pass reads; their
+        # ~1e-7 resolution near FX price levels is far below a pip
+        df = df.astype({col: np.float32 for col in self.PRICE_COLUMNS if col in df.columns})
+        
+        # Create features (memoized across calls on the same history)
+        features_df = self._create_features_cached(df)
         
         # Create target (future price movement) with improved definition
         if target_col not in features_df.columns:
-            # Multi-horizon target: look ahead multiple bars instead of just 1
-            features_df['future_high'] = features_df['High'].rolling(lookforward_bars).max().shift(-lookforward_bars)
-            features_df['future_low'] = features_df['Low'].rolling(lookforward_bars).min().shift(-lookforward_bars)
-            features_df['future_close'] = features_df['Close'].shift(-lookforward_bars)
-            
-            # Calculate potential upside and downside
-            features_df['upside_pips'] = (features_df['future_high'] - features_df['Close']) * 10000
-            features_df['downside_pips'] = (features_df['Close'] - features_df['future_low']) * 10000
-            
-            # Target: 1 if clear uptrend, 0 if clear downtrend, -1 if noise (to be filtered)
-            features_df['target_raw'] = np.where(
-                (features_df['upside_pips'] > min_move_pips) & 
-                (features_df['upside_pips'] > features_df['downside_pips'] * 1.5),
-                1,  # Clear bullish move
-                np.where(
-                    (features_df['downside_pips'] > min_move_pips) & 
-                    (features_df['downside_pips'] > features_df['upside_pips'] * 1.5),
-                    0,  # Clear bearish move
-                    -1  # Noise/ranging - exclude from training
-                )
+            # Multi-horizon target: look ahead multiple bars instead of just 1.
+            # 1 if clear uptrend, 0 if clear downtrend; anything else is
+            # noise/ranging and excluded from training (one fused pass when
+            # Numba is installed, vectorized NumPy otherwise)
+            labeler = label_kernel if NUMBA_AVAILABLE else self._label_targets
+            target, labeled = labeler(
+                features_df['High'].to_numpy(dtype=np.float64),
+                features_df['Low'].to_numpy(dtype=np.float64),
+                features_df['Close'].to_numpy(dtype=np.float64),
+                lookforward_bars,
+                float(min_move_pips)
             )
+            labeled = np.flatnonzero(labeled)
             
-            # Filter out noisy samples
-            features_df = features_df[features_df['target_raw'] != -1].copy()
-            features_df['target'] = features_df['target_raw']
-            
-            # Drop temporary columns
-            features_df = features_df.drop(['future_high', 'future_low', 'future_close', 
-                                           'upside_pips', 'downside_pips', 'target_raw'], axis=1)
-            features_df = features_df.dropna()
+            features_df = features_df.iloc[labeled].assign(target=target[labeled])
+            if features_df.isna().to_numpy().any():
+                features_df = features_df.dropna()
             target_col = 'target'
             
             self.logger.info(
@@ -124,12 +336,41 @@ class ModelTrainer:
         
         return X, y
     
+    @staticmethod
+    def _label_targets(
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        lookforward_bars: int,
+        min_move_pips: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized NumPy counterpart of ``label_kernel`` (used without Numba)
+        
+        Returns:
+            Tuple (target, labeled) with the same dtypes and semantics
+        """
+        # Future extremes over bars i+1..i+lookforward_bars (NaN where the
+        # window runs past the data, so those rows are never labeled)
+        future_high = np.full(len(close), np.nan)
+        future_low = np.full(len(close), np.nan)
+        if len(close) > lookforward_bars:
+            future_high[:-lookforward_bars] = sliding_window_view(high[1:], lookforward_bars).max(axis=1)
+            future_low[:-lookforward_bars] = sliding_window_view(low[1:], lookforward_bars).min(axis=1)
+        
+        upside_pips = (future_high - close) * 10000
+        downside_pips = (close - future_low) * 10000
+        
+        bullish = (upside_pips > min_move_pips) & (upside_pips > downside_pips * 1.5)
+        bearish = ~bullish & (downside_pips > min_move_pips) & (downside_pips > upside_pips * 1.5)
+        return bullish.astype(np.int8), bullish | bearish
+    
     def train_model(
         self,
         X: pd.DataFrame,
         y: pd.Series,
         model_version: str = None,
-        use_class_balancing: bool = True,
+        use_class_balancing: bool = False,
         use_tscv: bool = True
     ) -> Dict[str, Any]:
         """
@@ -139,7 +380,8 @@ class ModelTrainer:
             X: Feature DataFrame
             y: Target Series
             model_version: Model version string
-            use_class_balancing: Whether to balance classes with SMOTE
+            use_class_balancing: Whether to oversample with SMOTE instead of
+                weighting the classes in each model
             use_tscv: Whether to use time-series cross-validation
             
         Returns:
@@ -158,70 +400,103 @@ class ModelTrainer:
                 random_state=self.config.RANDOM_STATE,
                 shuffle=False
             )
+            
+            # Hold out the end of the training window for early stopping
+            # (carved before SMOTE so it never contains synthetic rows)
+            n_val = max(1, int(self.EARLY_STOPPING_FRACTION * len(X_train)))
+            X_train, X_val = X_train.iloc[:-n_val], X_train.iloc[-n_val:]
+            y_train, y_val = y_train.iloc[:-n_val], y_train.iloc[-n_val:]
 
-            # Class balancing BEFORE scaling
-            if use_class_balancing and SMOTE_AVAILABLE:
+            # Optional oversampling BEFORE scaling (class weights are used otherwise)
+            resampled = False
+            if use_class_balancing and (FAISS_AVAILABLE or SMOTE_AVAILABLE):
                 try:
-                    smote = SMOTE(random_state=self.config.RANDOM_STATE, k_neighbors=5)
-                    X_train, y_train = smote.fit_resample(X_train, y_train)
+                    if FAISS_AVAILABLE:
+                        # Batched float32 neighbor search + vectorized interpolation
+                        X_res, y_res = faiss_smote(
+                            X_train.to_numpy(dtype=np.float32), y_train.to_numpy(),
+                            k_neighbors=5, random_state=self.config.RANDOM_STATE
+                        )
+                        X_train = pd.DataFrame(X_res, columns=X_train.columns, copy=False)
+                        y_train = pd.Series(y_res, name=y_train.name)
+                    else:
+                        smote = BorderlineSMOTE(
+                            random_state=self.config.RANDOM_STATE,
+                            k_neighbors=NearestNeighbors(n_neighbors=6, n_jobs=-1),
+                            m_neighbors=NearestNeighbors(n_neighbors=11, n_jobs=-1)
+                        )
+                        X_train, y_train = smote.fit_resample(X_train, y_train)
+                    resampled = True
                     self.logger.info(
                         f"Applied SMOTE: {len(y_train)} samples after balancing",
                         category="ml_training"
                     )
                 except Exception as e:
                     self.logger.warning(f"SMOTE failed: {e}, using class weights instead", category="ml_training")
-                    use_class_balancing = False
 
-            # Scale features AFTER balancing
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
-            
-            # Calculate class weights
-            class_weights = compute_class_weight(
-                'balanced',
-                classes=np.unique(y_train),
-                y=y_train
-            )
-            scale_pos_weight = class_weights[1] / class_weights[0] if not use_class_balancing or not SMOTE_AVAILABLE else 1.0
+            # Tree models are scale-invariant, so features go in unscaled as
+            # float32 (halves host-to-device copies and the bandwidth of the
+            # histogram binning pre-pass). The training matrix is column-major
+            # so split finding and binning read each feature sequentially.
+            X_train_np = np.asfortranarray(X_train.to_numpy(dtype=np.float32))
+            X_test_np = X_test.to_numpy(dtype=np.float32)
+            X_val_np = X_val.to_numpy(dtype=np.float32)
+            self.scaler.fit(X_train_np)
+            y_val = np.asarray(y_val)
             
-            # Train XGBoost with improved hyperparameters
-            xgb_model = xgb.XGBClassifier(
-                n_estimators=200,  # Increased from 100
-                max_depth=5,  # Reduced to prevent overfitting
-                learning_rate=0.05,  # Reduced for better convergence
-                min_child_weight=3,  # Added regularization
-                subsample=0.8,  # Added for robustness
-                colsample_bytree=0.8,  # Added for feature diversity
-                scale_pos_weight=scale_pos_weight,  # Class balancing
-                random_state=self.config.RANDOM_STATE,
-                n_jobs=-1,
-                eval_metric='logloss'
-            )
-            xgb_model.fit(X_train_scaled, y_train)
+            # Class weights (neutral when SMOTE already balanced the set)
+            y_np = np.asarray(y_train)
+            class_counts = np.bincount(y_np, minlength=2)
+            scale_pos_weight = 1.0 if resampled else float(class_counts[0] / class_counts[1])
+            class_weight = None if resampled else 'balanced'
             
-            # Train Random Forest with improved hyperparameters
-            rf_model = RandomForestClassifier(
-                n_estimators=200,  # Increased from 100
-                max_depth=8,  # Reduced to prevent overfitting
-                min_samples_split=5,  # Added regularization
-                min_samples_leaf=2,  # Added regularization
-                max_features='sqrt',  # Feature diversity
-                class_weight='balanced' if not use_class_balancing or not SMOTE_AVAILABLE else None,
-                random_state=self.config.RANDOM_STATE,
-                n_jobs=-1
-            )
-            rf_model.fit(X_train_scaled, y_train)
+            # Base models are fit concurrently on threads (the libraries release
+            # the GIL while fitting), each capped to an equal share of the cores:
+            # through its thread parameter where it has one, and through the
+            # fitting thread's OpenMP limit for HistGradientBoosting
+            n_models = 2 + LIGHTGBM_AVAILABLE + CATBOOST_AVAILABLE
+            threads = max(1, (os.cpu_count() or 1) // n_models)
             
-            # Initialize estimators list for ensemble
-            estimators = [
-                ('xgb', xgb_model),
-                ('rf', rf_model)
+            # (name, label, class, params, GPU params, CPU params, fit kwargs);
+            # the boosters stop once the held-out tail stops improving
+            fit_specs = [
+                # XGBoost with improved hyperparameters
+                ('xgb', 'XGBoost', xgb.XGBClassifier, dict(
+                    n_estimators=200,  # Increased from 100
+                    max_depth=5,  # Reduced to prevent overfitting
+                    learning_rate=0.05,  # Reduced for better convergence
+                    min_child_weight=3,  # Added regularization
+                    subsample=0.8,  # Added for robustness
+                    colsample_bytree=0.8,  # Added for feature diversity
+                    scale_pos_weight=scale_pos_weight,  # Class balancing
+                    random_state=self.config.RANDOM_STATE,
+                    tree_method='hist',
+                    max_bin=256,
+                    eval_metric='logloss',
+                    early_stopping_rounds=self.EARLY_STOPPING_ROUNDS
+                ), {'device': 'cuda'}, {'n_jobs': threads}, {'eval_set': [(X_val_np, y_val)], 'verbose': False}),
+                # Histogram gradient boosting in the Random Forest slot (binned
+                # splits instead of exact sort-based ones; keeps the 'rf' key
+                # and weight). It stops on the same chronological tail as the
+                # boosters; its own validation_fraction split is shuffled, so
+                # without X_val support it runs the fixed max_iter instead.
+                ('rf', 'HistGradientBoosting', HistGradientBoostingClassifier, dict(
+                    max_iter=200,
+                    max_depth=8,
+                    learning_rate=0.05,
+                    l2_regularization=1.0,  # Added regularization
+                    class_weight=class_weight,
+                    early_stopping=HGB_ACCEPTS_VAL,
+                    validation_fraction=None,
+                    n_iter_no_change=self.EARLY_STOPPING_ROUNDS,
+                    random_state=self.config.RANDOM_STATE
+                ), None, {}, {'X_val': X_val_np, 'y_val': y_val} if HGB_ACCEPTS_VAL else {})
             ]
             weights = [self.config.XGBOOST_WEIGHT, self.config.RANDOM_FOREST_WEIGHT]
             
-            # Train LightGBM if available
+            # LightGBM if available
             if LIGHTGBM_AVAILABLE:
-                lgb_model = lgb.LGBMClassifier(
+                fit_specs.append(('lgb', 'LightGBM', lgb.LGBMClassifier, dict(
                     n_estimators=200,
                     max_depth=5,
                     learning_rate=0.05,
@@ -229,43 +504,50 @@ class ModelTrainer:
                     min_child_samples=20,
                     subsample=0.8,
                     colsample_bytree=0.8,
-                    class_weight='balanced' if not use_class_balancing or not SMOTE_AVAILABLE else None,
+                    max_bin=255,
+                    feature_pre_filter=True,
+                    is_unbalance=not resampled,
                     random_state=self.config.RANDOM_STATE,
-                    n_jobs=-1,
                     verbose=-1
-                )
-                lgb_model.fit(X_train_scaled, y_train)
-                estimators.append(('lgb', lgb_model))
+                ), {'device_type': 'gpu', 'gpu_use_dp': False}, {'n_jobs': threads}, {
+                    'eval_set': [(X_val_np, y_val)],
+                    'callbacks': [lgb.early_stopping(self.EARLY_STOPPING_ROUNDS, verbose=False)]
+                }))
                 weights.append(0.15)
-                self.logger.info("LightGBM added to ensemble", category="ml_training")
             
-            # Train CatBoost if available
+            # CatBoost if available
             if CATBOOST_AVAILABLE:
-                cat_model = cb.CatBoostClassifier(
+                fit_specs.append(('cat', 'CatBoost', cb.CatBoostClassifier, dict(
                     iterations=200,
                     depth=5,
                     learning_rate=0.05,
                     l2_leaf_reg=3,
-                    class_weights=[1, scale_pos_weight] if not use_class_balancing or not SMOTE_AVAILABLE else None,
+                    border_count=128,
+                    auto_class_weights=None if resampled else 'Balanced',
+                    early_stopping_rounds=self.EARLY_STOPPING_ROUNDS,
                     random_state=self.config.RANDOM_STATE,
-                    verbose=False,
-                    thread_count=-1
-                )
-                cat_model.fit(X_train_scaled, y_train)
-                estimators.append(('cat', cat_model))
+                    verbose=False
+                ), {'task_type': 'GPU', 'devices': '0'}, {'thread_count': threads}, {'eval_set': (X_val_np, y_val)}))
                 weights.append(0.15)
-                self.logger.info("CatBoost added to ensemble", category="ml_training")
+            
+            fitted = Parallel(n_jobs=len(fit_specs), backend='threading')(
+                delayed(self._fit_on_device)(
+                    label, model_cls, params, gpu_params, cpu_params, X_train_np, y_train,
+                    omp_threads=threads, **fit_kwargs
+                )
+                for _, label, model_cls, params, gpu_params, cpu_params, fit_kwargs in fit_specs
+            )
+            estimators = [(spec[0], model) for spec, model in zip(fit_specs, fitted)]
+            xgb_model = fitted[0]
+            
+            for name, label, *_ in fit_specs[2:]:
+                self.logger.info(f"{label} added to ensemble", category="ml_training")
             
             # Normalize weights
             weights = [w / sum(weights) for w in weights]
             
-            # Create ensemble
-            ensemble = VotingClassifier(
-                estimators=estimators,
-                voting='soft',
-                weights=weights
-            )
-            ensemble.fit(X_train_scaled, y_train)
+            # Create ensemble from the models fitted above
+            ensemble = SoftVoteEnsemble.from_fitted(estimators, weights)
             
             self.logger.info(
                 f"Ensemble created with {len(estimators)} models: {[name for name, _ in estimators]}",
@@ -273,39 +555,26 @@ class ModelTrainer:
             )
             
             # Evaluate
-            train_score = ensemble.score(X_train_scaled, y_train)
-            test_score = ensemble.score(X_test_scaled, y_test)
+            train_score = ensemble.score(X_train_np, y_train)
+            test_score = ensemble.score(X_test_np, y_test)
             
-            # Time-series cross-validation
+            # Time-series cross-validation (of the dominant XGBoost model)
             if use_tscv:
-                tscv = TimeSeriesSplit(n_splits=5)
-                cv_scores = []
-                for train_idx, val_idx in tscv.split(X_train_scaled):
-                    X_cv_train, X_cv_val = X_train_scaled[train_idx], X_train_scaled[val_idx]
-                    y_cv_train, y_cv_val = y_train.iloc[train_idx], y_train.iloc[val_idx]
-                    
-                    temp_ensemble = VotingClassifier(
-                        estimators=[('xgb', xgb_model), ('rf', rf_model)],
-                        voting='soft',
-                        weights=[self.config.XGBOOST_WEIGHT, self.config.RANDOM_FOREST_WEIGHT]
-                    )
-                    temp_ensemble.fit(X_cv_train, y_cv_train)
-                    score = temp_ensemble.score(X_cv_val, y_cv_val)
-                    cv_scores.append(score)
-                cv_scores = np.array(cv_scores)
+                cv_mean, cv_std = self._xgb_tscv(fit_specs[0][3], X_train_np, y_np)
             else:
                 cv_scores = cross_val_score(
-                    ensemble, X_train_scaled, y_train,
+                    ensemble, X_train_np, y_train,
                     cv=self.config.CV_FOLDS,
                     scoring='accuracy'
                 )
+                cv_mean, cv_std = cv_scores.mean(), cv_scores.std()
             
             duration = time.time() - start_time
             
-            # Feature importance (from XGBoost)
+            # Feature importance (from XGBoost, up to the early-stopping round)
             feature_importance = dict(zip(
                 X.columns,
-                xgb_model.feature_importances_
+                self._xgb_importances(xgb_model, X.shape[1])
             ))
             
             result = {
@@ -314,8 +583,8 @@ class ModelTrainer:
                 'version': model_version,
                 'train_accuracy': train_score,
                 'test_accuracy': test_score,
-                'cv_mean': cv_scores.mean(),
-                'cv_std': cv_scores.std(),
+                'cv_mean': cv_mean,
+                'cv_std': cv_std,
                 'feature_importance': feature_importance,
                 'training_samples': len(X_train),
                 'training_duration': duration,
@@ -339,6 +608,72 @@ class ModelTrainer:
         except Exception as e:
             self.logger.error(f"Error training model: {str(e)}", category="ml_training")
             raise
+    
+    def _xgb_tscv(self, params: Dict[str, Any], X: np.ndarray, y: np.ndarray, n_splits: int = 5) -> Tuple[float, float]:
+        """
+        Time-series CV accuracy (mean, std) of XGBoost with ``params``
+        
+        The folds run in XGBoost's native ``cv`` loop on a single DMatrix
+        instead of refitting cloned sklearn estimators per fold.
+        """
+        cv_params = {
+            k: v for k, v in params.items()
+            if k not in ('n_estimators', 'random_state', 'early_stopping_rounds')
+        }
+        cv_params.update(objective='binary:logistic', seed=self.config.RANDOM_STATE, nthread=os.cpu_count() or 1)
+        
+        cv_result = xgb.cv(
+            cv_params,
+            xgb.DMatrix(X, label=y),
+            num_boost_round=params['n_estimators'],
+            folds=list(TimeSeriesSplit(n_splits=n_splits).split(X)),
+            metrics='error'
+        )
+        
+        return 1.0 - cv_result['test-error-mean'].iloc[-1], cv_result['test-error-std'].iloc[-1]
+    
+    @staticmethod
+    def _xgb_importances(model: xgb.XGBClassifier, n_features: int) -> np.ndarray:
+        """
+        Normalized gain importances of the trees up to ``best_iteration``
+        
+        Rounds built after the early-stopping optimum do not contribute to
+        predictions, so they are sliced off before scoring.
+        """
+        booster = model.get_booster()
+        best_iteration = getattr(model, 'best_iteration', None)
+        if best_iteration is not None:
+            booster = booster[:best_iteration + 1]
+        
+        scores = booster.get_score(importance_type='gain')
+        importance = np.array([scores.get(f'f{i}', 0.0) for i in range(n_features)], dtype=np.float32)
+        total = importance.sum()
+        
+        return importance / total if total > 0 else importance
+    
+    def _fit_on_device(self, name: str, model_cls, params: Dict[str, Any], gpu_params: Optional[Dict[str, Any]],
+                       cpu_params: Dict[str, Any], X, y, omp_threads: Optional[int] = None, **fit_kwargs):
+        """
+        Fit a model on the GPU when one is available and it has ``gpu_params``
+        
+        Any failure on the device (driver, out of memory, library built
+        without GPU support) falls back to a CPU fit with ``cpu_params``.
+        The CPU fit runs with the calling thread's OpenMP pool limited to
+        ``omp_threads`` (None leaves it unlimited). ``fit_kwargs`` (eval sets,
+        callbacks) are passed to ``fit``.
+        """
+        if self.device == 'cuda' and gpu_params is not None:
+            try:
+                model = model_cls(**params, **gpu_params)
+                model.fit(X, y, **fit_kwargs)
+                return model
+            except Exception as e:
+                self.logger.warning(f"{name} GPU training failed ({e}), falling back to CPU", category="ml_training")
+        
+        model = model_cls(**params, **cpu_params)
+        with threadpool_limits(limits=omp_threads, user_api='openmp'):
+            model.fit(X, y, **fit_kwargs)
+        return model
 
 
 if __name__ == "__main__":
@@ -2,11 +2,14 @@
 MT5 Connection Manager
 Handles secure connection to MetaTrader 5 with auto-reconnection and health monitoring
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from pathlib import Path
+import random
+import threading
 import time
 from functools import wraps
+from operator import attrgetter
 
 # Lazy import of MetaTrader5 to prevent import errors on startup
 # MT5 is only available on Windows and should only be imported when actually used
@@ -29,6 +32,19 @@ def _ensure_mt5_imported():
 
 from config.settings import MT5Config
 
+# Fields copied out of mt5.account_info() / mt5.terminal_info(); one C-level
+# attrgetter call reads all of them
+_ACCOUNT_FIELDS = (
+    "login", "server", "company", "balance", "equity", "margin", "margin_free",
+    "margin_level", "currency", "leverage", "trade_mode", "name",
+)
+_ACCOUNT_GETTER = attrgetter(*_ACCOUNT_FIELDS)
+_TERMINAL_FIELDS = (
+    "connected", "trade_allowed", "tradeapi_disabled", "dlls_allowed", "maxbars", "codepage",
+    "build", "community_connection", "community_balance", "path", "data_path",
+)
+_TERMINAL_GETTER = attrgetter(*_TERMINAL_FIELDS)
+
 
 class MT5ConnectionError(Exception):
     """Custom exception for MT5 connection errors"""
@@ -47,6 +63,26 @@ class MT5Connection:
     - Comprehensive error handling
     """
     
+    # No per-instance __dict__: smaller instances and slot-speed attribute access
+    __slots__ = (
+        "_login", "password", "server", "timeout", "path", "portable", "_ping_symbol", "_masked_login",
+        "_connected", "_connection_attempts", "_max_attempts", "_last_connection_time",
+        "_last_connection_mono", "_last_error", "_api_lock", "_connect_lock", "_liveness_cache",
+        "_terminal_info_cache", "_stop", "_keepalive_thread", "stats", "_account_info", "_terminal_info",
+        "_symbol_tick",
+    )
+    
+    # Retry delays (seconds): capped exponential growth, jittered so that
+    # clients retrying against the same terminal do not synchronize
+    _BACKOFF_BASE = 1.0
+    _BACKOFF_CAP = 30.0
+    _BACKOFF_JITTER = True
+    
+    # Seconds a liveness answer / terminal snapshot is reused before the
+    # terminal is queried again
+    _LIVENESS_TTL = 0.5
+    _TERMINAL_INFO_TTL = 2.0
+    
     def __init__(
         self,
         login: Optional[int] = None,
@@ -54,7 +90,8 @@ class MT5Connection:
         server: Optional[str] = None,
         timeout: Optional[int] = None,
         path: Optional[str] = None,
-        portable: bool = False
+        portable: bool = False,
+        ping_symbol: str = "EURUSD"
     ):
         """
         Initialize MT5 connection manager
@@ -66,29 +103,64 @@ class MT5Connection:
             timeout: Connection timeout in milliseconds
             path: Path to MT5 terminal (optional)
             portable: Use portable mode (optional)
+            ping_symbol: Symbol whose tick request times ping() (added to
+                Market Watch on connect so the request skips symbol resolution)
         """
-        self.login = login or MT5Config.LOGIN
+        self._login = login or MT5Config.LOGIN
         self.password = password or MT5Config.PASSWORD
         self.server = server or MT5Config.SERVER
         self.timeout = timeout or MT5Config.TIMEOUT
         self.path = path or MT5Config.PATH
         self.portable = portable or MT5Config.PORTABLE
+        self._ping_symbol = ping_symbol
+        
+        # Status reports show only the last 4 digits; login is read-only, so
+        # the mask is built once
+        login_str = str(self._login)
+        self._masked_login = login_str[-4:].rjust(len(login_str), '*')
         
         self._connected = False
         self._connection_attempts = 0
         self._max_attempts = 3
-        self._last_connection_time = None
+        self._last_connection_time = None  # Wall clock, for display
+        self._last_connection_mono = None  # time.monotonic(), for durations
         self._last_error = None
         
+        # Serializes connect/disconnect/reconnect and liveness RPCs; reentrant
+        # because reconnect() calls disconnect() and connect()
+        self._api_lock = threading.RLock()
+        
+        # Serializes whole connect/reconnect sequences including their backoff
+        # sleeps, which run without _api_lock so polling is never stalled by a
+        # retry (always acquired before _api_lock)
+        self._connect_lock = threading.RLock()
+        
+        # Bound MT5 API functions for the hot paths (set by a successful connect)
+        self._bind_api(None)
+        
+        # (monotonic time, value) of the last terminal queries
+        self._liveness_cache = (0.0, False)
+        self._terminal_info_cache = (0.0, None)
+        
+        # Opt-in background liveness/reconnect loop (start_keepalive)
+        self._stop = threading.Event()
+        self._keepalive_thread = None
+        
         # Connection statistics
         self.stats = {
             "total_connections": 0,
             "failed_connections": 0,
             "reconnections": 0,
             "uptime_start": None,
+            "uptime_start_mono": None,
             "last_ping": None
         }
     
+    @property
+    def login(self):
+        """MT5 account number (fixed for the lifetime of the connection)"""
+        return self._login
+    
     def _validate_credentials(self) -> bool:
         """Validate that all required credentials are provided"""
         missing = []
@@ -104,6 +176,13 @@ class MT5Connection:
             return False
         return True
     
+    def _backoff_delay(self, attempt: int) -> float:
+        """Delay before retrying after failed ``attempt`` (1-based)"""
+        delay = min(self._BACKOFF_CAP, self._BACKOFF_BASE * (2 ** (attempt - 1)))
+        if self._BACKOFF_JITTER:
+            delay = random.uniform(self._BACKOFF_BASE, delay)
+        return delay
+    
     def connect(self, retry: bool = True) -> bool:
         """
         Connect to MetaTrader 5
@@ -125,136 +204,253 @@ class MT5Connection:
             print(f"❌ Credential validation failed: {self._last_error}")
             raise MT5ConnectionError(self._last_error)
         
-        for attempt in range(1, self._max_attempts + 1 if retry else 2):
-            try:
-                self._connection_attempts = attempt
-                
-                # Initialize MT5 WITH credentials
-                if self.path:
-                    if not _mt5.initialize(
-                        path=self.path,
-                        login=self.login,
-                        password=self.password,
-                        server=self.server,
-                        timeout=self.timeout,
-                        portable=self.portable
-                    ):
-                        raise MT5ConnectionError(f"MT5 initialization failed: {_mt5.last_error()}")
-                else:
-                    if not _mt5.initialize(
-                        login=self.login,
-                        password=self.password,
-                        server=self.server,
-                        timeout=self.timeout
-                    ):
-                        raise MT5ConnectionError(f"MT5 initialization failed: {_mt5.last_error()}")
-                
-                # Verify connection
-                account_info = _mt5.account_info()
-                if account_info is None:
-                    raise MT5ConnectionError("Failed to retrieve account info")
-                
-                # Connection successful
-                self._connected = True
-                self._last_connection_time = datetime.now()
-                self._last_error = None
-                
-                # Update statistics
-                self.stats["total_connections"] += 1
-                if attempt > 1:
-                    self.stats["reconnections"] += 1
-                if self.stats["uptime_start"] is None:
-                    self.stats["uptime_start"] = datetime.now()
-                
-                return True
-                
-            except Exception as e:
-                self._last_error = str(e)
-                self._connected = False
-                self.stats["failed_connections"] += 1
+        with self._connect_lock:
+            for attempt in range(1, self._max_attempts + 1 if retry else 2):
+                with self._api_lock:
+                    try:
+                        self._connection_attempts = attempt
+                        
+                        # Initialize MT5 WITH credentials
+                        if self.path:
+                            if not _mt5.initialize(
+                                path=self.path,
+                                login=self.login,
+                                password=self.password,
+                                server=self.server,
+                                timeout=self.timeout,
+                                portable=self.portable
+                            ):
+                                raise MT5ConnectionError(f"MT5 initialization failed: {_mt5.last_error()}")
+                        else:
+                            if not _mt5.initialize(
+                                login=self.login,
+                                password=self.password,
+                                server=self.server,
+                                timeout=self.timeout
+                            ):
+                                raise MT5ConnectionError(f"MT5 initialization failed: {_mt5.last_error()}")
+                        
+                        # Verify connection
+                        account_info = _mt5.account_info()
+                        if account_info is None:
+                            raise MT5ConnectionError("Failed to retrieve account info")
+                        
+                        # Connection successful (account_info just proved liveness)
+                        self._bind_api(_mt5)
+                        self._connected = True
+                        self._liveness_cache = (time.monotonic(), True)
+                        now = datetime.now()
+                        now_mono = time.monotonic()
+                        self._last_connection_time = now
+                        self._last_connection_mono = now_mono
+                        self._last_error = None
+                        
+                        # Update statistics
+                        self.stats["total_connections"] += 1
+                        if attempt > 1:
+                            self.stats["reconnections"] += 1
+                        if self.stats["uptime_start"] is None:
+                            self.stats["uptime_start"] = now
+                            self.stats["uptime_start_mono"] = now_mono
+                        
+                        # Pre-select the ping symbol; if that fails ping() still
+                        # works, just with the by-name lookup included
+                        try:
+                            _mt5.symbol_select(self._ping_symbol, True)
+                        except Exception:
+                            pass
+                        
+                        return True
+                        
+                    except Exception as e:
+                        self._last_error = str(e)
+                        self._connected = False
+                        self.invalidate_liveness_cache()
+                        self.stats["failed_connections"] += 1
+                        
+                        if not (attempt < self._max_attempts and retry):
+                            raise MT5ConnectionError(
+                                f"Failed to connect after {attempt} attempts. Last error: {self._last_error}"
+                            )
                 
-                if attempt < self._max_attempts and retry:
-                    wait_time = attempt * 2  # Exponential backoff
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    raise MT5ConnectionError(
-                        f"Failed to connect after {attempt} attempts. Last error: {self._last_error}"
-                    )
-        
-        return False
+                # Back off without holding the API lock
+                time.sleep(self._backoff_delay(attempt))
+            
+            return False
     
     def disconnect(self) -> bool:
         """
-        Disconnect from MetaTrader 5
+        Disconnect from MetaTrader 5 (and stop the keepalive loop)
 
         Returns:
             bool: True if disconnected successfully
         """
-        try:
-            if mt5 is not None:
-                mt5.shutdown()
-            self._connected = False
-            self._last_connection_time = None
-            return True
-        except Exception as e:
-            self._last_error = f"Error during disconnect: {str(e)}"
-            return False
+        self.stop_keepalive()
+        return self._close()
+    
+    def _close(self) -> bool:
+        """Shut the terminal connection down, leaving any keepalive loop running"""
+        with self._api_lock:
+            try:
+                if mt5 is not None:
+                    mt5.shutdown()
+                self._connected = False
+                self._last_connection_time = None
+                self._last_connection_mono = None
+                self._bind_api(None)
+                self.invalidate_liveness_cache()
+                self._terminal_info_cache = (0.0, None)
+                return True
+            except Exception as e:
+                self._last_error = f"Error during disconnect: {str(e)}"
+                return False
     
     def reconnect(self) -> bool:
         """
         Reconnect to MetaTrader 5
         
+        Concurrent callers are coalesced: whoever gets the lock after another
+        caller has already reconnected finds a live session and keeps it.
+        
         Returns:
             bool: True if reconnected successfully
         """
-        self.disconnect()
-        time.sleep(1)
-        return self.connect(retry=True)
+        with self._connect_lock:
+            with self._api_lock:
+                account_info = self._account_info
+                if self._connected and account_info is not None:
+                    try:
+                        alive = account_info() is not None
+                    except Exception:
+                        alive = False
+                    if alive:
+                        self._liveness_cache = (time.monotonic(), True)
+                        return True
+                
+                self._close()
+                self.invalidate_liveness_cache()
+            
+            # Back off without holding the API lock
+            time.sleep(self._backoff_delay(1))
+            return self.connect(retry=True)
+    
+    def start_keepalive(self, interval: float = 20.0):
+        """
+        Check liveness every ``interval`` seconds in a daemon thread and
+        reconnect when the connection has dropped
+        
+        Keeps the connection warm so callers rarely pay the reconnect cost
+        on their own critical path. Calling it again while running is a no-op.
+        """
+        if self._keepalive_thread is not None and self._keepalive_thread.is_alive():
+            return
+        
+        self._stop.clear()
+        self._keepalive_thread = threading.Thread(
+            target=self._keepalive_loop,
+            args=(interval,),
+            name="mt5-keepalive",
+            daemon=True
+        )
+        self._keepalive_thread.start()
+    
+    def stop_keepalive(self):
+        """
+        Stop the keepalive loop and wait for its thread to exit
+        
+        A reconnect already in progress is finished first, so once this
+        returns no keepalive thread can touch the connection again.
+        """
+        self._stop.set()
+        thread = self._keepalive_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._keepalive_thread = None
+    
+    def _keepalive_loop(self, interval: float):
+        """Body of the keepalive thread"""
+        while not self._stop.wait(interval):
+            if self.is_connected():
+                continue
+            try:
+                with self._connect_lock:
+                    # stop_keepalive() may have run while we waited for the lock
+                    if self._stop.is_set():
+                        break
+                    self.reconnect()
+            except Exception:
+                # Retried on the next tick; the error is kept in _last_error
+                pass
+    
+    def _bind_api(self, api):
+        """
+        Cache the MT5 functions used by the polling paths as instance slots
+        
+        Saves the module attribute lookup on every liveness check, ping and
+        info call; ``None`` unbinds them (disconnected).
+        """
+        self._account_info = api.account_info if api is not None else None
+        self._terminal_info = api.terminal_info if api is not None else None
+        self._symbol_tick = api.symbol_info_tick if api is not None else None
+    
+    def invalidate_liveness_cache(self):
+        """Force the next is_connected() to query the terminal"""
+        self._liveness_cache = (0.0, False)
     
     def is_connected(self) -> bool:
         """
         Check if connected to MT5
         
+        The terminal is queried at most once per ``_LIVENESS_TTL`` seconds;
+        calls in between reuse the last answer.
+        
         Returns:
             bool: Connection status
         """
         if not self._connected:
             return False
         
-        if mt5 is None:
+        account_info = self._account_info
+        if account_info is None:
             return False
         
-        try:
-            # Verify connection is still alive
-            account_info = mt5.account_info()
-            if account_info is None:
+        now = time.monotonic()
+        checked_at, alive = self._liveness_cache
+        if now - checked_at < self._LIVENESS_TTL:
+            return alive
+        
+        with self._api_lock:
+            try:
+                # Verify connection is still alive
+                alive = account_info() is not None
+            except Exception:
+                alive = False
+            
+            if not alive:
                 self._connected = False
-                return False
-            return True
-        except Exception:
-            self._connected = False
-            return False
+            self._liveness_cache = (now, alive)
+            return alive
     
-    def ping(self) -> Optional[int]:
+    def ping(self) -> Optional[float]:
         """
         Test connection latency
         
         Returns:
-            Optional[int]: Ping time in milliseconds, None if failed
+            Optional[float]: Ping time in milliseconds (0.01 ms resolution), None if failed
         """
         if not self.is_connected():
             return None
         
-        if mt5 is None:
+        symbol_tick = self._symbol_tick
+        if symbol_tick is None:
             return None
         
         try:
-            start = time.time()
-            mt5.symbol_info_tick("EURUSD")  # Quick test request
-            end = time.time()
+            start = time.perf_counter_ns()
+            symbol_tick(self._ping_symbol)  # Quick test request
+            end = time.perf_counter_ns()
             
-            ping_ms = int((end - start) * 1000)
+            ping_ms = round((end - start) / 1_000_000, 2)
             self.stats["last_ping"] = ping_ms
             return ping_ms
         except Exception:
@@ -270,67 +466,103 @@ class MT5Connection:
         if not self.is_connected():
             return None
         
-        if mt5 is None:
+        account_info = self._account_info
+        if account_info is None:
             return None
         
         try:
-            info = mt5.account_info()
+            info = account_info()
             if info is None:
                 return None
             
-            return {
-                "login": info.login,
-                "server": info.server,
-                "company": info.company,
-                "balance": info.balance,
-                "equity": info.equity,
-                "margin": info.margin,
-                "margin_free": info.margin_free,
-                "margin_level": info.margin_level,
-                "currency": info.currency,
-                "leverage": info.leverage,
-                "trade_mode": info.trade_mode,
-                "name": info.name,
-            }
+            return self._account_dict(info)
         except Exception as e:
             self._last_error = f"Error getting account info: {str(e)}"
             return None
     
+    @staticmethod
+    def _account_dict(info) -> Dict[str, Any]:
+        """Account fields exposed by get_account_info()"""
+        return dict(zip(_ACCOUNT_FIELDS, _ACCOUNT_GETTER(info)))
+    
     def get_terminal_info(self) -> Optional[Dict[str, Any]]:
         """
         Get terminal information
         
+        Terminal metadata rarely changes, so a snapshot is reused for
+        ``_TERMINAL_INFO_TTL`` seconds.
+        
         Returns:
             Optional[Dict]: Terminal details or None if failed
         """
         if not self.is_connected():
             return None
         
-        if mt5 is None:
+        terminal_info_fn = self._terminal_info
+        if terminal_info_fn is None:
             return None
         
+        now = time.monotonic()
+        fetched_at, cached = self._terminal_info_cache
+        if cached is not None and now - fetched_at < self._TERMINAL_INFO_TTL:
+            return dict(cached)
+        
         try:
-            info = mt5.terminal_info()
+            info = terminal_info_fn()
             if info is None:
                 return None
             
-            return {
-                "connected": info.connected,
-                "trade_allowed": info.trade_allowed,
-                "tradeapi_disabled": info.tradeapi_disabled,
-                "dlls_allowed": info.dlls_allowed,
-                "maxbars": info.maxbars,
-                "codepage": info.codepage,
-                "build": info.build,
-                "community_connection": info.community_connection,
-                "community_balance": info.community_balance,
-                "path": info.path,
-                "data_path": info.data_path,
-            }
+            terminal_info = dict(zip(_TERMINAL_FIELDS, _TERMINAL_GETTER(info)))
+            self._terminal_info_cache = (now, terminal_info)
+            return dict(terminal_info)
         except Exception as e:
             self._last_error = f"Error getting terminal info: {str(e)}"
             return None
     
+    def _collect_status(
+        self,
+        include_account: bool = True,
+        include_terminal: bool = True,
+        include_ping: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Gather liveness, account, terminal and latency data in one pass
+        
+        With ``include_account`` the single account_info() call serves as both
+        the liveness check and the account payload (and refreshes the liveness
+        cache); terminal_info() and the ping tick are then issued at most once
+        each, without re-checking liveness against the terminal.
+        
+        Returns:
+            Dict with connected, account_info, terminal_info and ping_ms
+        """
+        status = {"connected": False, "account_info": None, "terminal_info": None, "ping_ms": None}
+        
+        if include_account:
+            info = None
+            account_info = self._account_info
+            if self._connected and account_info is not None:
+                with self._api_lock:
+                    try:
+                        info = account_info()
+                    except Exception as e:
+                        self._last_error = f"Error getting account info: {str(e)}"
+                    self._liveness_cache = (time.monotonic(), info is not None)
+                    if info is None:
+                        self._connected = False
+            if info is None:
+                return status
+            status["account_info"] = self._account_dict(info)
+        elif not self.is_connected():
+            return status
+        
+        status["connected"] = True
+        if include_terminal:
+            status["terminal_info"] = self.get_terminal_info()
+        if include_ping:
+            status["ping_ms"] = self.ping()
+        return status
+    
     def get_connection_status(self) -> Dict[str, Any]:
         """
         Get comprehensive connection status
@@ -338,17 +570,19 @@ class MT5Connection:
         Returns:
             Dict: Connection status information
         """
-        connected = self.is_connected()
-        ping = self.ping() if connected else None
+        status = self._collect_status(include_account=False, include_terminal=False)
+        connected = status["connected"]
+        ping = status["ping_ms"]
         
         uptime = None
-        if self.stats["uptime_start"] and connected:
-            uptime = datetime.now() - self.stats["uptime_start"]
+        # Monotonic clock: immune to NTP/DST jumps of the wall clock
+        if self.stats["uptime_start_mono"] is not None and connected:
+            uptime = timedelta(seconds=time.monotonic() - self.stats["uptime_start_mono"])
         
         return {
             "connected": connected,
             "server": self.server,
-            "login": str(self.login)[-4:].rjust(len(str(self.login)), '*'),  # Masked
+            "login": self._masked_login,
             "last_connection": self._last_connection_time,
             "ping_ms": ping,
             "uptime": uptime,
@@ -366,10 +600,11 @@ class MT5Connection:
         Returns:
             Dict: Health status with details
         """
-        connected = self.is_connected()
-        ping = self.ping() if connected else None
-        account_info = self.get_account_info() if connected else None
-        terminal_info = self.get_terminal_info() if connected else None
+        status = self._collect_status()
+        connected = status["connected"]
+        ping = status["ping_ms"]
+        account_info = status["account_info"]
+        terminal_info = status["terminal_info"]
         
         # Determine health status
         if not connected:
@@ -416,12 +651,12 @@ def ensure_connection(func):
     """
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        # If no connection object is provided, assume global MT5 API is used
-        if not hasattr(self, "connection") or self.connection is None:
-            return func(self, *args, **kwargs)
-        if not self.connection.is_connected():
+        # One attribute read; no connection object means the global MT5 API
+        # is used. The healthy path is then a TTL-cached liveness check.
+        conn = getattr(self, "connection", None)
+        if conn is not None and not conn.is_connected():
             try:
-                self.connection.reconnect()
+                conn.reconnect()
             except MT5ConnectionError as e:
                 raise MT5ConnectionError(f"Cannot execute {func.__name__}: {str(e)}")
         return func(self, *args, **kwargs)
@@ -430,26 +665,48 @@ def ensure_connection(func):
 
 # Singleton pattern for global connection management
 class MT5ConnectionManager:
-    """Singleton manager for global MT5 connection"""
+    """
+    Singleton manager for global MT5 connection
+    
+    The MetaTrader5 package keeps one terminal session per process (every
+    call goes through module-level state, and shutdown() ends it for all
+    callers), so connections are shared rather than pooled. Parallel broker
+    RPCs need separate processes, each with its own connection.
+    """
     _instance = None
     _connection = None
+    # Guards singleton and connection creation (double-checked), so concurrent
+    # callers never initialize two terminals
+    _lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(MT5ConnectionManager, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(MT5ConnectionManager, cls).__new__(cls)
         return cls._instance
     
-    def get_connection(self) -> MT5Connection:
-        """Get or create MT5 connection instance"""
+    def get_connection(self, keepalive: bool = False) -> MT5Connection:
+        """
+        Get or create MT5 connection instance
+        
+        Args:
+            keepalive: Also start the connection's background keepalive loop
+        """
         if self._connection is None:
-            self._connection = MT5Connection()
+            with self._lock:
+                if self._connection is None:
+                    self._connection = MT5Connection()
+        if keepalive:
+            self._connection.start_keepalive()
         return self._connection
     
     def reset_connection(self):
         """Reset connection instance"""
-        if self._connection:
-            self._connection.disconnect()
-        self._connection = None
+        with self._lock:
+            if self._connection:
+                self._connection.disconnect()
+            self._connection = None
 
 
 # Convenience function
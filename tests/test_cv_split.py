@@ -0,0 +1,58 @@
+"""
+Tests for the tuner's rolling embargoed time-series folds
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ml.hyperparameter_tuner import HyperparameterTuner, RollingEmbargoedSplit
+
+
+def test_folds_tile_the_tail_with_an_embargo_gap():
+    """Validation blocks tile the end of the series; each window stops embargo bars short"""
+    folds = list(RollingEmbargoedSplit(n_splits=4, embargo=3).split(np.zeros(100)))
+
+    assert len(folds) == 4
+    val_size = 100 // 5
+    for k, (train, val) in enumerate(folds):
+        assert val.start == 20 + k * val_size
+        assert val.stop - val.start == val_size
+        assert val.start - train.stop == 3
+        assert train.stop - train.start == 17
+    assert folds[-1][1].stop == 100
+
+
+def test_training_windows_roll_with_a_fixed_width():
+    """Explicit train/val sizes are honored and windows never overlap their validation block"""
+    splitter = RollingEmbargoedSplit(n_splits=3, train_size=30, val_size=10, embargo=5)
+    folds = list(splitter.split(np.zeros(80)))
+
+    assert [(t.start, t.stop, v.start, v.stop) for t, v in folds] == [
+        (15, 45, 50, 60),
+        (25, 55, 60, 70),
+        (35, 65, 70, 80),
+    ]
+    assert splitter.get_n_splits() == 3
+
+
+def test_too_short_series_raises():
+    """Windows that do not fit are rejected instead of producing empty folds"""
+    with pytest.raises(ValueError, match="Cannot make 3 folds"):
+        list(RollingEmbargoedSplit(n_splits=3, embargo=3).split(np.zeros(5)))
+
+
+def test_prepare_cv_data_rejects_empty_holdout():
+    """The fast-mode holdout cannot wrap around into an empty training window"""
+    tuner = HyperparameterTuner(use_gpu=False, cv_embargo=5, fast_mode=True, fast_threshold=1)
+
+    X_np, y_np, folds = tuner._prepare_cv_data(np.zeros((100, 2)), np.zeros(100), cv_folds=3)
+    assert X_np.dtype == np.float32 and y_np.dtype == np.int8
+    assert folds == [(slice(0, 75), slice(80, 100))]
+
+    with pytest.raises(ValueError, match="Empty CV fold"):
+        tuner._prepare_cv_data(np.zeros((5, 2)), np.zeros(5), cv_folds=3)
@@ -0,0 +1,63 @@
+"""
+Tests that the trained soft-vote ensemble survives sklearn's clone-and-refit
+utilities (cross-validation and probability calibration)
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import clone
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.model_selection import cross_val_score
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ml.calibrator import ProbabilityCalibrator
+from src.ml import training
+from src.ml.training import ModelTrainer, SoftVoteEnsemble
+
+
+def _synthetic_set(n_rows: int = 600, n_features: int = 6):
+    """Separable binary problem with a time-ordered index"""
+    rng = np.random.default_rng(7)
+    X = pd.DataFrame(
+        rng.normal(size=(n_rows, n_features)),
+        columns=[f"f{i}" for i in range(n_features)]
+    )
+    y = pd.Series((X['f0'] + 0.5 * X['f1'] + rng.normal(0, 0.5, n_rows) > 0).astype(int))
+    return X, y
+
+
+def test_ensemble_cross_validates_and_calibrates():
+    """Early-stopped members must refit without a validation set"""
+    X, y = _synthetic_set()
+    result = ModelTrainer().train_model(X, y, model_version='test', use_tscv=False)
+    ensemble = result['model']
+
+    assert np.isfinite(result['cv_mean'])
+
+    X_np = X.to_numpy(dtype=np.float32)
+    scores = cross_val_score(ensemble, X_np, y, cv=3, error_score='raise')
+    assert np.all(np.isfinite(scores))
+
+    calibrated = ProbabilityCalibrator().calibrate(ensemble, X, y, cv=3)
+    assert isinstance(calibrated, CalibratedClassifierCV)
+    assert calibrated.predict_proba(X).shape == (len(X), 2)
+
+
+def test_loaded_ensemble_rejects_refit(tmp_path):
+    """Loaded LightGBM members are predict-only and say so when cloned"""
+    if not training.LIGHTGBM_AVAILABLE:
+        pytest.skip("lightgbm not installed")
+
+    X, y = _synthetic_set()
+    ensemble = ModelTrainer().train_model(X, y, model_version='test')['model']
+    ensemble.save(tmp_path / 'ensemble')
+    loaded = SoftVoteEnsemble.load(tmp_path / 'ensemble')
+
+    with pytest.raises(TypeError, match="predict-only"):
+        clone(loaded)
+    assert ProbabilityCalibrator().calibrate(loaded, X, y, cv=3) is loaded
@@ -0,0 +1,87 @@
+"""
+Tests for ensemble persistence and the model manager's saved-model listing
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ml import model_manager
+from src.ml.model_manager import ModelManager
+from src.ml.training import ModelTrainer, SoftVoteEnsemble
+
+
+@pytest.fixture(scope='module')
+def trained():
+    """Ensemble and scaler trained once on a separable synthetic set"""
+    rng = np.random.default_rng(11)
+    X = pd.DataFrame(rng.normal(size=(600, 6)), columns=[f"f{i}" for i in range(6)])
+    y = pd.Series((X['f0'] - X['f2'] + rng.normal(0, 0.5, 600) > 0).astype(int))
+    result = ModelTrainer().train_model(X, y, model_version='test')
+    return result, X.to_numpy(dtype=np.float32)
+
+
+@pytest.fixture
+def models_dir(tmp_path, monkeypatch):
+    """Point the model manager at an empty scratch directory"""
+    monkeypatch.setattr(model_manager, 'MODELS_DIR', tmp_path)
+    return tmp_path
+
+
+def test_ensemble_save_load_round_trip(trained, tmp_path):
+    """Native booster files reproduce the fitted ensemble's probabilities"""
+    result, X_np = trained
+    ensemble = result['model']
+
+    ensemble.save(tmp_path / 'ensemble')
+    loaded = SoftVoteEnsemble.load(tmp_path / 'ensemble')
+
+    assert (tmp_path / 'ensemble' / 'meta.json').exists()
+    np.testing.assert_array_equal(loaded.classes_, ensemble.classes_)
+    np.testing.assert_allclose(loaded.predict_proba(X_np), ensemble.predict_proba(X_np), rtol=1e-5, atol=1e-6)
+    np.testing.assert_array_equal(loaded.predict(X_np), ensemble.predict(X_np))
+
+
+def test_manager_save_and_load_model(trained, models_dir):
+    """save_model writes a stub plus the ensemble directory; load_model restores predictions"""
+    result, X_np = trained
+    manager = ModelManager()
+
+    assert manager.save_model(result['model'], result['scaler'], 'v1', {'version': 'v1'})
+    assert manager.load_model('v1')
+
+    assert (models_dir / 'model_v1').is_dir()
+    np.testing.assert_allclose(
+        manager.predict(X_np, return_proba=True),
+        result['model'].predict_proba(X_np),
+        rtol=1e-5, atol=1e-6
+    )
+    np.testing.assert_allclose(
+        manager.predict(X_np[0], return_proba=True),
+        result['model'].predict_proba(X_np[:1]),
+        rtol=1e-5, atol=1e-6
+    )
+
+
+def test_list_models_is_cached_until_the_directory_changes(trained, models_dir, monkeypatch):
+    """Repeated listings skip the scan; saving a model invalidates the cache"""
+    result, _ = trained
+    manager = ModelManager()
+    manager.save_model(result['model'], result['scaler'], 'v1', {})
+
+    scans = []
+    real_scandir = model_manager.os.scandir
+    monkeypatch.setattr(model_manager.os, 'scandir', lambda path: scans.append(path) or real_scandir(path))
+
+    assert manager.list_models() == ['v1']
+    assert manager.list_models() == ['v1']
+    assert len(scans) == 1
+
+    manager.save_model(result['model'], result['scaler'], 'v2', {})
+    assert manager.list_models() == ['v2', 'v1']
+    assert len(scans) == 2
@@ -0,0 +1,145 @@
+"""
+Tests for MT5Connection reconnect coalescing and the keepalive thread
+
+MetaTrader5 only exists on Windows, so these run against a small in-memory
+stand-in for the terminal API.
+"""
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.mt5 import connection
+from src.mt5.connection import MT5Connection
+
+
+class FakeTerminal:
+    """Records calls and lets a test drop or restore the link"""
+
+    def __init__(self):
+        self.calls = {}
+        self.alive = True
+        self.module = types.ModuleType('MetaTrader5')
+        account = types.SimpleNamespace(
+            login=12345678, server='Demo', company='Broker', balance=1.0, equity=1.0, margin=0.0,
+            margin_free=1.0, margin_level=0.0, currency='USD', leverage=100, trade_mode=0, name='Test'
+        )
+        self.module.initialize = self._recorded('initialize', lambda *a, **k: True)
+        self.module.account_info = self._recorded('account_info', lambda: account if self.alive else None)
+        self.module.terminal_info = self._recorded('terminal_info', lambda: object() if self.alive else None)
+        self.module.shutdown = self._recorded('shutdown', lambda: True)
+        self.module.symbol_select = self._recorded('symbol_select', lambda *a: True)
+        self.module.symbol_info_tick = self._recorded('symbol_info_tick', lambda *a: object())
+        self.module.last_error = self._recorded('last_error', lambda: (1, 'error'))
+
+    def _recorded(self, name, func):
+        def wrapper(*args, **kwargs):
+            self.calls[name] = self.calls.get(name, 0) + 1
+            return func(*args, **kwargs)
+        return wrapper
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    """Install the fake terminal and make retries fast and deterministic"""
+    fake = FakeTerminal()
+    monkeypatch.setitem(sys.modules, 'MetaTrader5', fake.module)
+    monkeypatch.setattr(connection, 'mt5', None)
+    monkeypatch.setattr(MT5Connection, '_BACKOFF_BASE', 0.05)
+    monkeypatch.setattr(MT5Connection, '_BACKOFF_JITTER', False)
+    monkeypatch.setattr(MT5Connection, '_LIVENESS_TTL', 0.0)
+    return fake
+
+
+@pytest.fixture
+def conn(terminal):
+    connection_ = MT5Connection(login=12345678, password='secret', server='Demo')
+    assert connection_.connect()
+    yield connection_
+    connection_.disconnect()
+
+
+def _keepalive_threads():
+    return [t for t in threading.enumerate() if t.name == 'mt5-keepalive']
+
+
+def test_concurrent_reconnects_are_coalesced(conn, terminal):
+    """Callers queued behind a reconnect keep the session it opened"""
+    terminal.alive = False
+    terminal.calls.clear()
+    original_shutdown = terminal.module.shutdown
+
+    def shutdown_restores_link():
+        terminal.alive = True
+        return original_shutdown()
+    terminal.module.shutdown = shutdown_restores_link
+
+    threads = [threading.Thread(target=conn.reconnect) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert terminal.calls['shutdown'] == 1
+    assert terminal.calls['initialize'] == 1
+    assert conn.is_connected()
+
+
+def test_keepalive_reconnects_a_dropped_link(conn, terminal):
+    """The background loop notices the drop and restores the session"""
+    conn.start_keepalive(interval=0.02)
+    terminal.alive = False
+    time.sleep(0.1)
+    terminal.alive = True
+
+    deadline = time.monotonic() + 2.0
+    while conn.stats['total_connections'] < 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    assert conn.stats['total_connections'] >= 2
+    assert conn.is_connected()
+
+
+def test_stop_keepalive_joins_the_thread(conn):
+    """Once stop returns, the keepalive thread has exited"""
+    conn.start_keepalive(interval=0.01)
+    thread = conn._keepalive_thread
+
+    conn.stop_keepalive()
+
+    assert not thread.is_alive()
+    assert conn._keepalive_thread is None
+
+
+def test_restart_after_stop_runs_a_single_loop(conn):
+    """A start right after a stop never leaves two loops running"""
+    for _ in range(10):
+        conn.start_keepalive(interval=0.01)
+        conn.stop_keepalive()
+        conn.start_keepalive(interval=0.01)
+        assert len(_keepalive_threads()) == 1
+        conn.stop_keepalive()
+
+    assert _keepalive_threads() == []
+
+
+def test_disconnect_during_keepalive_reconnect_stays_closed(conn, terminal):
+    """A reconnect in flight in the keepalive thread cannot reopen a disconnected session"""
+    conn.start_keepalive(interval=0.02)
+    terminal.alive = False
+    time.sleep(0.15)
+    terminal.alive = True
+
+    conn.disconnect()
+    initialized = terminal.calls['initialize']
+    time.sleep(0.3)
+
+    assert terminal.calls['initialize'] == initialized
+    assert not conn.is_connected()
+    assert _keepalive_threads() == []
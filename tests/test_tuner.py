@@ -0,0 +1,79 @@
+"""
+Tests for the hyperparameter tuner's early trial rejection and warm start
+"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ml import hyperparameter_tuner
+from src.ml.hyperparameter_tuner import HyperparameterTuner
+
+pytestmark = pytest.mark.skipif(not hyperparameter_tuner.OPTUNA_AVAILABLE, reason="optuna not installed")
+
+
+def _synthetic_set(n_rows: int = 600):
+    """Separable binary problem"""
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame(rng.normal(size=(n_rows, 5)).astype(np.float32))
+    y = pd.Series((X[0] + rng.normal(0, 0.5, n_rows) > 0).astype(int))
+    return X, y
+
+
+def test_models_without_splits_are_always_hopeless():
+    """All-zero or empty importances mean the model made no splits"""
+    tuner = HyperparameterTuner(use_gpu=False)
+    late_trial = SimpleNamespace(number=90)
+
+    assert tuner._is_hopeless(late_trial, np.zeros(5), 0.9, n_trials=100)
+    assert tuner._is_hopeless(late_trial, [], 0.9, n_trials=100)
+    assert not tuner._is_hopeless(late_trial, [0.0, 0.2], 0.1, n_trials=100)
+
+
+def test_score_floor_is_off_by_default():
+    """Near-chance first folds are normal for FX direction labels"""
+    tuner = HyperparameterTuner(use_gpu=False)
+
+    assert not tuner._is_hopeless(SimpleNamespace(number=0), [1.0], 0.3, n_trials=100)
+
+
+def test_score_floor_applies_to_the_first_third_only():
+    """An explicit floor prunes weak early trials and then steps aside for the median pruner"""
+    tuner = HyperparameterTuner(use_gpu=False, min_acceptable_score=0.52)
+
+    assert tuner._is_hopeless(SimpleNamespace(number=10), [1.0], 0.5, n_trials=90)
+    assert not tuner._is_hopeless(SimpleNamespace(number=10), [1.0], 0.6, n_trials=90)
+    assert not tuner._is_hopeless(SimpleNamespace(number=30), [1.0], 0.5, n_trials=90)
+    assert not tuner._is_hopeless(SimpleNamespace(number=10), [1.0], 0.5, n_trials=None)
+
+
+def test_no_parameters_are_persisted_without_a_key(tmp_path, monkeypatch):
+    """Tuning leaves MODELS_DIR untouched unless warm starting is requested"""
+    monkeypatch.setattr(hyperparameter_tuner, 'MODELS_DIR', tmp_path)
+    X, y = _synthetic_set()
+
+    HyperparameterTuner(use_gpu=False).tune_xgboost(X, y, n_trials=2, cv_folds=3)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_warm_start_reuses_best_parameters_per_key(tmp_path, monkeypatch):
+    """A new study with the same key evaluates the previous best first; other keys start cold"""
+    monkeypatch.setattr(hyperparameter_tuner, 'MODELS_DIR', tmp_path)
+    X, y = _synthetic_set()
+
+    first = HyperparameterTuner(use_gpu=False, warm_start_key='EURUSD_H1').tune_xgboost(X, y, n_trials=2, cv_folds=3)
+    assert [p.name for p in tmp_path.iterdir()] == ['best_params_EURUSD_H1_xgboost.json']
+
+    second = HyperparameterTuner(use_gpu=False, warm_start_key='EURUSD_H1').tune_xgboost(X, y, n_trials=2, cv_folds=3)
+    assert second['study'].trials[0].params == first['study'].best_params
+
+    other = HyperparameterTuner(use_gpu=False, warm_start_key='GBPUSD_H1')
+    study = other._get_or_create_study('xgboost')
+    assert not other._enqueue_prior_best('xgboost', study)